@@ -0,0 +1,97 @@
+"""Unidirectional approach for repeatable positioning.
+
+Mechanical backlash makes the final position depend on the direction a
+target is approached from.  BacklashCompensator plans moves so that the
+last leg always travels in `direction`: a move arriving from the other
+side first goes `overshoot` past the target, then comes back.
+
+measure_backlash() calibrates the overshoot with the power meter as
+sensor: a beam edge (knife edge, slit, fibre coupling peak flank) is
+swept in both directions and the shift between the two edge positions
+is the backlash.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+
+class BacklashCompensator:
+    def __init__(self, overshoot=0.05, direction=+1, pos_min=None, pos_max=None, check=None):
+        """check(points, start) -> bool may veto a pre-position, e.g.
+        LimitEngine.path_allowed; a vetoed move goes straight to the target."""
+        self.overshoot = overshoot
+        self.direction = 1 if direction >= 0 else -1
+        self.pos_min = pos_min
+        self.pos_max = pos_max
+        self.check = check
+        self.enabled = True
+
+    def path(self, current, target, at_rest=True):
+        """Waypoints to send for a move to `target` (the last one is `target`).
+
+        With at_rest=False (retargeting a move in progress) the actual
+        direction of travel is unknown, so the pre-position is always used.
+        """
+        if not self.enabled or self.overshoot <= 0:
+            return [target]
+        if at_rest and current is not None and (target - current) * self.direction > 0:
+            return [target]  # already arriving from the right side
+        pre = target - self.direction * self.overshoot
+        if (self.pos_min is not None and pre < self.pos_min) or \
+                (self.pos_max is not None and pre > self.pos_max):
+            return [target]  # no room to back off inside the travel range
+        if self.check is not None and not self.check([pre, target], current):
+            return [target]  # pre-position or the move through it is not allowed
+        return [pre, target]
+
+
+BacklashCalibration = namedtuple(
+    "BacklashCalibration", "backlash edge_forward edge_reverse overshoot positions forward reverse"
+)
+
+
+def _edge(positions, values, level):
+    """First position where `values` crosses `level` (linear interpolation)."""
+    above = values >= level
+    idx = np.flatnonzero(above[1:] != above[:-1])
+    if not len(idx):
+        raise ValueError("No edge found in the sweep; widen the span or recenter")
+    i = idx[0]
+    x0, x1, y0, y1 = positions[i], positions[i + 1], values[i], values[i + 1]
+    return x0 + (level - y0) * (x1 - x0) / (y1 - y0)
+
+
+def measure_backlash(move_to, wait, read, center, span, steps=41, samples=5, margin=3.0,
+                     check=None):
+    """Sweep [center - span, center + span] forward and back, reading `read()` at each step.
+
+    move_to(position) sends a move, wait() blocks until the stage stops,
+    read() returns one power reading.  The edge is located at the 50 %
+    level between the sweep's min and max in each direction.  The
+    suggested overshoot is `margin` times the measured backlash.
+    check(points, start) -> bool, the same callback as the compensator's,
+    must accept every calibration move before the first one is sent.
+    """
+    positions = np.linspace(center - span, center + span, steps)
+    # start beyond the first point so the first sweep is already loaded
+    preload = positions[0] - span / steps * 5
+    if check is not None:
+        sweep = np.concatenate([positions, positions[::-1]])
+        if not (check([preload], None) and check(sweep, [preload])):
+            raise ValueError(f"Backlash sweep {preload:.4f} .. {positions[-1]:.4f} is not allowed")
+    sweeps = []
+    move_to(preload)
+    wait()
+    for path in (positions, positions[::-1]):
+        values = np.empty(steps)
+        for i, p in enumerate(path):
+            move_to(p)
+            wait()
+            values[i] = np.mean([read() for _ in range(samples)])
+        sweeps.append(values)
+    forward, reverse = sweeps[0], sweeps[1][::-1]
+    level = 0.5 * (min(forward.min(), reverse.min()) + max(forward.max(), reverse.max()))
+    edge_f = _edge(positions, forward, level)
+    edge_r = _edge(positions, reverse, level)
+    backlash = abs(edge_f - edge_r)
+    return BacklashCalibration(backlash, edge_f, edge_r, margin * backlash, positions, forward, reverse)
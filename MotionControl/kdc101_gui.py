@@ -1,36 +1,42 @@
-import os
-import sys
-import json
-import time
 import tkinter as tk
 from ctypes import *
 import tkinter.messagebox as mb
 
-status = 1
-os.add_dll_directory(r"C:\Program Files\Thorlabs\Kinesis")
-lib: CDLL = cdll.LoadLibrary(
-    "Thorlabs.MotionControl.KCube.DCServo.dll"
-)
+from MotionControl.limits import LimitError
+from MotionControl.persistence import PositionStore
+from MotionControl.position_library import PositionLibrary
+from MotionControl.stage_controller import StageController
+
 serial_num = c_char_p(b"27007518")
 STEPS_PER_REV = c_double(34555)  # for the PRM1-Z8
 gbox_ratio = c_double(1.0)
 pitch = c_double(1.0)
 pos_min = 0
 pos_max = 25
+# owns the DLL handle, unit conversion, limits, backlash approach and polling;
+# scripts can import it and drive the stage without building the GUI
+stage = StageController(serial_num, STEPS_PER_REV, gbox_ratio, pitch, pos_min, pos_max)
+units = stage.units
+# soft limits plus keep-out zones, e.g. limits.add_zone(12.0, 12.6, name="clamp")
+limits = stage.limits
+# every move ends travelling forward; recalibrate with stage.calibrate_backlash()
+approach = stage.approach
+STAGE_POLL_S = 0.05  # controller refresh / motion queue interval while the GUI is connected
 
 
 POSITIONS_FILE = 'positions.json'
+store = PositionStore(POSITIONS_FILE)  # debounced background writes
+LIBRARY_FILE = 'position_library.sqlite'
+LIBRARY_PAGE = 50
+_library = None
 
-def update_position(new_pos_real):
-    new_pos_dev = c_int()
-    lib.CC_GetDeviceUnitFromRealValue(
-        serial_num, c_double(new_pos_real),
-        byref(new_pos_dev), 0
-    )
-    lib.CC_SetMoveAbsolutePosition(serial_num, new_pos_dev)
-    lib.CC_MoveAbsolute(serial_num)
-    # time.sleep(0.25)
 
+def get_library():
+    # opened on first use so startup does not depend on the library size
+    global _library
+    if _library is None:
+        _library = PositionLibrary(LIBRARY_FILE)
+    return _library
 
 
 class DashedEntry(tk.Frame):
@@ -70,30 +76,21 @@ class SolidButton(tk.Button):
         self.bind("<Enter>", lambda e: self.configure(relief='groove'))
         self.bind("<Leave>", lambda e: self.configure(relief='raised'))
 
+def _stage_key():
+    return stage.serial_str
+
+
 def load_state(num_slots, default_current=10.0):
-    if os.path.exists(POSITIONS_FILE):
-        try:
-            with open(POSITIONS_FILE, 'r') as f:
-                data = json.load(f)
-            current = float(data.get('current_pos', default_current))
-            slots = data.get('slots', [0.0] * num_slots)
-            slots = (slots + [0.0] * num_slots)[:num_slots]
-            return current, [float(v) for v in slots]
-        except Exception:
-            pass
-    return default_current, [0.0] * num_slots
+    return store.load(_stage_key(), num_slots, default_current=default_current)
 
 
 def save_state(current_pos, slots):
-    data = {
-        'current_pos': current_pos.get(),
-        'slots': [sv.get() for sv in slots]
-    }
-    try:
-        with open(POSITIONS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        print("Error saving positions:", e)
+    # only updates memory; the store writes to disk once the clicks settle
+    store.update(
+        _stage_key(),
+        current_pos=current_pos.get(),
+        slots=[sv.get() for sv in slots]
+    )
 
 def build_gui():
     root = tk.Tk()
@@ -118,16 +115,36 @@ def build_gui():
     _upd_set()
     _upd_dev()
 
+    limit_info = tk.StringVar(value="")
+
     def safe_set_current(v):
-        if v < pos_min or v > pos_max:
-            mb.showwarning("Out of Range",
-                            f"Position must be between {pos_min} and {pos_max} mm")
-        else:
-            current_pos.set(v)
+        # every leg the queue will send (approach pre-position included) must clear the
+        # zones; while connected, plan from the queued target exactly like stage.move_to
+        try:
+            if stage.connected:
+                limits.validate_path(stage.legs(v), [stage.target()])
+            else:
+                limits.validate_path(approach.path(current_pos.get(), v), [current_pos.get()])
+        except LimitError as e:
+            print("Move rejected:", e)
+            limit_info.set(str(e))
+            return
+        limit_info.set("")
+        current_pos.set(v)
 
     def persist():
         save_state(current_pos, slots)
 
+    motion_info = tk.StringVar(value="")
+
+    def queue_move():
+        # rapid clicks are folded into one move instead of one CC_MoveAbsolute each
+        if not stage.connected:
+            return
+        stage.motion.move_absolute(stage.serial_str, current_pos.get())
+        st = stage.motion.stats()
+        motion_info.set(f"{st['issued']} moves sent, {st['coalesced']} coalesced")
+
     # --- Top bar: Connect / Home / Disconnect (boxed) ---
     conn_frame = tk.LabelFrame(root, text="Connection ●", padx=10, pady=5, fg="red")
     conn_frame.pack(fill='x', padx=10, pady=(10, 5))
@@ -141,42 +158,31 @@ def build_gui():
     btn_disconnect.pack(side='left', padx=5)
 
     def do_connect():
-        global status
-        if lib.TLI_BuildDeviceList() == 0:
-            status = lib.CC_Open(serial_num)
-        if status == 0:
-            print("→ Connected")
-            btn_connect.config(state='disabled')
-            btn_home.config(state='normal')
-            btn_disconnect.config(state='normal')
-            conn_frame.config(text="Connection ●", fg="green")
-            lib.CC_StartPolling(serial_num, c_int(200))
-            lib.CC_SetMotorParamsExt(
-                serial_num, STEPS_PER_REV, gbox_ratio, pitch
-            )
-            time.sleep(0.1)
-            lib.CC_RequestPosition(serial_num)
-            real_val = c_double()
-            unit = lib.CC_GetPosition(serial_num)
-            lib.CC_GetRealValueFromDeviceUnit(
-                serial_num, c_int(unit), byref(real_val), 0
-            )
-            safe_set_current(real_val.value)
+        try:
+            stage.connect()
+        except (OSError, ConnectionError) as e:
+            print("Connect failed:", e)
+            return
+        print("→ Connected")
+        btn_connect.config(state='disabled')
+        btn_home.config(state='normal')
+        btn_disconnect.config(state='normal')
+        conn_frame.config(text="Connection ●", fg="green")
+        stage.start_polling(STAGE_POLL_S)
+        current_pos.set(stage.state.position)  # where the stage is, not a move
 
     def do_home():
         print("→ Homing...")
-        lib.CC_Home(serial_num)
-        safe_set_current(0.0)
+        stage.home(wait=False)
+        current_pos.set(0.0)
 
     def do_disconnect():
-        global status
         print("→ Disconnected")
-        status = 1
         btn_connect.config(state='normal')
         btn_home.config(   state='disabled')
         btn_disconnect.config(state='disabled')
         conn_frame.config(text="Connection ●", fg="red")
-        lib.CC_Close(serial_num)
+        stage.close()
 
     btn_connect.config(   command=do_connect)
     btn_home.config(      command=do_home)
@@ -193,29 +199,20 @@ def build_gui():
     tk.Label(sec1, text="Device Position:").grid(row=1, column=0, sticky='w')
     tk.Label(sec1, textvariable=disp_dev,
             font=('TkDefaultFont', 18), fg='blue').grid(row=1, column=1, padx=(5,20))
+    tk.Label(sec1, textvariable=limit_info, fg='red', wraplength=300, justify='left')\
+        .grid(row=2, column=0, columnspan=2, sticky='w')
+
+    # the controller's thread talks to the device; the view only copies its cached state
+    VIEW_MS = 200
+
+    def refresh_view():
+        state = stage.state
+        if stage.connected and state is not None:
+            dev_var.set(state.position)
+            homed_var.set(state.homed)
+        root.after(VIEW_MS, refresh_view)
 
-    POLL_MS = 200
-
-    def poll_device():
-        if status == 0:
-            try:
-                lib.CC_RequestPosition(serial_num)
-                real_val = c_double()
-                unit = lib.CC_GetPosition(serial_num)
-                lib.CC_GetRealValueFromDeviceUnit(
-                    serial_num, c_int(unit),
-                    byref(real_val), 0
-                )
-                dev_var.set(real_val.value)
-                homed = c_bool(False)
-                lib.CC_GetHomingState(serial_num, byref(homed))
-                print(homed_var.get())
-                homed_var.set(homed.value)
-            except Exception:
-                pass
-        root.after(POLL_MS, poll_device)
-
-    root.after(POLL_MS, poll_device)
+    root.after(VIEW_MS, refresh_view)
 
     # --- Section 2: Saved Positions ---
     sec2 = tk.LabelFrame(root, text="Saved Positions", padx=10, pady=10)
@@ -238,7 +235,7 @@ def build_gui():
         def make_go(idx):
             def do_go():
                 safe_set_current(slots[idx].get())
-                update_position(current_pos.get())
+                queue_move()
                 persist()
             return do_go
 
@@ -268,7 +265,7 @@ def build_gui():
         try:
             d = float(fwd.get())
             safe_set_current(current_pos.get() + d)
-            update_position(current_pos.get())
+            queue_move()
             persist()
         except ValueError:
             pass
@@ -284,7 +281,7 @@ def build_gui():
             width=3,
             command=lambda d=delta: (
                 safe_set_current(current_pos.get()+d),
-                update_position(current_pos.get()),
+                queue_move(),
                 persist()
             )
         ).pack(side='left', padx=4)
@@ -298,7 +295,7 @@ def build_gui():
         try:
             d = float(bwd.get())
             safe_set_current(current_pos.get() - d)
-            update_position(current_pos.get())
+            queue_move()
             persist()
         except ValueError:
             pass
@@ -314,11 +311,14 @@ def build_gui():
             width=3,
             command=lambda d=delta: (
                 safe_set_current(current_pos.get()-d),
-                update_position(current_pos.get()),
+                queue_move(),
                 persist()
             )
         ).pack(side='left', padx=4)
 
+    tk.Label(sec3, textvariable=motion_info, fg='grey')\
+        .grid(row=4, column=0, columnspan=4, sticky='w')
+
     # --- Section 4: Manual Goto ---
     sec4 = tk.LabelFrame(root, text="Manual Goto", padx=10, pady=10)
     sec4.pack(fill='x', padx=10, pady=(5, 10))
@@ -329,7 +329,7 @@ def build_gui():
         try:
             v = float(goto.get())
             safe_set_current(v)
-            update_position(current_pos.get())
+            queue_move()
             persist()
         except ValueError:
             pass
@@ -337,8 +337,88 @@ def build_gui():
     SolidButton(sec4, text="Go", command=do_goto)\
         .pack(side='left', padx=5)
 
+    # --- Section 5: Position Library ---
+    sec5 = tk.LabelFrame(root, text="Position Library", padx=10, pady=10)
+    sec5.pack(fill='x', padx=10, pady=(5, 10))
+
+    tk.Label(sec5, text="Name / tag:").grid(row=0, column=0, sticky='w')
+    lib_entry = DashedEntry(sec5, width=140)
+    lib_entry.grid(row=0, column=1, padx=5)
+
+    lib_list = tk.Listbox(sec5, height=8, width=32)
+    lib_scroll = tk.Scrollbar(sec5, orient='vertical', command=lib_list.yview)
+    lib_list.grid(row=1, column=0, columnspan=3, sticky='we', pady=(10, 0))
+    lib_scroll.grid(row=1, column=3, sticky='ns', pady=(10, 0))
+    lib_rows = []   # Position tuples currently shown
+    lib_state = {"query": {}, "more": False}  # filters of the listing, more pages?
+    lib_nearest = tk.StringVar(value="Nearest: -")
+    tk.Label(sec5, textvariable=lib_nearest, anchor='w')\
+        .grid(row=2, column=0, columnspan=4, sticky='we', pady=(5, 0))
+
+    def lib_filters():
+        text = lib_entry.get().strip()
+        if text.startswith("tag:"):
+            return {"tag": text[4:].strip()}
+        return {"prefix": text}
+
+    def lib_load_page():
+        rows = get_library().find(_stage_key(), limit=LIBRARY_PAGE,
+                                  offset=len(lib_rows), **lib_state["query"])
+        lib_state["more"] = len(rows) == LIBRARY_PAGE
+        for r in rows:
+            lib_list.insert(tk.END, f"{r.name}  ({r.sample or '-'})  {r.position:.4f}")
+        lib_rows.extend(rows)
+
+    def lib_on_scroll(first, last):
+        lib_scroll.set(first, last)
+        # fetch the next page only when the user scrolls to the end
+        if float(last) >= 1.0 and lib_state["more"]:
+            lib_load_page()
+    lib_list.config(yscrollcommand=lib_on_scroll)
+
+    def lib_show_nearest():
+        near = get_library().nearest(_stage_key(), current_pos.get())
+        lib_nearest.set(f"Nearest: {near[0].name} ({near[0].position:.4f})"
+                        if near else "Nearest: -")
+
+    def lib_find():
+        lib_list.delete(0, tk.END)
+        lib_rows.clear()
+        lib_state["query"] = lib_filters()
+        lib_load_page()
+        lib_show_nearest()
+
+    def lib_save():
+        name = lib_entry.get().strip()
+        if not name or name.startswith("tag:"):
+            mb.showwarning("Position Library", "Enter a name for the current position")
+            return
+        get_library().add(_stage_key(), name, current_pos.get())
+        lib_find()
+
+    def lib_go():
+        sel = lib_list.curselection()
+        if not sel:
+            return
+        safe_set_current(lib_rows[sel[0]].position)
+        queue_move()
+        persist()
+        lib_show_nearest()
+
+    SolidButton(sec5, text="Save", command=lib_save)\
+        .grid(row=0, column=2, padx=5)
+    SolidButton(sec5, text="Find", command=lib_find)\
+        .grid(row=0, column=3, padx=5)
+    SolidButton(sec5, text="Go", command=lib_go)\
+        .grid(row=3, column=0, columnspan=4, sticky='we', pady=(10, 0))
+    lib_list.bind("<Double-Button-1>", lambda e: lib_go())
+
     def on_close():
         persist()
+        stage.close()
+        store.close()
+        if _library is not None:
+            _library.close()
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_close)
@@ -0,0 +1,187 @@
+"""Soft limits and keep-out zones, checked without dialogs.
+
+    limits = LimitEngine(pos_min=0, pos_max=25)
+    limits.add_zone(12.0, 12.6, name="clamp")                    # one axis
+    xy = LimitEngine([0, 0], [25, 25])
+    xy.add_zone([10, 4], [14, 9], name="objective")             # box over both axes
+    xy.validate_path(points, start)                             # raises before any move
+
+Violations raise typed errors (SoftLimitError, KeepOutError), both
+LimitError / ValueError subclasses, carrying the offending point index.
+Single-axis zones are merged into sorted interval arrays and looked up
+with np.searchsorted; boxes are tested with a vectorized slab test, so a
+whole trajectory is checked in one pass before the stage moves.
+"""
+import numpy as np
+
+
+class LimitError(ValueError):
+    def __init__(self, message, index=None, point=None):
+        super().__init__(message)
+        self.index = index
+        self.point = point
+
+
+class SoftLimitError(LimitError):
+    """A point lies outside [pos_min, pos_max]."""
+
+
+class KeepOutError(LimitError):
+    """A point or the straight move to it enters a keep-out zone."""
+    def __init__(self, message, index=None, point=None, zone=None):
+        super().__init__(message, index, point)
+        self.zone = zone
+
+
+class LimitEngine:
+    def __init__(self, pos_min, pos_max):
+        self.pos_min = np.atleast_1d(np.asarray(pos_min, dtype=np.float64))
+        self.pos_max = np.atleast_1d(np.asarray(pos_max, dtype=np.float64))
+        self.ndim = len(self.pos_min)
+        self.zones = []  # (name, axis or None, lo, hi) as added
+        self._axis_index = {}
+        self._box_lo = np.empty((0, self.ndim))
+        self._box_hi = np.empty((0, self.ndim))
+        self._box_names = []
+
+    # ------ZONES ---------------------------------------------
+    def add_zone(self, lo, hi, name=None, axis=None):
+        """Keep-out interval on one axis (scalars) or box over all axes (sequences)."""
+        if name is None:
+            name = f"zone{len(self.zones)}"
+        lo_a = np.atleast_1d(np.asarray(lo, dtype=np.float64))
+        hi_a = np.atleast_1d(np.asarray(hi, dtype=np.float64))
+        if np.any(lo_a > hi_a):
+            raise ValueError(f"Zone {name}: lo must not exceed hi")
+        if len(lo_a) == 1:
+            axis = 0 if axis is None else axis
+        elif len(lo_a) != self.ndim:
+            raise ValueError(f"Zone {name} has {len(lo_a)} axes, expected {self.ndim}")
+        self.zones.append((name, axis if len(lo_a) == 1 else None, lo_a, hi_a))
+        self._rebuild()
+
+    def clear_zones(self):
+        self.zones = []
+        self._rebuild()
+
+    def _rebuild(self):
+        per_axis = {}
+        boxes = []
+        for name, axis, lo, hi in self.zones:
+            if axis is not None:
+                per_axis.setdefault(axis, []).append((lo[0], hi[0], name))
+            else:
+                boxes.append((lo, hi, name))
+        self._axis_index = {}
+        for axis, intervals in per_axis.items():
+            intervals.sort()
+            starts, ends, names = [], [], []
+            for lo, hi, name in intervals:
+                if starts and lo <= ends[-1]:
+                    ends[-1] = max(ends[-1], hi)  # merge overlapping zones
+                    names[-1] += "+" + name
+                else:
+                    starts.append(lo)
+                    ends.append(hi)
+                    names.append(name)
+            self._axis_index[axis] = (np.array(starts), np.array(ends), names)
+        self._box_lo = np.array([b[0] for b in boxes]).reshape(-1, self.ndim)
+        self._box_hi = np.array([b[1] for b in boxes]).reshape(-1, self.ndim)
+        self._box_names = [b[2] for b in boxes]
+
+    # ------CHECKS ---------------------------------------------
+    def _points(self, points):
+        points = np.asarray(points, dtype=np.float64)
+        return points.reshape(-1, self.ndim)
+
+    def _fmt(self, x):
+        return x.tolist() if self.ndim > 1 else float(x[0])
+
+    def violations(self, points, start=None):
+        """(index, error) for the first bad point or move; (None, None) if all clear.
+
+        With `start`, the straight moves start -> p0 -> p1 ... are checked
+        against the zones as well as the points themselves.
+        """
+        pts = self._points(points)
+        out = np.any((pts < self.pos_min) | (pts > self.pos_max), axis=1)
+        if out.any():
+            i = int(np.flatnonzero(out)[0])
+            return i, SoftLimitError(
+                f"Point {i} {self._fmt(pts[i])} is outside "
+                f"[{self._fmt(self.pos_min)}, {self._fmt(self.pos_max)}]", i, pts[i])
+        a = pts if start is None else np.vstack([self._points(start), pts[:-1]])
+        hits = []
+        for axis, (starts, ends, names) in self._axis_index.items():
+            lo = np.minimum(a[:, axis], pts[:, axis])
+            hi = np.maximum(a[:, axis], pts[:, axis])
+            # last zone starting at or below hi; merged zones have increasing ends
+            k = np.searchsorted(starts, hi, side="right") - 1
+            hit = np.flatnonzero((k >= 0) & (ends[np.maximum(k, 0)] >= lo))
+            if len(hit):
+                hits.append((int(hit[0]), names[k[hit[0]]]))
+        if len(self._box_lo):
+            i, name = self._first_box_hit(a, pts)
+            if i is not None:
+                hits.append((i, name))
+        if not hits:
+            return None, None
+        i, name = min(hits, key=lambda h: h[0])
+        what = "Point" if start is None else "Move to point"
+        return i, KeepOutError(f"{what} {i} {self._fmt(pts[i])} enters keep-out zone {name}",
+                               i, pts[i], name)
+
+    def _first_box_hit(self, a, b, chunk=4096):
+        lo, hi = self._box_lo, self._box_hi
+        for s in range(0, len(a), chunk):
+            a_c, b_c = a[s:s + chunk], b[s:s + chunk]
+            seg_lo = np.minimum(a_c, b_c)[:, None, :]
+            seg_hi = np.maximum(a_c, b_c)[:, None, :]
+            # bounding-box overlap first; the exact test only runs on candidates
+            seg, box = np.nonzero(np.all((seg_lo <= hi) & (seg_hi >= lo), axis=2))
+            if not len(seg):
+                continue
+            p0 = a_c[seg]
+            d = b_c[seg] - p0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t1 = (lo[box] - p0) / d
+                t2 = (hi[box] - p0) / d
+            # axes without motion are already known to overlap the box
+            tmin = np.where(d == 0, -np.inf, np.minimum(t1, t2))
+            tmax = np.where(d == 0, np.inf, np.maximum(t1, t2))
+            hit = np.maximum(tmin.max(axis=1), 0.0) <= np.minimum(tmax.min(axis=1), 1.0)
+            if hit.any():
+                j = int(np.flatnonzero(hit)[0])  # np.nonzero is row-major: first segment first
+                return s + int(seg[j]), self._box_names[int(box[j])]
+        return None, None
+
+    def allowed(self, points):
+        """Boolean mask of points outside every zone and inside the soft limits."""
+        pts = self._points(points)
+        ok = np.all((pts >= self.pos_min) & (pts <= self.pos_max), axis=1)
+        for axis, (starts, ends, _) in self._axis_index.items():
+            k = np.searchsorted(starts, pts[:, axis], side="right") - 1
+            ok &= ~((k >= 0) & (pts[:, axis] <= ends[np.maximum(k, 0)]))
+        if len(self._box_lo):
+            inside = np.all((pts[:, None, :] >= self._box_lo) & (pts[:, None, :] <= self._box_hi), axis=2)
+            ok &= ~inside.any(axis=1)
+        return ok
+
+    def path_allowed(self, points, start=None):
+        """True if validate_path(points, start) would pass; usable as BacklashCompensator.check."""
+        return self.violations(points, start)[1] is None
+
+    def check(self, position):
+        """Raise for a single target position."""
+        self.validate(position)
+
+    def validate(self, points):
+        _, err = self.violations(points)
+        if err is not None:
+            raise err
+
+    def validate_path(self, points, start):
+        """Raise if any point or straight move start -> p0 -> p1 ... is not allowed."""
+        _, err = self.violations(points, start)
+        if err is not None:
+            raise err
@@ -0,0 +1,164 @@
+"""Coalescing motion command queue.
+
+    queue = MotionQueue(move_to=send_absolute_move, is_moving=axis_is_moving)
+    queue.move_relative(axis, +0.1)    # many fast clicks ...
+    queue.poll()                       # ... called from the device poll loop
+
+Each axis has at most one move in flight.  Commands that arrive while it
+is moving are folded into a single pending target (relative moves are
+added to it), which is sent when the current move finishes, or as one
+retarget of the running move at most every `retarget_interval` seconds.
+A burst of N jog clicks therefore costs about one bus command instead
+of N moves that keep interrupting each other.
+
+With an `approach` compensator (backlash.BacklashCompensator) a target
+may be reached in two legs; the second is sent from poll() once the
+first has stopped, so the caller never blocks.
+
+Axes can be any handle, including the unhashable c_char_p serial numbers
+of the Kinesis API; the handle is passed back to move_to / is_moving.
+"""
+import threading
+import time
+
+
+def _key(axis):
+    try:
+        hash(axis)
+    except TypeError:
+        # ctypes handles (c_char_p serial numbers) are unhashable; key by their value
+        return axis.value
+    return axis
+
+
+class _Axis:
+    __slots__ = ("axis", "target", "pending", "final", "in_flight", "issued_at")
+
+    def __init__(self, axis):
+        self.axis = axis        # handle passed to move_to / is_moving
+        self.target = None      # target of the move in flight (or the last one)
+        self.pending = None     # coalesced target waiting to be sent
+        self.final = None       # last leg of a two-leg (backlash) approach
+        self.in_flight = False
+        self.issued_at = 0.0
+
+
+class MotionQueue:
+    def __init__(self, move_to, is_moving, retarget_interval=0.25, approach=None,
+                 status_lag=0.0, clock=time.monotonic):
+        """move_to(axis, position) sends an absolute move; is_moving(axis) -> bool.
+
+        retarget_interval=None never interrupts a running move: the
+        pending target is only sent once the axis has stopped.
+        status_lag is how long is_moving() may still report a stopped
+        axis after a command (for the KDC101, the CC_StartPolling
+        interval); an axis counts as moving for that long after each move.
+        """
+        self.move_to = move_to
+        self.is_moving = is_moving
+        self.retarget_interval = retarget_interval
+        self.status_lag = status_lag
+        self.approach = approach
+        self.clock = clock
+        self.submitted = 0
+        self.issued = 0
+        self.coalesced = 0
+        self._axes = {}
+        self._lock = threading.Lock()
+
+    def _axis(self, axis):
+        key = _key(axis)
+        state = self._axes.get(key)
+        if state is None:
+            state = self._axes[key] = _Axis(axis)
+        return state
+
+    # ------COMMANDS ---------------------------------------------
+    def move_absolute(self, axis, position):
+        with self._lock:
+            self._submit(self._axis(axis), axis, float(position))
+
+    def move_relative(self, axis, delta, origin=None):
+        """Move by `delta` from the latest commanded target (or `origin` if none yet)."""
+        with self._lock:
+            state = self._axis(axis)
+            base = state.pending if state.pending is not None else self._goal(state)
+            if base is None:
+                if origin is None:
+                    raise ValueError("No commanded position yet; pass origin")
+                base = origin
+            self._submit(state, axis, base + delta)
+
+    def _submit(self, state, axis, position):
+        self.submitted += 1
+        if not state.in_flight:
+            self._issue(state, axis, position)
+            return
+        if state.pending is not None:
+            self.coalesced += 1
+        state.pending = position
+        self._maybe_retarget(state, axis)
+
+    def _issue(self, state, axis, position):
+        state.pending = None
+        if state.in_flight and position == state.target and state.final is None:
+            self.coalesced += 1
+            return
+        state.final = None
+        if self.approach is not None:
+            legs = self.approach.path(state.target, position, at_rest=not state.in_flight)
+            if len(legs) > 1:
+                position, state.final = legs[0], legs[-1]
+        self._send(state, axis, position)
+
+    def _send(self, state, axis, position):
+        self.move_to(axis, position)
+        state.target = position
+        state.in_flight = True
+        state.issued_at = self.clock()
+        self.issued += 1
+
+    def _maybe_retarget(self, state, axis):
+        if self.retarget_interval is None:
+            return
+        if self.clock() - state.issued_at >= self.retarget_interval:
+            self._issue(state, axis, state.pending)
+
+    # ------POLLING ---------------------------------------------
+    def poll(self):
+        """Advance every axis; call periodically (e.g. from the GUI poll loop)."""
+        with self._lock:
+            now = self.clock()
+            for state in self._axes.values():
+                if not state.in_flight:
+                    continue
+                axis = state.axis
+                # a fresh command may not show in the status bits yet
+                if now - state.issued_at < self.status_lag or self.is_moving(axis):
+                    if state.pending is not None:
+                        self._maybe_retarget(state, axis)
+                    continue
+                state.in_flight = False
+                if state.pending is not None:
+                    self._issue(state, axis, state.pending)
+                elif state.final is not None:
+                    final, state.final = state.final, None
+                    self._send(state, axis, final)
+
+    def target(self, axis):
+        """Latest commanded position of `axis` (pending or in flight)."""
+        with self._lock:
+            state = self._axis(axis)
+            return state.pending if state.pending is not None else self._goal(state)
+
+    @staticmethod
+    def _goal(state):
+        return state.final if state.final is not None else state.target
+
+    def busy(self, axis):
+        with self._lock:
+            state = self._axis(axis)
+            return state.in_flight or state.pending is not None or state.final is not None
+
+    def stats(self):
+        return {"submitted": self.submitted, "issued": self.issued, "coalesced": self.coalesced}
@@ -0,0 +1,173 @@
+"""Debounced, atomic persistence of stage positions.
+
+    store = PositionStore("positions.json")
+    current, slots = store.load("27007518", num_slots=4)
+    store.update("27007518", current_pos=12.5, slots=[...])   # returns at once
+    store.close()                                              # final flush
+
+Updates only change the in-memory copy and wake a background writer,
+which waits until the updates have been quiet for `delay` seconds (or
+`max_delay` has passed since the first unsaved change) before writing.
+Rapid jogging therefore causes one write, not one per click.  Files are
+written to a temporary file in the same directory and moved into place
+with os.replace(), so a crash leaves either the old or the new file,
+never a truncated one.
+
+The file holds any number of stages, each with any number of named
+position sets:
+
+    {"version": 1,
+     "stages": {"27007518": {"current_pos": 12.5,
+                             "sets": {"default": [0.0, 5.0, 0.0, 0.0]}}}}
+
+The old single-stage format ({"current_pos": ..., "slots": [...]}) is
+read as well and adopted by the first stage that loads it.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+DEFAULT_SET = "default"
+_LEGACY = ""  # stage key of a file written in the old single-stage format
+
+
+class PositionStore:
+    def __init__(self, path, delay=0.5, max_delay=5.0):
+        self.path = path
+        self.delay = delay
+        self.max_delay = max_delay
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._data = self._read()
+        self._dirty = False
+        self._closing = False
+        self._first_change = self._last_change = 0.0
+        self._thread = threading.Thread(target=self._run, name="position-store", daemon=True)
+        self._thread.start()
+
+    def _read(self):
+        data = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print("Error loading positions:", e)
+        if "stages" not in data:
+            legacy = data
+            data = {"version": 1, "stages": {}}
+            if legacy:
+                data["stages"][_LEGACY] = {
+                    "current_pos": legacy.get("current_pos"),
+                    "sets": {DEFAULT_SET: legacy.get("slots", [])},
+                }
+        return data
+
+    # ------ACCESS ---------------------------------------------
+    def _stage(self, serial):
+        stages = self._data["stages"]
+        stage = stages.get(serial)
+        if stage is None:
+            stage = stages.pop(_LEGACY, None) or {"current_pos": None, "sets": {}}
+            stages[serial] = stage
+        return stage
+
+    def stages(self):
+        with self._cond:
+            return [s for s in self._data["stages"] if s != _LEGACY]
+
+    def set_names(self, serial):
+        with self._cond:
+            return list(self._stage(serial)["sets"])
+
+    def load(self, serial, num_slots, set_name=DEFAULT_SET, default_current=10.0):
+        """(current_pos, slots) for a stage, padded/truncated to `num_slots`."""
+        with self._cond:
+            stage = self._stage(serial)
+            current = stage.get("current_pos")
+            slots = list(stage["sets"].get(set_name, []))
+        current = default_current if current is None else float(current)
+        slots = (slots + [0.0] * num_slots)[:num_slots]
+        return current, [float(v) for v in slots]
+
+    def update(self, serial, current_pos=None, slots=None, set_name=DEFAULT_SET):
+        """Change the in-memory state and schedule a write; never blocks on disk."""
+        with self._cond:
+            stage = self._stage(serial)
+            if current_pos is not None:
+                stage["current_pos"] = float(current_pos)
+            if slots is not None:
+                stage["sets"][set_name] = [float(v) for v in slots]
+            self._touch()
+
+    def delete_set(self, serial, set_name):
+        with self._cond:
+            if self._stage(serial)["sets"].pop(set_name, None) is not None:
+                self._touch()
+
+    def _touch(self):
+        now = time.monotonic()
+        if not self._dirty:
+            self._dirty = True
+            self._first_change = now
+        self._last_change = now
+        self._cond.notify()
+
+    # ------WRITING ---------------------------------------------
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closing:
+                    self._cond.wait()
+                if self._closing:
+                    return
+                # debounce: wait for a quiet period, but never longer than max_delay
+                while not self._closing:
+                    now = time.monotonic()
+                    wait = min(self._last_change + self.delay, self._first_change + self.max_delay) - now
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._closing:
+                    return
+            self._write()
+
+    def _write(self):
+        with self._write_lock:
+            with self._cond:
+                if not self._dirty:
+                    return
+                payload = json.dumps(self._data, indent=2)
+                self._dirty = False
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(prefix=".positions-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self.writes += 1
+            except Exception as e:
+                print("Error saving positions:", e)
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                with self._cond:
+                    self._dirty = True
+
+    def flush(self):
+        """Write pending changes now, on the calling thread."""
+        self._write()
+
+    def close(self):
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout=2)
+        self._write()
@@ -0,0 +1,188 @@
+"""Named stage positions in a SQLite file, indexed for large libraries.
+
+    lib = PositionLibrary("position_library.sqlite")
+    lib.add("27007518", "focus", 12.31, sample="wafer-7", tags=("align",))
+    lib.get("27007518", "focus", sample="wafer-7")        # -> 12.31
+    lib.find("27007518", tag="align", limit=50)           # one page of Position
+    lib.nearest("27007518", 12.0, k=3)
+
+Positions are unique per (stage, sample, name).  Lookups by name, name
+prefix, tag and position all go through B-tree indexes, and find()
+returns one page at a time, so neither queries nor a GUI listing need
+to read the whole library.
+"""
+import sqlite3
+import time
+from collections import namedtuple
+
+
+Position = namedtuple("Position", "id stage sample name position note")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    id       INTEGER PRIMARY KEY,
+    stage    TEXT NOT NULL,
+    sample   TEXT NOT NULL DEFAULT '',
+    name     TEXT NOT NULL,
+    position REAL NOT NULL,
+    note     TEXT NOT NULL DEFAULT '',
+    modified REAL NOT NULL,
+    UNIQUE (stage, sample, name)
+);
+CREATE INDEX IF NOT EXISTS positions_by_name ON positions (stage, name);
+CREATE INDEX IF NOT EXISTS positions_by_value ON positions (stage, position);
+CREATE INDEX IF NOT EXISTS positions_by_sample ON positions (stage, sample, position);
+CREATE TABLE IF NOT EXISTS tags (
+    position_id INTEGER NOT NULL REFERENCES positions (id) ON DELETE CASCADE,
+    tag         TEXT NOT NULL,
+    PRIMARY KEY (position_id, tag)
+);
+CREATE INDEX IF NOT EXISTS tags_by_tag ON tags (tag, position_id);
+"""
+
+_COLUMNS = "p.id, p.stage, p.sample, p.name, p.position, p.note"
+
+
+class PositionLibrary:
+    def __init__(self, path="position_library.sqlite"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------EDITING ---------------------------------------------
+    def add(self, stage, name, position, sample="", tags=(), note=""):
+        """Insert or overwrite a position; returns its id.
+
+        When overwriting, non-empty `tags` replace the entry's tags.
+        """
+        with self.db:
+            self.db.execute(
+                "INSERT INTO positions (stage, sample, name, position, note, modified) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (stage, sample, name) DO UPDATE SET "
+                "position = excluded.position, note = excluded.note, modified = excluded.modified",
+                (stage, sample, name, float(position), note, time.time()),
+            )
+            pid = self.db.execute(
+                "SELECT id FROM positions WHERE stage = ? AND sample = ? AND name = ?",
+                (stage, sample, name),
+            ).fetchone()[0]
+            if tags:
+                self.db.execute("DELETE FROM tags WHERE position_id = ?", (pid,))
+            self.db.executemany(
+                "INSERT OR IGNORE INTO tags (position_id, tag) VALUES (?, ?)",
+                [(pid, t) for t in tags],
+            )
+        return pid
+
+    def add_many(self, stage, items, sample=""):
+        """Bulk insert of (name, position) pairs in one transaction."""
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO positions (stage, sample, name, position, modified) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (stage, sample, name) DO UPDATE SET "
+                "position = excluded.position, modified = excluded.modified",
+                [(stage, sample, name, float(pos), now) for name, pos in items],
+            )
+
+    def remove(self, stage, name, sample=""):
+        with self.db:
+            cur = self.db.execute(
+                "DELETE FROM positions WHERE stage = ? AND sample = ? AND name = ?",
+                (stage, sample, name),
+            )
+        return cur.rowcount > 0
+
+    def tag(self, position_id, *tags):
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO tags (position_id, tag) VALUES (?, ?)",
+                [(position_id, t) for t in tags],
+            )
+
+    def untag(self, position_id, *tags):
+        with self.db:
+            self.db.executemany(
+                "DELETE FROM tags WHERE position_id = ? AND tag = ?",
+                [(position_id, t) for t in tags],
+            )
+
+    # ------QUERIES ---------------------------------------------
+    def get(self, stage, name, sample=""):
+        """Position value, or None if there is no such entry."""
+        row = self.db.execute(
+            "SELECT position FROM positions WHERE stage = ? AND sample = ? AND name = ?",
+            (stage, sample, name),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def count(self, stage=None):
+        if stage is None:
+            return self.db.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+        return self.db.execute("SELECT COUNT(*) FROM positions WHERE stage = ?", (stage,)).fetchone()[0]
+
+    def find(self, stage, sample=None, tag=None, prefix=None, limit=100, offset=0):
+        """One page of positions matching all given filters, ordered by name."""
+        sql = f"SELECT {_COLUMNS} FROM positions p"
+        where, args = ["p.stage = ?"], [stage]
+        if tag is not None:
+            sql += " JOIN tags t ON t.position_id = p.id"
+            where.append("t.tag = ?")
+            args.append(tag)
+        if sample is not None:
+            where.append("p.sample = ?")
+            args.append(sample)
+        if prefix:
+            # range scan instead of LIKE so the unique index can be used
+            where.append("p.name >= ? AND p.name < ?")
+            args += [prefix, prefix + "\U0010ffff"]
+        sql += " WHERE " + " AND ".join(where) + " ORDER BY p.name LIMIT ? OFFSET ?"
+        args += [limit, offset]
+        return [Position(*row) for row in self.db.execute(sql, args)]
+
+    def within(self, stage, lo, hi, sample=None, limit=100):
+        """Positions with lo <= position <= hi, in ascending order."""
+        sql = f"SELECT {_COLUMNS} FROM positions p WHERE p.stage = ?"
+        args = [stage]
+        if sample is not None:
+            sql += " AND p.sample = ?"
+            args.append(sample)
+        sql += " AND p.position BETWEEN ? AND ? ORDER BY p.position LIMIT ?"
+        return [Position(*row) for row in self.db.execute(sql, args + [lo, hi, limit])]
+
+    def nearest(self, stage, position, k=1, sample=None):
+        """The `k` saved positions closest to `position` (two index seeks)."""
+        base = f"SELECT {_COLUMNS} FROM positions p WHERE p.stage = ?"
+        args = [stage]
+        if sample is not None:
+            base += " AND p.sample = ?"
+            args.append(sample)
+        above = self.db.execute(
+            base + " AND p.position >= ? ORDER BY p.position LIMIT ?", args + [position, k]
+        ).fetchall()
+        below = self.db.execute(
+            base + " AND p.position < ? ORDER BY p.position DESC LIMIT ?", args + [position, k]
+        ).fetchall()
+        rows = sorted(above + below, key=lambda r: abs(r[4] - position))[:k]
+        return [Position(*row) for row in rows]
+
+    def tags_of(self, position_id):
+        return [r[0] for r in self.db.execute(
+            "SELECT tag FROM tags WHERE position_id = ? ORDER BY tag", (position_id,))]
+
+    def samples(self, stage):
+        return [r[0] for r in self.db.execute(
+            "SELECT DISTINCT sample FROM positions WHERE stage = ? ORDER BY sample", (stage,))]
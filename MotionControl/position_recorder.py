@@ -0,0 +1,37 @@
+"""Record KDC101 position and status into a shared timeline.
+
+    rec = TimelineRecorder("run-001")
+    record_power(rec, meter.power)                       # power channel
+    stage = PositionRecorder(lib, serial_num, units, rec).start()
+    ...
+    stage.stop(); rec.close()
+
+Rows are (t, position, homed, moving, status_bits) stamped with the
+same monotonic clock as the power channel, so Timeline.interp() can put
+the stage position next to every power sample afterwards.
+"""
+from PowerMeterControl.timeline import Sampler
+
+STATUS_MOVING = 0x30   # moving forward / reverse
+STATUS_HOMED = 0x400
+
+COLUMNS = ("position", "homed", "moving", "status_bits")
+
+
+class PositionRecorder(Sampler):
+    def __init__(self, lib, serial, units, recorder, rate=50.0, name=None):
+        """`units` is a units.UnitConverter; `rate` in samples per second."""
+        self.lib = lib
+        self.serial = serial
+        self.units = units
+        if name is None:
+            name = "stage_" + serial.value.decode()
+        super().__init__(self._read, recorder.channel(name, COLUMNS), 1.0 / rate)
+
+    def _read(self):
+        lib, serial = self.lib, self.serial
+        # the device reports its position at the CC_StartPolling rate; ask for a fresh one
+        lib.CC_RequestPosition(serial)
+        position = self.units.to_real(lib.CC_GetPosition(serial))
+        bits = lib.CC_GetStatusBits(serial) & 0xFFFFFFFF
+        return (position, bool(bits & STATUS_HOMED), bool(bits & STATUS_MOVING), bits)
@@ -0,0 +1,295 @@
+"""KDC101 stage control without any GUI.
+
+    with StageController("27007518") as stage:
+        stage.move_to(12.5)
+        print(stage.position())
+
+    stage.start_polling(0.05)          # background refresh of stage.state
+    stage.jog(+0.1); stage.jog(+0.1)   # coalesced, non-blocking
+    stage.wait()
+
+Owns the Kinesis DLL handle, serial number, unit conversion, soft limits,
+backlash approach and motion queue of one cube.  The DLL is only loaded
+on connect(), so importing this module is cheap and works on machines
+without Kinesis.  Without start_polling() nothing runs in the background
+and every call talks to the device directly; with it, `state` is a cached
+StageState refreshed by one thread that also advances queued moves, and
+views (the Tk GUI) read it without touching the bus.
+"""
+import os
+import threading
+import time
+from collections import namedtuple
+from ctypes import byref, c_char_p, c_double, c_int, cdll, create_string_buffer
+
+from MotionControl.backlash import BacklashCompensator, measure_backlash
+from MotionControl.limits import LimitEngine
+from MotionControl.motion_queue import MotionQueue
+from MotionControl.position_recorder import STATUS_HOMED, STATUS_MOVING, PositionRecorder
+from MotionControl.trajectory import TrajectoryPlanner, execute
+from MotionControl.units import UnitConverter, _value
+from PowerMeterControl.timeline import TimelineRecorder, record_power
+
+
+KINESIS_DIR = r"C:\Program Files\Thorlabs\Kinesis"
+KINESIS_DLL = "Thorlabs.MotionControl.KCube.DCServo.dll"
+KCUBE_DCSERVO_TYPE = 27  # serial number prefix / device type of the KDC101
+
+StageState = namedtuple("StageState", "t position homed moving status_bits")
+
+
+def load_kinesis(dll_dir=KINESIS_DIR, name=KINESIS_DLL):
+    if hasattr(os, "add_dll_directory") and os.path.isdir(dll_dir):
+        os.add_dll_directory(dll_dir)
+    return cdll.LoadLibrary(name)
+
+
+class StageController:
+    def __init__(self, serial="27007518", steps_per_rev=34555, gbox_ratio=1.0, pitch=1.0,
+                 pos_min=0, pos_max=25, lib=None, poll_ms=200, overshoot=0.05, direction=+1):
+        """Motor parameters may be plain numbers or c_double; `poll_ms` is the
+        device-side status interval passed to CC_StartPolling."""
+        self.serial_str = serial.value.decode() if isinstance(serial, c_char_p) else str(serial)
+        self.serial = c_char_p(self.serial_str.encode())
+        self.steps_per_rev = c_double(_value(steps_per_rev))
+        self.gbox_ratio = c_double(_value(gbox_ratio))
+        self.pitch = c_double(_value(pitch))
+        self.pos_min = pos_min
+        self.pos_max = pos_max
+        self.poll_ms = poll_ms
+        self.lib = lib
+        self.units = UnitConverter(steps_per_rev, gbox_ratio, pitch)
+        self.limits = LimitEngine(pos_min, pos_max)
+        # every queued move ends travelling in `direction`; recalibrate with calibrate_backlash().
+        # A pre-position the limits reject is skipped in favour of a direct move.
+        self.approach = BacklashCompensator(overshoot, direction, pos_min, pos_max,
+                                            check=self.limits.path_allowed)
+        self.motion = MotionQueue(
+            move_to=lambda axis, pos: self.send_move(pos),
+            is_moving=lambda axis: bool(self.status_bits() & STATUS_MOVING),
+            approach=self.approach,
+            status_lag=poll_ms / 1000
+        )
+        self.connected = False
+        self.state = None
+        self.poll_errors = 0
+        # CC_RequestPosition / CC_GetPosition pairs from the poll thread and callers
+        self._io = threading.RLock()
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self._listeners = []
+        self._sent_at = float("-inf")
+
+    @classmethod
+    def find(cls, lib=None):
+        """Serial numbers of all connected KDC101 cubes."""
+        lib = lib if lib is not None else load_kinesis()
+        lib.TLI_BuildDeviceList()
+        buf = create_string_buffer(512)
+        lib.TLI_GetDeviceListByTypeExt(buf, 512, KCUBE_DCSERVO_TYPE)
+        return [s for s in buf.value.decode().split(",") if s]
+
+    # ------CONNECTION ---------------------------------------------
+    def connect(self):
+        if self.lib is None:
+            self.lib = load_kinesis()
+        lib = self.lib
+        if lib.TLI_BuildDeviceList() != 0 or lib.CC_Open(self.serial) != 0:
+            raise ConnectionError(f"Could not open KDC101 {self.serial_str}")
+        lib.CC_StartPolling(self.serial, c_int(self.poll_ms))
+        lib.CC_SetMotorParamsExt(self.serial, self.steps_per_rev, self.gbox_ratio, self.pitch)
+        time.sleep(0.1)  # first status update from the device
+        self.units.verify(lib, self.serial, samples=(self.pos_min, 1.0, self.pos_max))
+        self.connected = True
+        self.refresh()
+
+    def close(self):
+        self.stop_polling()
+        if self.connected:
+            self.connected = False
+            self.lib.CC_StopPolling(self.serial)
+            self.lib.CC_Close(self.serial)
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------STATE ---------------------------------------------
+    def position(self):
+        with self._io:
+            self.lib.CC_RequestPosition(self.serial)
+            return self.units.to_real(self.lib.CC_GetPosition(self.serial))
+
+    def status_bits(self):
+        return self.lib.CC_GetStatusBits(self.serial) & 0xFFFFFFFF
+
+    def is_moving(self):
+        # the status bits lag a new command by up to one device poll interval
+        if time.monotonic() - self._sent_at < self.poll_ms / 1000:
+            return True
+        return bool(self.status_bits() & STATUS_MOVING)
+
+    def homed(self):
+        return bool(self.status_bits() & STATUS_HOMED)
+
+    def refresh(self):
+        """Read position and status once, update `state` and wake waiters."""
+        position = self.position()
+        bits = self.status_bits()
+        state = StageState(time.monotonic(), position, bool(bits & STATUS_HOMED),
+                           bool(bits & STATUS_MOVING), bits)
+        with self._changed:
+            self.state = state
+            self._changed.notify_all()
+        for fn in self._listeners:
+            fn(state)
+        return state
+
+    def add_listener(self, fn):
+        """Call fn(state) after every refresh (from the polling thread when it runs)."""
+        self._listeners.append(fn)
+
+    # ------POLLING ---------------------------------------------
+    def start_polling(self, interval=0.05):
+        """Refresh `state` and advance queued moves every `interval` s on a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll_loop, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def stop_polling(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    @property
+    def polling(self):
+        return self._thread is not None
+
+    def _poll_loop(self, interval):
+        next_t = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                self.motion.poll()
+            except Exception as e:
+                self.poll_errors += 1
+                print(f"Polling KDC101 {self.serial_str} failed: {e}")
+            next_t += interval
+            self._stop.wait(max(0.0, next_t - time.monotonic()))
+
+    # ------MOTION ---------------------------------------------
+    def target(self):
+        """Latest commanded position, or the cached / read position before any move."""
+        target = self.motion.target(self.serial_str)
+        if target is not None:
+            return target
+        return self.state.position if self.state is not None else self.position()
+
+    def wait(self, timeout=60.0, poll_s=0.01):
+        """Block until the stage has stopped and no queued leg is left."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.polling:
+                # the poll thread advances the queue; just wait for its next refresh
+                with self._changed:
+                    self._changed.wait(poll_s)
+            else:
+                self.motion.poll()
+            if not self.motion.busy(self.serial_str) and not self.is_moving():
+                return
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"KDC101 {self.serial_str} still moving after {timeout} s")
+            if not self.polling:
+                time.sleep(poll_s)
+
+    def home(self, wait=True):
+        self.lib.CC_Home(self.serial)
+        if wait:
+            self.wait(timeout=120.0)
+
+    def send_move(self, position):
+        """Command an absolute move without checks, queueing or waiting."""
+        self.lib.CC_SetMoveAbsolutePosition(self.serial, c_int(self.units.to_device(position)))
+        self.lib.CC_MoveAbsolute(self.serial)
+        self._sent_at = time.monotonic()
+
+    def move_to(self, position, wait=True):
+        """Checked, backlash-compensated absolute move through the motion queue."""
+        self.limits.validate_path(self.legs(position), [self.target()])
+        self.motion.move_absolute(self.serial_str, position)
+        if wait:
+            self.wait()
+
+    def legs(self, position):
+        """Waypoints the queue will send for a move to `position` (approach leg included)."""
+        return self.approach.path(self.target(), position,
+                                  at_rest=not self.motion.busy(self.serial_str))
+
+    def move_by(self, delta, wait=True):
+        self.move_to(self.target() + delta, wait)
+
+    def jog(self, delta):
+        """Non-blocking relative move; bursts of jogs are folded into one target."""
+        self.move_by(delta, wait=False)
+
+    def set_velocity(self, velocity, acceleration):
+        vel_dev = c_int()
+        acc_dev = c_int()
+        # unit types 1 / 2 of the conversion are velocity / acceleration
+        self.lib.CC_GetDeviceUnitFromRealValue(self.serial, c_double(velocity), byref(vel_dev), 1)
+        self.lib.CC_GetDeviceUnitFromRealValue(self.serial, c_double(acceleration), byref(acc_dev), 2)
+        self.lib.CC_SetVelParams(self.serial, acc_dev, vel_dev)
+
+    def scan(self, points, on_point=None, **planner_kwargs):
+        """Visit `points` in travel-minimizing order with per-segment velocity parameters.
+
+        on_point(index, position) is called once the stage has stopped at
+        each point; returns the executed ScanPlan.
+        """
+        planner = TrajectoryPlanner(self.pos_min, self.pos_max, **planner_kwargs)
+        plan = planner.plan(points, start=self.position())
+        self.limits.validate_path(plan.points, plan.start)  # raises before the first move
+        execute(
+            plan,
+            move_to=lambda axis, pos: self.send_move(pos),
+            wait=lambda axis: self.wait(),
+            set_velocity=lambda axis, v, a: self.set_velocity(v, a),
+            on_point=on_point
+        )
+        return plan
+
+    # ------CALIBRATION / RECORDING ---------------------------------------------
+    def calibrate_backlash(self, read_power, center, span=0.5, **kwargs):
+        """Measure backlash on a beam edge at `center` and set the approach overshoot.
+
+        read_power() returns one power reading, e.g. PowerMeter(...).power.
+        """
+        cal = measure_backlash(self.send_move, self.wait, read_power, center, span,
+                               check=self.limits.path_allowed, **kwargs)
+        print(f"Backlash {cal.backlash:.4f}, overshoot set to {cal.overshoot:.4f}")
+        self.approach.overshoot = cal.overshoot
+        return cal
+
+    def start_recording(self, directory, rate=50.0, read_power=None, power_interval=0.01):
+        """Record position/status (and optionally power) into a shared timeline.
+
+        Returns (recorder, samplers); pass them to stop_recording().
+        """
+        recorder = TimelineRecorder(directory)
+        samplers = [PositionRecorder(self.lib, self.serial, self.units, recorder, rate).start()]
+        if read_power is not None:
+            samplers.append(record_power(recorder, read_power, power_interval))
+        return recorder, samplers
+
+    @staticmethod
+    def stop_recording(recorder, samplers):
+        for sampler in samplers:
+            sampler.stop()
+        recorder.close()
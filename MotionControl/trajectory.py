@@ -0,0 +1,217 @@
+"""Scan trajectory planning for KDC101 stages.
+
+    planner = TrajectoryPlanner(pos_min, pos_max, max_velocity=2.0, max_acceleration=1.5)
+    plan = planner.plan(points, start=current_position)
+    plan.duration, plan.travel            # predicted scan time (s) and path length
+    execute(plan, move_to, wait, set_velocity)
+
+Points are an (n,) array for one stage or (n, d) for d stages moving
+together (one KDC101 per axis).  The visiting order is
+
+  * a single sweep for one axis (optimal: nearest end first),
+  * serpentine rows for points on a regular grid,
+  * nearest neighbour + 2-opt for sparse sets,
+
+all using the Chebyshev distance, since the axes move simultaneously.
+Every segment gets its own velocity/acceleration: the slower axes of a
+segment are slowed down so that all axes arrive together, and short
+moves use the peak velocity their trapezoid actually reaches.  Times
+follow the trapezoidal profile of the controller plus a fixed
+settle/overhead per point.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+
+# ------PROFILE MATH ---------------------------------------------
+def move_time(distance, velocity, acceleration):
+    """Duration of a trapezoidal (or triangular) move from rest to rest."""
+    d = np.abs(distance)
+    v = np.asarray(velocity, dtype=np.float64)
+    a = np.asarray(acceleration, dtype=np.float64)
+    triangular = d < v * v / a
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(triangular, 2.0 * np.sqrt(d / a), d / v + v / a)
+    return np.where(d > 0, t, 0.0)
+
+
+def peak_velocity(distance, velocity, acceleration):
+    """Highest velocity actually reached on a move of this length."""
+    return np.minimum(velocity, np.sqrt(np.abs(distance) * acceleration))
+
+
+def velocity_for_time(distance, duration, acceleration):
+    """Cruise velocity that makes a move of `distance` take exactly `duration`."""
+    d = np.abs(distance)
+    aT = acceleration * duration
+    with np.errstate(invalid="ignore"):
+        v = (aT - np.sqrt(np.maximum(aT * aT - 4.0 * acceleration * d, 0.0))) / 2.0
+    return np.where(d > 0, v, 0.0)
+
+
+# ------ORDERING ---------------------------------------------
+def _cheb(a, b):
+    return np.abs(a - b).max(axis=-1)
+
+
+def is_grid(points):
+    """True if the (n, d) points are exactly the Cartesian product of their axis values."""
+    if points.shape[1] < 2:
+        return False
+    sizes = [len(np.unique(points[:, k])) for k in range(points.shape[1])]
+    if int(np.prod(sizes)) != len(points):
+        return False
+    return len(np.unique(points, axis=0)) == len(points)
+
+
+def serpentine(points, start=None):
+    """Grid order: rows along axis 0, alternating direction, rows stepped along the other axes."""
+    rows = np.lexsort(points[:, 1:].T)
+    order = []
+    keys = points[rows][:, 1:]
+    breaks = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+    for i, row in enumerate(np.split(rows, breaks)):
+        row = row[np.argsort(points[row, 0], kind="stable")]
+        order.append(row if i % 2 == 0 else row[::-1])
+    order = np.concatenate(order)
+    if start is not None:
+        # of the four corner starts keep the shortest path
+        candidates = [order]
+        flipped = np.concatenate([r[::-1] for r in np.split(order, breaks)])
+        candidates += [flipped, order[::-1], flipped[::-1]]
+        order = min(candidates, key=lambda o: _cheb(points[o[0]], start))
+    return order
+
+
+def nearest_neighbour(points, start):
+    n = len(points)
+    left = np.ones(n, dtype=bool)
+    order = np.empty(n, dtype=np.int64)
+    here = start
+    for i in range(n):
+        d = _cheb(points, here)
+        d[~left] = np.inf
+        j = int(d.argmin())
+        order[i] = j
+        left[j] = False
+        here = points[j]
+    return order
+
+
+def two_opt(points, order, start, max_passes=20):
+    """Improve an open path (fixed start, free end) by segment reversals."""
+    path = np.vstack([start[None, :], points[order]])
+    idx = np.concatenate([[-1], order])
+    n = len(path)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 1):
+            a, b = path[i - 1], path[i]
+            j = np.arange(i + 1, n)
+            c = path[j]
+            removed = _cheb(a, b) + np.where(j + 1 < n, _cheb(c, path[np.minimum(j + 1, n - 1)]), 0.0)
+            added = _cheb(a, c) + np.where(j + 1 < n, _cheb(b, path[np.minimum(j + 1, n - 1)]), 0.0)
+            gain = removed - added
+            k = int(gain.argmax())
+            if gain[k] > 1e-12:
+                jj = j[k]
+                path[i:jj + 1] = path[i:jj + 1][::-1].copy()
+                idx[i:jj + 1] = idx[i:jj + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return idx[1:]
+
+
+def order_points(points, start=None):
+    """Visiting order (indices into `points`) minimizing total travel."""
+    points = np.asarray(points, dtype=np.float64).reshape(len(points), -1)
+    if len(points) < 2:
+        return np.arange(len(points))
+    if points.shape[1] == 1:
+        order = np.argsort(points[:, 0], kind="stable")
+        if start is not None and abs(points[order[-1], 0] - start[0]) < abs(points[order[0], 0] - start[0]):
+            order = order[::-1]
+        return order
+    if is_grid(points):
+        return serpentine(points, start)
+    if start is None:
+        start = points[0]
+    return two_opt(points, nearest_neighbour(points, start), start)
+
+
+# ------PLANNING ---------------------------------------------
+ScanPlan = namedtuple(
+    "ScanPlan",
+    "points order start distance velocity acceleration move_time duration travel"
+)
+ScanPlan.__doc__ = """Ordered scan with per-segment motion parameters.
+
+points        (n, d) targets in visiting order
+order         indices of `points` into the caller's list
+distance      (n, d) signed move per axis for each segment (from the previous point)
+velocity      (n, d) max velocity to program per axis and segment
+acceleration  (n, d) acceleration to program per axis and segment
+move_time     (n,) predicted motion time per segment
+duration      predicted total scan time including settle/overhead
+travel        total path length (sum of Chebyshev distances)
+"""
+
+
+class TrajectoryPlanner:
+    def __init__(self, pos_min, pos_max, max_velocity=2.0, max_acceleration=1.5,
+                 settle=0.05, overhead=0.02):
+        """Limits are scalars or per-axis sequences; settle/overhead are seconds per point."""
+        self.pos_min = np.asarray(pos_min, dtype=np.float64)
+        self.pos_max = np.asarray(pos_max, dtype=np.float64)
+        self.max_velocity = np.asarray(max_velocity, dtype=np.float64)
+        self.max_acceleration = np.asarray(max_acceleration, dtype=np.float64)
+        self.settle = settle
+        self.overhead = overhead
+
+    def check(self, points):
+        bad = np.any((points < self.pos_min) | (points > self.pos_max), axis=1)
+        if bad.any():
+            i = int(np.flatnonzero(bad)[0])
+            raise ValueError(f"Point {i} {points[i].tolist()} is outside "
+                             f"[{self.pos_min.tolist()}, {self.pos_max.tolist()}]")
+
+    def plan(self, points, start=None, reorder=True):
+        points = np.asarray(points, dtype=np.float64)
+        points = points.reshape(len(points), -1)
+        self.check(points)
+        start = points[0] if start is None else np.asarray(start, dtype=np.float64).reshape(-1)
+        order = order_points(points, start) if reorder else np.arange(len(points))
+        ordered = points[order]
+        distance = np.diff(np.vstack([start[None, :], ordered]), axis=0)
+        v = np.broadcast_to(self.max_velocity, distance.shape)
+        a = np.broadcast_to(self.max_acceleration, distance.shape)
+        # the slowest axis sets the segment time; the others are slowed to match
+        t = move_time(distance, v, a).max(axis=1)
+        vel = np.where(np.abs(distance) > 0,
+                       np.minimum(velocity_for_time(distance, t[:, None], a), peak_velocity(distance, v, a)),
+                       v)
+        duration = float(t.sum() + len(ordered) * (self.settle + self.overhead))
+        travel = float(np.abs(distance).max(axis=1).sum())
+        return ScanPlan(ordered, order, start, distance, vel, np.array(a), t, duration, travel)
+
+
+def execute(plan, move_to, wait, set_velocity=None, on_point=None):
+    """Run a plan: per point program velocities, move all axes, wait, then call on_point.
+
+    move_to(axis, position), wait(axis) and set_velocity(axis, velocity,
+    acceleration) are called with the axis index; on_point(i, point) runs
+    after the stage has settled and may take a measurement.
+    """
+    for i, point in enumerate(plan.points):
+        for axis, p in enumerate(point):
+            if plan.distance[i, axis] == 0:
+                continue
+            if set_velocity is not None:
+                set_velocity(axis, plan.velocity[i, axis], plan.acceleration[i, axis])
+            move_to(axis, p)
+        for axis in range(len(point)):
+            wait(axis)
+        if on_point is not None:
+            on_point(int(plan.order[i]), point)
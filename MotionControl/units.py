@@ -0,0 +1,57 @@
+"""Device-unit <-> real-unit conversion for KDC101 stages without DLL calls.
+
+Kinesis maps positions linearly: device units = real * steps_per_rev *
+gbox_ratio / pitch, rounded to whole encoder counts.  The factor is
+derived once from the motor parameters, checked against
+CC_GetDeviceUnitFromRealValue / CC_GetRealValueFromDeviceUnit at connect
+(verify()), and then used for scalars and whole NumPy trajectories.
+"""
+from ctypes import byref, c_double, c_int
+
+import numpy as np
+
+
+def _value(x):
+    return getattr(x, "value", x)
+
+
+class UnitConverter:
+    def __init__(self, steps_per_rev, gbox_ratio=1.0, pitch=1.0):
+        """Accepts plain numbers or the c_double motor parameters used with CC_SetMotorParamsExt."""
+        self.scale = _value(steps_per_rev) * _value(gbox_ratio) / _value(pitch)  # counts per real unit
+
+    def to_device(self, real):
+        """Real units -> device counts (int, or int64 array for array input)."""
+        if isinstance(real, (int, float)):
+            return int(round(real * self.scale))
+        return np.rint(np.multiply(real, self.scale)).astype(np.int64)
+
+    def to_real(self, device):
+        """Device counts -> real units (float, or float64 array for array input)."""
+        if isinstance(device, (int, float)):
+            return device / self.scale
+        return np.divide(device, self.scale, dtype=np.float64)
+
+    def verify(self, lib, serial, samples=(0.0, 1.0, 12.5, 25.0), tolerance=1):
+        """Compare with the DLL conversion; adopt the DLL's factor if they disagree.
+
+        Returns the largest difference in device counts seen before any
+        correction.
+        """
+        dev = c_int()
+        real = c_double()
+        worst = 0
+        for x in samples:
+            lib.CC_GetDeviceUnitFromRealValue(serial, c_double(x), byref(dev), 0)
+            worst = max(worst, abs(dev.value - self.to_device(x)))
+        if worst > tolerance:
+            # the device wins: rebuild the factor from its own conversion of a large count
+            big = self.to_device(max(samples)) or 1000000
+            lib.CC_GetRealValueFromDeviceUnit(serial, c_int(big), byref(real), 0)
+            if real.value == 0:
+                raise ValueError(f"The DLL converts {big} counts to 0; are the motor "
+                                 "parameters set and the device connected?")
+            print(f"Unit conversion differs from the DLL by {worst} counts; "
+                  f"using {big / real.value:.6f} counts per unit")
+            self.scale = big / real.value
+        return worst
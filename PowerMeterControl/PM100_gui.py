@@ -5,8 +5,13 @@ from ctypes import (
     byref, create_string_buffer, c_bool, c_char_p, c_int
 )
 from PowerMeterControl.TLPMX import TLPMX, TLPM_DEFAULT_CHANNEL
+from PowerMeterControl.autoscale import AutoScaler
+from PowerMeterControl.display import SampleHistory, DisplayTransform
+from PowerMeterControl.buffers import MeterReader
+from PowerMeterControl.supervisor import SessionSupervisor
 import time
 import statistics
+import numpy as np
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 
@@ -31,20 +36,24 @@ class PowerMeterGUI(tk.Tk):
     def __init__(self):
         super().__init__()
         self.tlPM = TLPMX()
+        self.reader = MeterReader(self.tlPM)  # pooled out-parameters for the hot loop
+        self.supervisor = None  # reopens the session if the meter drops off
         self.title("Power Meter Control")
         self.option_add("*Font", "Arial 12")
         self.status = 0  # 0: disconnected, 1: connected
-        self.time_window = 1000.0  # default time window in seconds
         self.plot_time_window = 10.0  # default plot window in seconds
         self.wavelength = 532.0  # default wavelength in nm
         self.auto_power_flag = 0  # flag for auto power range
-        self.unit = 1E-6  # default unit in uW
+        self.display = DisplayTransform("uW")  # default unit in uW
         self.plot_power_min_inW = 18e-6  # default min power in Watts
         self.plot_power_max_inW = 20e-6  # default max power in
-        self.plot_power_min = self.plot_power_min_inW / self.unit  # default min power for plot
-        self.plot_power_max = self.plot_power_max_inW / self.unit  # default max power for plot
-        self.times = []
-        self.powers = []
+        self.plot_power_min = self.display.to_display(self.plot_power_min_inW)  # default min power for plot
+        self.plot_power_max = self.display.to_display(self.plot_power_max_inW)  # default max power for plot
+        # raw watts are stored once; unit scaling happens at render time
+        self.history = SampleHistory()
+        self._plot_buf = np.empty(self.history.capacity)
+        # tracks power in W, proposes limits in display units
+        self.autoscaler = AutoScaler(self.plot_time_window, transform=self.display.to_display)
         
         self.start_time = None
         self.measure_interval_ms = 100
@@ -86,6 +95,7 @@ class PowerMeterGUI(tk.Tk):
         self.lbl_unit = tk.Label(self.power_frame, text="uW", font=("Arial", 16), anchor='w', width=3)
         self.btn_unit_uw = SolidButton(self.power_frame, text="uw", command=lambda: self._change_unit("uW"))
         self.btn_unit_mw = SolidButton(self.power_frame, text="mw", command=lambda: self._change_unit("mW"))
+        self.btn_unit_dbm = SolidButton(self.power_frame, text="dBm", command=lambda: self._change_unit("dBm"))
 
         # ---- Draw the graph area ──────────────────────────────
         self.canvas_graph = tk.Canvas(self.power_frame, bg='white', width=800, height=400)
@@ -94,7 +104,8 @@ class PowerMeterGUI(tk.Tk):
         self.ax.set_xlim(0, self.plot_time_window)
         self.ax.set_ylim(self.plot_power_min, self.plot_power_max)
         self.ax.grid(True)
-        self.ax.plot()
+        self.line, = self.ax.plot([], [], label="Power", color='blue')
+        self.ax.legend()
 
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.canvas_graph)
         self.canvas.draw()
@@ -157,9 +168,10 @@ class PowerMeterGUI(tk.Tk):
         self.lbl_unit.grid(row=0, column=4, padx=10, pady=10)
         self.btn_unit_uw.grid(row=0, column=5, padx=5)
         self.btn_unit_mw.grid(row=0, column=6, padx=5)
+        self.btn_unit_dbm.grid(row=0, column=7, padx=5)
 
         # ---- Draw the graph area ──────────────────────────────
-        self.canvas_graph.grid(row=1, column=0, columnspan=7, padx=10, pady=10)
+        self.canvas_graph.grid(row=1, column=0, columnspan=8, padx=10, pady=10)
         self.canvas.get_tk_widget().pack(side="top", fill="both", expand=1)
 
         self.lbl_time_range.grid(row=2, column=0, padx=10, pady=5)
@@ -183,18 +195,13 @@ class PowerMeterGUI(tk.Tk):
 
     # ------CONNECTION ---------------------------------------------
     def _on_scan(self):
-        deviceCount = c_uint32()
-        self.tlPM.findRsrc(byref(deviceCount))
-        print("Number of found devices: " + str(deviceCount.value))
-        resourceName = create_string_buffer(1024)
-        self.resnamelist = []  # to store resource names
-        for i in range(0, deviceCount.value):
-            self.tlPM.getRsrcName(c_int(i), resourceName)
-            print("Resource name of device", i, ":", c_char_p(resourceName.raw).value)
-            self.resnamelist.append(c_char_p(resourceName.raw).value.decode('utf-8'))
+        self.resnamelist = self.reader.resource_names()  # to store resource names
+        print("Number of found devices: " + str(len(self.resnamelist)))
+        for i, name in enumerate(self.resnamelist):
+            print("Resource name of device", i, ":", name)
         # the values of the combobox is the name between last :: and second last ::
         self.device_combo['values'] = [name.split("::")[-2] for name in self.resnamelist]
-        if deviceCount.value > 0:
+        if self.resnamelist:
             self.device_combo.current(0)
 
     def _on_connect(self):
@@ -231,97 +238,111 @@ class PowerMeterGUI(tk.Tk):
             print("No device selected")
             return
         print("Selected device:", self.resnamelist[device_number_from_combo])
-        resourceName = create_string_buffer(1024)
+        resourceName = self.reader.pool.string(1024)
         self.tlPM.getRsrcName(c_int(device_number_from_combo), resourceName)
         self.tlPM.open(resourceName, c_bool(True), c_bool(True))
-        self.times.clear()
-        self.powers.clear()
+        self.history.clear()
+        self.autoscaler.reset()
         time.sleep(2)  # allow time for connection
-        self.tlPM.setPowerAutoRange(c_int16(1), TLPM_DEFAULT_CHANNEL)
-        self.tlPM.setPowerUnit(c_int16(0), TLPM_DEFAULT_CHANNEL)
+        self.supervisor = SessionSupervisor(
+            self.tlPM, resourceName.value,
+            on_lost=self._on_session_lost, on_restored=self._on_session_restored
+        )
+        # settings go through the supervisor so they are replayed after a reconnect
+        self.supervisor.apply("setPowerAutoRange", c_int16(1), TLPM_DEFAULT_CHANNEL)
+        self.supervisor.apply("setPowerUnit", c_int16(0), TLPM_DEFAULT_CHANNEL)
         self.start_time = time.time()
     
     def _disconnect_device(self):
+        self.supervisor = None
         if hasattr(self, "tlPM"):
             self.tlPM.close()
 
+    def _on_session_lost(self, t):
+        # a NaN sample breaks the plotted line so the outage shows up as a gap
+        if self.start_time is not None:
+            self.history.append(time.time() - self.start_time, np.nan)
+        self.lbl_power_val.config(text="----")
+        self.conn_frame.config(text="Reconnecting ●", fg="orange")
+
+    def _on_session_restored(self, t_lost, t_restored):
+        self.conn_frame.config(text="Connection ●", fg="green")
+
     # ------UNIT CHANGE ---------------------------------------------
     def _change_unit(self, unit):
-        if self.status == 1:
-            if unit == "uW":
-                self.unit = 1E-6  # microWatt
-                self.lbl_power_range.config(text=f"Power Range (uW): ")
-            elif unit == "mW":
-                self.unit = 1E-3  # milliWatt
-                self.lbl_power_range.config(text=f"Power Range (mW): ")
-            # Update the power range labels
-            self.plot_power_min = self.plot_power_min_inW / self.unit  # default min power for plot
-            self.plot_power_max = self.plot_power_max_inW / self.unit  # default max power for plot
-            # change the holdplace values for power range entries
-            self.ent_power_range_min.delete(0, tk.END)
-            self.ent_power_range_min.insert(0, f"{self.plot_power_min:0.2f}")
-            self.ent_power_range_max.delete(0, tk.END)
-            self.ent_power_range_max.insert(0, f"{self.plot_power_max:0.2f}")
-            print(f"Power unit set to {unit}")
-            self.lbl_unit.config(text=unit)
-        else:
-            print("Device not connected - change unit failed")
+        # display-only: the meter keeps reporting watts, nothing is sent to it
+        self.display.set_unit(unit)
+        # dBm axes may go below 0; old limits are in the previous unit
+        self.autoscaler.floor = None if self.display.is_log else 0.0
+        self.autoscaler.limits = None
+        self.lbl_power_range.config(text=f"Power Range ({unit}): ")
+        # Update the power range labels
+        self.plot_power_min = self.display.to_display(self.plot_power_min_inW)
+        self.plot_power_max = self.display.to_display(self.plot_power_max_inW)
+        # change the holdplace values for power range entries
+        self.ent_power_range_min.delete(0, tk.END)
+        self.ent_power_range_min.insert(0, f"{self.plot_power_min:0.2f}")
+        self.ent_power_range_max.delete(0, tk.END)
+        self.ent_power_range_max.insert(0, f"{self.plot_power_max:0.2f}")
+        print(f"Power unit set to {unit}")
+        self.lbl_unit.config(text=unit)
+        if len(self.history):
+            self.lbl_power_val.config(text=f"{self.display.to_display(self.history.watts[-1]):0.4f}")
+        self._update_fig()
 
     
     # ------MEASUREMENT ---------------------------------------------
     def _measure(self):
         if self.status == 1:
             try:
-                power = c_double()
-                self.tlPM.measPower(byref(power), TLPM_DEFAULT_CHANNEL)
-                val = power.value / self.unit
+                power = self.supervisor.read(self.reader.power)
+                if power is None:
+                    # session down or read failed; the supervisor retries with backoff
+                    self._after_id = self.after(self.measure_interval_ms, self._measure)
+                    return
+                val = self.display.to_display(power)
                 self.lbl_power_val.config(text=f"{val:0.4f}")
                 elapsed = time.time() - self.start_time
-                # print(f"Measured Power: {power.value} W")
-                self.times.append(elapsed)
-                self.powers.append(power.value)
-                T = self.time_window
-                while self.times and self.times[0] < elapsed - T:
-                    self.times.pop(0)
-                    self.powers.pop(0)
+                # print(f"Measured Power: {power} W")
+                self.history.append(elapsed, power)
+                self.autoscaler.push(elapsed, power)
                 self._update_fig()
-                if len(self.times) % 5 == 0:  # update every 5 measurements
-                    self.measure_interval_ms_real = (self.times[-1] - self.times[-21]) / 20 * 1000
+                n = len(self.history)
+                if n % 5 == 0 and n > 20:  # update every 5 measurements
+                    times = self.history.times
+                    self.measure_interval_ms_real = (times[-1] - times[-21]) / 20 * 1000
                     self.lbl_fresh_rate_value.config(text=str(self.measure_interval_ms_real))
                 # after 20 measurements, auto set the power range
-                if len(self.times) == 21:
-                    self._on_autoset_power()
-                if self.auto_power_flag == 1 and len(self.times) % 40 == 0:
+                if n == 21:
+                    self._on_autoset_power(force=True)
+                elif self.auto_power_flag == 1:
+                    # O(1) per sample; only rescales when the data escapes
+                    # the hysteresis band
                     self._on_autoset_power()
 
             except Exception as e:
-                pass
+                print(f"Error in measurement: {e}")
         else:
             print("Device not connected - measurement failed")
             return None
         self._after_id = self.after(self.measure_interval_ms, self._measure)
         
     def _update_fig(self):
-        self.ax.clear()
-        self.ax.grid(True)
-
-        if not self.times:
+        if not len(self.history):
             return
 
         # Use the last `plot_time_window` seconds of data
-        current_time = self.times[-1]
+        current_time = self.history.times[-1]
         t_min = max(0, current_time - self.plot_time_window - 1)  # 1 second buffer
 
-        # Filter points within the time window
-        self.times_filtered = [t for t in self.times if t >= t_min]
-        self.powers_filtered = self.powers[-len(self.times_filtered):]
-        self.powers_unit = [p / self.unit for p in self.powers_filtered]
+        # views into the history, converted into a reused buffer
+        times, watts = self.history.window(t_min)
+        powers = self.display.apply(watts, out=self._plot_buf[:len(watts)])
 
         self.ax.set_xlim(0, self.plot_time_window)
         self.ax.set_ylim(self.plot_power_min, self.plot_power_max)
-        self.ax.plot([t - t_min for t in self.times_filtered], self.powers_unit, label="Power", color='blue')
-        self.ax.legend()
-        self.canvas.draw()
+        self.line.set_data(times - t_min, powers)
+        self.canvas.draw_idle()
     
     def _set_time_range(self):
         try:
@@ -333,6 +354,7 @@ class PowerMeterGUI(tk.Tk):
             return
         
         self.plot_time_window = T
+        self.autoscaler.window = T
         self._update_fig()
         print(f"Time window set to {T} seconds")
 
@@ -345,8 +367,8 @@ class PowerMeterGUI(tk.Tk):
         except ValueError:
             print("Invalid power range input")
             return
-        self.plot_power_min_inW = p_min * self.unit
-        self.plot_power_max_inW = p_max * self.unit
+        self.plot_power_min_inW = self.display.to_watts(p_min)
+        self.plot_power_max_inW = self.display.to_watts(p_max)
         self.plot_power_min = p_min
         self.plot_power_max = p_max
         self.ax.set_ylim(self.plot_power_min, self.plot_power_max)
@@ -357,7 +379,7 @@ class PowerMeterGUI(tk.Tk):
         self.auto_power_flag = 1
         self.btn_autoset.config(bg='lightgreen')
         self.btn_power_range.config(bg='grey')
-        self._on_autoset_power()
+        self._on_autoset_power(force=True)
 
     def on_set_power_range_click(self, event=None):
         self.auto_power_flag = 0
@@ -365,15 +387,13 @@ class PowerMeterGUI(tk.Tk):
         self.btn_autoset.config(bg='grey')
         self._set_power_range()
 
-    def _on_autoset_power(self):
+    def _on_autoset_power(self, force=False):
         if self.status == 1:
             try:
-                # set the auto-range by previous self.powers and self.times in plot_time_window
-                if self.powers:
-                    delta_power = max(self.powers_unit) - min(self.powers_unit)
-                    p_min = min(self.powers_unit) - delta_power
-                    p_max = max(self.powers_unit) + delta_power
-                    p_min = max(0, p_min)  # ensure min is not negative
+                # limits come from the sliding min/max of the last plot_time_window seconds
+                limits = self.autoscaler.update(force=force)
+                if limits is not None:
+                    p_min, p_max = limits
                     self.ent_power_range_min.delete(0, tk.END)
                     self.ent_power_range_min.insert(0, f"{p_min:0.2f}")
                     self.ent_power_range_max.delete(0, tk.END)
@@ -407,7 +427,10 @@ class PowerMeterGUI(tk.Tk):
             return
         
         self.wavelength = wavelength
-        self.tlPM.setWavelength(c_double(wavelength), TLPM_DEFAULT_CHANNEL)
+        if self.supervisor is not None:
+            self.supervisor.apply("setWavelength", c_double(wavelength), TLPM_DEFAULT_CHANNEL)
+        else:
+            self.tlPM.setWavelength(c_double(wavelength), TLPM_DEFAULT_CHANNEL)
         self.lbl_wavelength_value.config(text=f"{wavelength:0.2f}")
         print(f"Wavelength set to {wavelength} nm")
         
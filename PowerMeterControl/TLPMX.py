@@ -1,7 +1,12 @@
 import os
 from ctypes import cdll,c_long,c_uint32,c_uint16,c_uint8,byref,create_string_buffer,c_bool, c_char, c_char_p,c_int,c_int16,c_int8,c_double,c_float,sizeof,c_voidp, Structure
 
-_VI_ERROR = (-2147483647-1)
+from PowerMeterControl.errors import check_status
+from PowerMeterControl.visa_status import (
+	_VI_ERROR, VI_INSTR_WARNING_OFFSET, VI_INSTR_ERROR_OFFSET, VI_INSTR_ERROR_NOT_SUPP_INTF,
+	VI_INSTR_WARN_OVERFLOW, VI_INSTR_WARN_UNDERRUN, VI_INSTR_WARN_NAN
+)
+
 VI_ON = 1
 VI_OFF = 0
 TLPM_VID_THORLABS = (0x1313)  # Thorlabs
@@ -54,12 +59,6 @@ PMNET_FIND_PATTERN = "TCPIP?*:INSTR{VI_ATTR_TCPIP_DEVICE_NAME==\"PM5020\" || VI_
 PMBTH_FIND_PATTERN = "BTHLE?*"
 TLPM_BUFFER_SIZE = 256  # General buffer size
 TLPM_ERR_DESCR_BUFFER_SIZE = 512  # Buffer size for error messages
-VI_INSTR_WARNING_OFFSET = (0x3FFC0900 )
-VI_INSTR_ERROR_OFFSET = (_VI_ERROR + 0x3FFC0900 )
-VI_INSTR_ERROR_NOT_SUPP_INTF = (VI_INSTR_ERROR_OFFSET + 0x01 )
-VI_INSTR_WARN_OVERFLOW = (VI_INSTR_WARNING_OFFSET + 0x01 )
-VI_INSTR_WARN_UNDERRUN = (VI_INSTR_WARNING_OFFSET + 0x02 )
-VI_INSTR_WARN_NAN = (VI_INSTR_WARNING_OFFSET + 0x03 )
 TLPM_ATTR_SET_VAL = (0)
 TLPM_ATTR_MIN_VAL = (1)
 TLPM_ATTR_MAX_VAL = (2)
@@ -317,14 +316,14 @@ class TLPMX:
 
 
 	def __testForError(self, status):
-		if status < 0:
-			self.__throwError(status)
+		# negative codes raise; positive completion codes are passed on on purpose so
+		# check_status can warn for VI_INSTR_WARN_* (other completion codes are ignored)
+		if status:
+			check_status(self.dll, self.devSession, status)
 		return status
 
 	def __throwError(self, code):
-		msg = create_string_buffer(1024)
-		self.dll.TLPMX_errorMessage(self.devSession, c_int(code), msg)
-		raise NameError(c_char_p(msg.raw).value)
+		check_status(self.dll, self.devSession, code)
 
 	def open(self, resourceName, IDQuery, resetDevice):
 		"""
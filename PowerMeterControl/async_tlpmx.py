@@ -0,0 +1,174 @@
+"""asyncio front end for TLPMX sessions.
+
+    async with AsyncTLPMX(TLPMX()) as pm:
+        await pm.open(resource)
+        await pm.set_wavelength(1064)
+        p = await pm.power()
+        async for t, watts in pm.stream(interval=0.01):
+            ...
+
+Every call for one device runs on that device's own CommandSerializer
+thread, in submission order; calls to different devices run concurrently
+(asyncio.gather over several AsyncTLPMX).  The default executor is never
+used, so a slow meter cannot starve unrelated run_in_executor work.
+"""
+import asyncio
+import time
+from ctypes import c_bool, c_double, c_int16, c_uint32, create_string_buffer
+
+import numpy as np
+
+from PowerMeterControl.TLPMX import (
+    TLPM_DEFAULT_CHANNEL, TLPM_AUTORANGE_POWER_OFF, TLPM_AUTORANGE_POWER_ON, TLPM_POWER_UNIT_WATT
+)
+from PowerMeterControl.buffers import MeterReader
+from PowerMeterControl.serializer import CommandSerializer, PRIORITY_CONTROL
+
+
+FAST_ARRAY_LENGTH = 200  # samples returned per getNextFastArrayMeasurement
+
+
+class AsyncTLPMX:
+    """Awaitable wrapper around one TLPMX session.
+
+    The typed coroutines below return floats / NumPy arrays.  Any other
+    TLPMX method is available as a coroutine of the same name taking the
+    usual ctypes arguments (e.g. `await pm.setAvgTime(c_double(0.1), ch)`).
+    """
+    def __init__(self, tlPM, channel=TLPM_DEFAULT_CHANNEL, name="tlpmx-async-io"):
+        self.tlPM = tlPM
+        self.channel = channel
+        self.serializer = CommandSerializer(name)
+        # only ever used from the I/O thread, so its pooled buffers need no lock
+        self.reader = MeterReader(tlPM, channel)
+        self._channel = self.reader.channel
+        self._wrappers = {}
+
+    def _run(self, fn, *args):
+        # one priority for everything: calls to a device complete in the order they were awaited
+        return asyncio.wrap_future(self.serializer.submit(fn, *args, priority=PRIORITY_CONTROL))
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self.tlPM, name)
+        if not callable(attr):
+            return attr
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            run = self._run
+            async def wrapper(*args):
+                return await run(attr, *args)
+            wrapper.__name__ = name
+            wrapper.__doc__ = attr.__doc__
+            self._wrappers[name] = wrapper
+        return wrapper
+
+    # ------SESSION ---------------------------------------------
+    async def open(self, resource, id_query=True, reset=False):
+        if isinstance(resource, str):
+            resource = resource.encode("utf-8")
+        def _open():
+            self.tlPM.open(create_string_buffer(resource), c_bool(id_query), c_bool(reset))
+            self.tlPM.setPowerUnit(c_int16(TLPM_POWER_UNIT_WATT), self._channel)
+        await self._run(_open)
+
+    async def close(self):
+        await self._run(self.tlPM.close)
+
+    async def aclose(self):
+        """Stop the I/O thread once every queued call has run."""
+        # the I/O thread exits on its own after the close sentinel; no executor thread needed
+        self.serializer.close(wait=False)
+        await asyncio.wrap_future(self.serializer.stopped)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    # ------MEASUREMENT ---------------------------------------------
+    async def power(self):
+        """One power reading in W."""
+        return await self._run(self.reader.power)
+
+    async def energy(self):
+        """One energy reading in J."""
+        return await self._run(self.reader.energy)
+
+    async def frequency(self):
+        return await self._run(self.reader.frequency)
+
+    async def read_many(self, n):
+        """`n` consecutive power readings, taken in a single hop to the I/O thread."""
+        return await self._run(self.reader.power_into, np.empty(n))
+
+    async def stream(self, block=None, interval=0.0, count=None):
+        """Async iterator of readings, like PowerMeter.stream().
+
+        With block=None each item is (t, watts); otherwise a (times, watts)
+        pair of arrays of length `block`.  Times are time.monotonic() seconds.
+        """
+        produced = 0
+        while count is None or produced < count:
+            if block is None:
+                yield time.monotonic(), await self.power()
+                produced += 1
+            else:
+                n = block if count is None else min(block, count - produced)
+                t0 = time.monotonic()
+                values = await self.read_many(n)
+                yield np.linspace(t0, time.monotonic(), n), values
+                produced += n
+            if interval:
+                await asyncio.sleep(interval)
+
+    # ------ARRAYS ---------------------------------------------
+    async def conf_fast_array(self):
+        """Switch the channel to power fast-array mode (PM5020 / PM400 class meters)."""
+        await self._run(self.tlPM.confPowerFastArrayMeasurement, self._channel)
+
+    def _fast_array(self):
+        pool = self.reader.pool
+        count, count_ref = pool.scalar("fast_count", c_uint32)
+        ts, ts_view = pool.array("fast_times", FAST_ARRAY_LENGTH, c_uint32)
+        vals, vals_view = pool.array("fast_values", FAST_ARRAY_LENGTH)
+        self.tlPM.getNextFastArrayMeasurement(count_ref, ts, vals, self._channel)
+        n = count.value
+        return ts_view[:n].copy(), vals_view[:n].copy()
+
+    async def fast_array(self):
+        """Next fast-array block as (raw timestamps, values) arrays."""
+        return await self._run(self._fast_array)
+
+    async def sequence(self, count_factor=1):
+        """Configured measurement sequence as (times_ms, values, values2) arrays of 100 * count_factor."""
+        def _sequence():
+            return tuple(a.copy() for a in self.reader.sequence(count_factor))
+        return await self._run(_sequence)
+
+    # ------SETTINGS ---------------------------------------------
+    async def wavelength(self):
+        """Correction wavelength in nm."""
+        return await self._run(self.reader.wavelength)
+
+    async def set_wavelength(self, nm):
+        await self._run(self.tlPM.setWavelength, c_double(nm), self._channel)
+
+    async def power_range(self):
+        return await self._run(self.reader.power_range)
+
+    async def set_power_range(self, watts):
+        """Fixed range in W, or None for auto-ranging."""
+        if watts is None:
+            await self.set_auto_range(True)
+        else:
+            await self._run(self.tlPM.setPowerRange, c_double(watts), self._channel)
+
+    async def set_auto_range(self, on):
+        mode = TLPM_AUTORANGE_POWER_ON if on else TLPM_AUTORANGE_POWER_OFF
+        await self._run(self.tlPM.setPowerAutoRange, c_int16(mode), self._channel)
+
+    async def set_avg_time(self, seconds):
+        await self._run(self.tlPM.setAvgTime, c_double(seconds), self._channel)
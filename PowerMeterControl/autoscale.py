@@ -0,0 +1,116 @@
+from collections import deque
+
+
+class SlidingMinMax:
+    """Running min/max of the samples inside a sliding time window.
+
+    Two monotonic deques keep the candidates for the minimum and maximum,
+    so push() and the min/max lookups are amortized O(1) instead of
+    scanning the whole window on every update.
+    """
+    def __init__(self, window):
+        self.window = window
+        self._min = deque()  # (t, value), values increasing
+        self._max = deque()  # (t, value), values decreasing
+
+    def push(self, t, value):
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((t, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((t, value))
+        self.expire(t - self.window)
+
+    def expire(self, t_min):
+        while self._min and self._min[0][0] < t_min:
+            self._min.popleft()
+        while self._max and self._max[0][0] < t_min:
+            self._max.popleft()
+
+    def clear(self):
+        self._min.clear()
+        self._max.clear()
+
+    def __bool__(self):
+        return bool(self._min)
+
+    @property
+    def min(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self):
+        return self._max[0][1] if self._max else None
+
+
+class AutoScaler:
+    """Y-axis limits that follow the data with hysteresis.
+
+    The proposed range is the windowed [min, max] padded by `margin` times
+    its span on each side (never below `floor`; None for no floor).  The
+    current limits are kept until the data leaves them or the data span
+    shrinks below `1 - hysteresis` of the axis span, so tiny excursions
+    don't rescale (and redraw) the axis.
+
+    Samples are tracked as pushed; `transform`, a monotonically increasing
+    function such as DisplayTransform.to_display, maps the tracked min/max
+    into axis units before padding, so logarithmic axes are padded in dB
+    rather than in watts.  Reset `limits` when the transform changes.
+    """
+    def __init__(self, window, margin=1.0, hysteresis=0.5, transform=None, floor=0.0):
+        self.tracker = SlidingMinMax(window)
+        self.margin = margin
+        self.hysteresis = hysteresis
+        self.transform = transform
+        self.floor = floor
+        self.limits = None
+
+    @property
+    def window(self):
+        return self.tracker.window
+
+    @window.setter
+    def window(self, value):
+        self.tracker.window = value
+
+    def push(self, t, value):
+        self.tracker.push(t, value)
+
+    def reset(self):
+        self.tracker.clear()
+        self.limits = None
+
+    def _data_range(self):
+        lo, hi = self.tracker.min, self.tracker.max
+        if self.transform is not None:
+            lo, hi = self.transform(lo), self.transform(hi)
+        return lo, hi
+
+    def proposal(self):
+        if not self.tracker:
+            return None
+        lo, hi = self._data_range()
+        delta = hi - lo
+        if delta == 0:
+            delta = abs(hi) * 0.05 or 1e-12  # flat signal: keep a visible band
+        lo -= self.margin * delta
+        if self.floor is not None:
+            lo = max(self.floor, lo)
+        return lo, hi + self.margin * delta
+
+    def update(self, force=False):
+        """Return new (min, max) limits if the axis should rescale, else None."""
+        new = self.proposal()
+        if new is None:
+            return None
+        if not force and self.limits is not None:
+            cur_lo, cur_hi = self.limits
+            lo, hi = self._data_range()
+            inside = cur_lo <= lo and hi <= cur_hi
+            cur_span = cur_hi - cur_lo
+            tight = (new[1] - new[0]) >= (1.0 - self.hysteresis) * cur_span
+            if inside and tight:
+                return None
+        self.limits = new
+        return new
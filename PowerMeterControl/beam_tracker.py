@@ -0,0 +1,172 @@
+import threading
+import time
+from ctypes import c_double, c_uint16, byref
+
+import numpy as np
+
+from PowerMeterControl.TLPMX import TLPM_DEFAULT_CHANNEL
+
+
+# columns of the sample ring
+T, X, Y, V1, V2, V3, V4 = range(7)
+
+
+class _Ring:
+    """Rows of float samples; the newest `n` rows are always one contiguous view."""
+    def __init__(self, capacity, width):
+        self.capacity = capacity
+        self._data = np.zeros((2 * capacity, width))
+        self._head = 0
+        self.count = 0
+
+    def append(self, row):
+        i = self._head
+        self._data[i] = self._data[i + self.capacity] = row
+        self._head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def last(self, n=None):
+        n = self.count if n is None else min(n, self.count)
+        end = self._head + self.capacity if self.count == self.capacity else self._head
+        return self._data[end - n:end]
+
+    def clear(self):
+        self._head = 0
+        self.count = 0
+
+
+class BeamTracker:
+    """Polls a quadrant (4Q) sensor in a worker thread.
+
+    Every sample stores time, X/Y position (µm, meas4QPositions) and,
+    with `voltages=True`, the four quadrant voltages (meas4QVoltages).
+    centroid(), drift(), jitter_spectrum() and heatmap() work on a
+    snapshot of the sliding window and can be called from the GUI at
+    display rate independent of the acquisition rate.
+    """
+    def __init__(self, tlPM, channel=TLPM_DEFAULT_CHANNEL, window=4096, voltages=False):
+        self.tlPM = tlPM
+        self.channel = c_uint16(channel)
+        self.voltages = voltages
+        self._ring = _Ring(window, 7)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._x, self._y = c_double(), c_double()
+        self._v = [c_double() for _ in range(4)]
+        self.errors = 0
+        self.total_samples = 0
+
+    # ------ACQUISITION ---------------------------------------------
+    def poll_once(self):
+        self.tlPM.meas4QPositions(byref(self._x), byref(self._y), self.channel)
+        row = [time.monotonic(), self._x.value, self._y.value, 0.0, 0.0, 0.0, 0.0]
+        if self.voltages:
+            v = self._v
+            self.tlPM.meas4QVoltages(byref(v[0]), byref(v[1]), byref(v[2]), byref(v[3]), self.channel)
+            row[V1:] = [c.value for c in v]
+        with self._lock:
+            self._ring.append(row)
+            self.total_samples += 1
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.errors += 1
+                print(f"4Q read failed: {e}")
+                self._stop.wait(0.1)
+            if interval:
+                self._stop.wait(interval)
+
+    def start(self, interval=0.0):
+        """Start polling; interval=0 polls as fast as the meter answers."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def clear(self):
+        with self._lock:
+            self._ring.clear()
+
+    def snapshot(self, n=None):
+        """Copy of the newest `n` rows (all of the window if None)."""
+        with self._lock:
+            return self._ring.last(n).copy()
+
+    # ------ANALYSIS ---------------------------------------------
+    def sample_rate(self, data=None):
+        data = self.snapshot() if data is None else data
+        if len(data) < 2:
+            return 0.0
+        span = data[-1, T] - data[0, T]
+        return (len(data) - 1) / span if span > 0 else 0.0
+
+    def centroid(self, data=None):
+        """Mean (x, y) and RMS pointing jitter (std x, std y) over the window."""
+        data = self.snapshot() if data is None else data
+        if not len(data):
+            return None
+        xy = data[:, X:Y + 1]
+        return xy.mean(axis=0), xy.std(axis=0)
+
+    def drift(self, data=None):
+        """Linear drift rate (dx/dt, dy/dt) in µm/s fitted over the window."""
+        data = self.snapshot() if data is None else data
+        if len(data) < 2:
+            return 0.0, 0.0
+        t = data[:, T] - data[0, T]
+        t_c = t - t.mean()
+        denom = (t_c * t_c).sum()
+        if denom == 0:
+            return 0.0, 0.0
+        xy = data[:, X:Y + 1]
+        slope = t_c @ (xy - xy.mean(axis=0)) / denom
+        return slope[0], slope[1]
+
+    def jitter_spectrum(self, n=1024, data=None):
+        """Amplitude spectrum of the X/Y jitter over the newest `n` samples.
+
+        The mean and linear drift are removed and a Hann window applied
+        before the FFT.  Returns (freqs, amp_x, amp_y); samples are
+        assumed evenly spaced at the measured mean rate.
+        """
+        data = self.snapshot(n) if data is None else data[-n:]
+        if len(data) < 8:
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+        rate = self.sample_rate(data)
+        xy = data[:, X:Y + 1]
+        t = data[:, T] - data[0, T]
+        coeffs = np.polyfit(t, xy, 1)
+        detrended = xy - (np.outer(t, coeffs[0]) + coeffs[1])
+        win = np.hanning(len(data))[:, None]
+        spec = np.abs(np.fft.rfft(detrended * win, axis=0)) * (2.0 / win.sum())
+        freqs = np.fft.rfftfreq(len(data), d=1.0 / rate if rate else 1.0)
+        return freqs, spec[:, 0], spec[:, 1]
+
+    def decimated(self, max_points=2000, data=None):
+        """At most `max_points` (x, y) pairs, evenly strided over the window."""
+        data = self.snapshot() if data is None else data
+        step = max(1, -(-len(data) // max_points))
+        return data[::-1][::step][::-1][:, X:Y + 1]
+
+    def heatmap(self, bins=64, extent=None, data=None):
+        """2D histogram of beam positions; cost depends on bins, not on display."""
+        data = self.snapshot() if data is None else data
+        if not len(data):
+            return None
+        if extent is None:
+            (cx, cy), (sx, sy) = self.centroid(data)
+            r = 4 * max(sx, sy, 1e-3)
+            extent = ((cx - r, cx + r), (cy - r, cy + r))
+        hist, xedges, yedges = np.histogram2d(data[:, X], data[:, Y], bins=bins, range=extent)
+        return hist, xedges, yedges
@@ -0,0 +1,106 @@
+import tkinter as tk
+from ctypes import c_bool, c_int, c_uint32, byref, create_string_buffer
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from PowerMeterControl.TLPMX import TLPMX
+from PowerMeterControl.beam_tracker import BeamTracker
+
+
+class BeamTrackerGUI(tk.Toplevel):
+    """Pointing-stability monitor for a 4Q sensor.
+
+    Acquisition runs in the BeamTracker thread; the view redraws every
+    `refresh_ms` from a snapshot, showing a decimated XY scatter over a
+    position heatmap and the X/Y jitter spectrum.
+    """
+    def __init__(self, master, tracker, refresh_ms=100, max_points=2000):
+        super().__init__(master)
+        self.title("Beam Position")
+        self.tracker = tracker
+        self.refresh_ms = refresh_ms
+        self.max_points = max_points
+
+        self.fig = Figure(figsize=(9, 4), dpi=100)
+        self.ax_xy = self.fig.add_subplot(121)
+        self.ax_fft = self.fig.add_subplot(122)
+        self.ax_xy.set_xlabel("x (µm)")
+        self.ax_xy.set_ylabel("y (µm)")
+        self.ax_fft.set_xlabel("Frequency (Hz)")
+        self.ax_fft.set_ylabel("Jitter (µm)")
+        self.ax_fft.grid(True)
+        self.img = None
+        self.scatter, = self.ax_xy.plot([], [], '.', ms=2, color='white', alpha=0.6)
+        self.line_fx, = self.ax_fft.plot([], [], label="x", color='blue')
+        self.line_fy, = self.ax_fft.plot([], [], label="y", color='red')
+        self.ax_fft.legend()
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().pack(side="top", fill="both", expand=1)
+        self.lbl_stats = tk.Label(self, text="", anchor='w', font=("Arial", 12))
+        self.lbl_stats.pack(fill='x', padx=10, pady=5)
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._after_id = self.after(self.refresh_ms, self._refresh)
+
+    def _refresh(self):
+        data = self.tracker.snapshot()
+        if len(data) > 8:
+            heat = self.tracker.heatmap(data=data)
+            if heat is not None:
+                hist, xe, ye = heat
+                extent = (xe[0], xe[-1], ye[0], ye[-1])
+                if self.img is None:
+                    self.img = self.ax_xy.imshow(hist.T, origin='lower', extent=extent,
+                                                 aspect='auto', cmap='viridis')
+                else:
+                    self.img.set_data(hist.T)
+                    self.img.set_extent(extent)
+                    self.img.set_clim(0, hist.max() or 1)
+                self.ax_xy.set_xlim(xe[0], xe[-1])
+                self.ax_xy.set_ylim(ye[0], ye[-1])
+            xy = self.tracker.decimated(self.max_points, data=data)
+            self.scatter.set_data(xy[:, 0], xy[:, 1])
+
+            freqs, fx, fy = self.tracker.jitter_spectrum(data=data)
+            if len(freqs):
+                self.line_fx.set_data(freqs, fx)
+                self.line_fy.set_data(freqs, fy)
+                self.ax_fft.set_xlim(0, freqs[-1] or 1)
+                self.ax_fft.set_ylim(0, max(fx.max(), fy.max()) * 1.1 or 1)
+
+            (cx, cy), (sx, sy) = self.tracker.centroid(data)
+            dx, dy = self.tracker.drift(data)
+            rate = self.tracker.sample_rate(data)
+            self.lbl_stats.config(
+                text=f"centroid ({cx:0.2f}, {cy:0.2f}) µm   jitter ({sx:0.3f}, {sy:0.3f}) µm   "
+                     f"drift ({dx:0.3f}, {dy:0.3f}) µm/s   {rate:0.0f} S/s"
+            )
+            self.canvas.draw_idle()
+        self._after_id = self.after(self.refresh_ms, self._refresh)
+
+    def _on_close(self):
+        self.after_cancel(self._after_id)
+        self.tracker.stop()
+        self.destroy()
+
+
+if __name__ == "__main__":
+    tlPM = TLPMX()
+    deviceCount = c_uint32()
+    tlPM.findRsrc(byref(deviceCount))
+    if deviceCount.value == 0:
+        raise SystemExit("No power meter found")
+    resourceName = create_string_buffer(1024)
+    tlPM.getRsrcName(c_int(0), resourceName)
+    tlPM.open(resourceName, c_bool(True), c_bool(True))
+
+    root = tk.Tk()
+    root.withdraw()
+    tracker = BeamTracker(tlPM, voltages=False)
+    tracker.start()
+    view = BeamTrackerGUI(root, tracker)
+    view.bind("<Destroy>", lambda e: root.quit() if e.widget is view else None)
+    root.mainloop()
+    tlPM.close()
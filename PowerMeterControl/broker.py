@@ -0,0 +1,267 @@
+"""Local measurement broker: one process owns the meters, many processes read them.
+
+    python -m PowerMeterControl.broker                 # all connected meters
+    python -m PowerMeterControl.broker --simulate 2    # two simulated meters
+
+Samples are published into one SharedRing per meter; subscribers map the
+ring directly, so an extra subscriber costs the broker nothing.  Settings
+and status go through a small line-delimited JSON protocol on a Unix
+socket (localhost TCP where AF_UNIX is not available).
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+
+from PowerMeterControl.power_meter import PowerMeter
+from PowerMeterControl.serializer import SerializedTLPMX
+from PowerMeterControl.shm_ring import SharedRing
+
+
+if hasattr(socket, "AF_UNIX"):
+    DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), "thorlabs-pm-broker.sock")
+else:
+    DEFAULT_ADDRESS = ("127.0.0.1", 50515)
+
+SETTINGS = ("wavelength", "power_range", "auto_range")
+
+
+class _MeterFeed:
+    """Acquisition thread for one meter, writing into its shared ring."""
+    def __init__(self, meter, capacity, interval):
+        self.meter = meter
+        self.ring = SharedRing.create(capacity)
+        self.interval = interval
+        self.errors = 0
+        self.running = threading.Event()
+        self.running.set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        power, write = self.meter.power, self.ring.write
+        while not self._stop.is_set():
+            if not self.running.wait(0.2):
+                continue
+            try:
+                p = power()
+                write(time.monotonic(), p)
+            except Exception as e:
+                self.errors += 1
+                print(f"Broker read failed on {self.meter.resource}: {e}")
+                self._stop.wait(0.5)
+            if self.interval:
+                self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self.ring.close()
+
+    def describe(self, index):
+        return {
+            "index": index,
+            "resource": self.meter.resource,
+            "ring": self.ring.name,
+            "capacity": self.ring.capacity,
+            "seq": self.ring.seq,
+            "running": self.running.is_set(),
+            "errors": self.errors,
+        }
+
+
+class MeterBroker:
+    """Owns the TLPMX sessions and serves samples/settings to local clients."""
+    def __init__(self, meters, address=DEFAULT_ADDRESS, capacity=65536, interval=0.0):
+        self.address = address
+        self.feeds = [_MeterFeed(m, capacity, interval) for m in meters]
+        self._server = None
+
+    @classmethod
+    def open(cls, tlPMs, resources, **kwargs):
+        """Open one PowerMeter per (tlPM, resource); calls are serialized per session."""
+        meters = [PowerMeter(r, tlPM=SerializedTLPMX(t)) for t, r in zip(tlPMs, resources)]
+        return cls(meters, **kwargs)
+
+    # ------PROTOCOL ---------------------------------------------
+    def handle(self, request):
+        cmd = request.get("cmd")
+        if cmd == "list":
+            return [f.describe(i) for i, f in enumerate(self.feeds)]
+        feed = self.feeds[int(request.get("meter", 0))]
+        if cmd == "get":
+            name = request["name"]
+            if name not in SETTINGS:
+                raise ValueError(f"Unknown setting: {name}")
+            return getattr(feed.meter, name)
+        if cmd == "set":
+            name = request["name"]
+            if name not in SETTINGS:
+                raise ValueError(f"Unknown setting: {name}")
+            setattr(feed.meter, name, request["value"])
+            return getattr(feed.meter, name)
+        if cmd == "pause":
+            feed.running.clear()
+            return True
+        if cmd == "resume":
+            feed.running.set()
+            return True
+        if cmd == "stats":
+            # queue metrics exist only on SerializedTLPMX sessions
+            metrics = getattr(feed.meter.tlPM, "metrics", None)
+            return {"feed": feed.describe(self.feeds.index(feed)),
+                    "io": metrics() if metrics is not None else None}
+        raise ValueError(f"Unknown command: {cmd}")
+
+    def _make_handler(self):
+        broker = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        reply = {"ok": True, "result": broker.handle(json.loads(line))}
+                    except Exception as e:
+                        reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                    self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        return Handler
+
+    # ------LIFECYCLE ---------------------------------------------
+    def start(self):
+        for feed in self.feeds:
+            feed.start()
+        handler = self._make_handler()
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            self._server = socketserver.ThreadingUnixStreamServer(self.address, handler)
+        else:
+            self._server = socketserver.ThreadingTCPServer(self.address, handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
+        for feed in self.feeds:
+            feed.stop()
+            feed.meter.close()
+            close_serializer = getattr(feed.meter.tlPM, "close_serializer", None)
+            if close_serializer is not None:
+                close_serializer()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class Subscription:
+    """Reader side of one meter's ring; poll() returns only the new samples."""
+    def __init__(self, ring_name):
+        self.ring = SharedRing.attach(ring_name)
+        self.last_seq = self.ring.seq
+        self.lost = 0
+
+    def poll(self):
+        samples, self.last_seq, lost = self.ring.read_since(self.last_seq)
+        self.lost += lost
+        return samples
+
+    def close(self):
+        self.ring.close()
+
+
+class BrokerClient:
+    """Talks to a running MeterBroker from another process."""
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=5.0):
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(address)
+        self._file = self._sock.makefile("rwb")
+
+    def request(self, cmd, **kwargs):
+        kwargs["cmd"] = cmd
+        self._file.write(json.dumps(kwargs).encode("utf-8") + b"\n")
+        self._file.flush()
+        reply = json.loads(self._file.readline())
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    def meters(self):
+        return self.request("list")
+
+    def get(self, name, meter=0):
+        return self.request("get", name=name, meter=meter)
+
+    def set(self, name, value, meter=0):
+        return self.request("set", name=name, value=value, meter=meter)
+
+    def subscribe(self, meter=0):
+        return Subscription(self.meters()[meter]["ring"])
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Share power meters between processes.")
+    parser.add_argument("--simulate", type=int, default=0, metavar="N",
+                        help="serve N simulated meters instead of real hardware")
+    parser.add_argument("--capacity", type=int, default=65536, help="samples per ring")
+    parser.add_argument("--interval", type=float, default=0.0, help="seconds between samples")
+    parser.add_argument("--address", default=None, help="Unix socket path to listen on")
+    args = parser.parse_args(argv)
+
+    if args.simulate:
+        from PowerMeterControl.simulated import SimulatedTLPMX, SIM_RESOURCE
+        tlPMs = [SimulatedTLPMX() for _ in range(args.simulate)]
+        resources = [SIM_RESOURCE] * args.simulate
+    else:
+        from PowerMeterControl.TLPMX import TLPMX
+        resources = PowerMeter.find()
+        tlPMs = [TLPMX() for _ in resources]
+    if not resources:
+        raise SystemExit("No power meter found")
+
+    address = args.address or DEFAULT_ADDRESS
+    broker = MeterBroker.open(tlPMs, resources, address=address,
+                              capacity=args.capacity, interval=args.interval)
+    broker.start()
+    for info in broker.handle({"cmd": "list"}):
+        print(f"meter {info['index']}: {info['resource']} -> ring {info['ring']}")
+    print(f"Broker listening on {broker.address}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+from ctypes import (
+    c_double, c_float, c_int16, c_uint16, c_uint32, byref, create_string_buffer
+)
+
+import numpy as np
+
+from PowerMeterControl.TLPMX import TLPM_DEFAULT_CHANNEL, TLPM_ATTR_SET_VAL
+
+
+def check_count_factor(count_factor):
+    """getMeasurementSequence returns 100 * count_factor samples; 1..100 are valid."""
+    if not 1 <= count_factor <= 100:
+        raise ValueError(f"count_factor must be 1..100, got {count_factor}")
+    return int(count_factor)
+
+
+class BufferPool:
+    """Reusable ctypes out-parameters and arrays for one TLPMX session.
+
+    Scalars are created once per name together with their byref()
+    argument, string buffers once per size and arrays once per name and
+    length (with a cached NumPy view), so a hot measurement loop does not
+    allocate ctypes objects per call.  A pool belongs to a single session
+    and is not thread safe.
+    """
+    def __init__(self):
+        self._scalars = {}
+        self._strings = {}
+        self._arrays = {}
+
+    def scalar(self, name, ctype=c_double):
+        """(object, byref(object)) for the named out-parameter."""
+        entry = self._scalars.get(name)
+        if entry is None or type(entry[0]) is not ctype:
+            obj = ctype()
+            entry = self._scalars[name] = (obj, byref(obj))
+        return entry
+
+    def string(self, size=1024):
+        buf = self._strings.get(size)
+        if buf is None:
+            buf = self._strings[size] = create_string_buffer(size)
+        return buf
+
+    def array(self, name, length, ctype=c_float):
+        """(ctypes array, NumPy view of it) for the named buffer of this length."""
+        key = (name, length, ctype)
+        entry = self._arrays.get(key)
+        if entry is None:
+            arr = (ctype * length)()
+            entry = self._arrays[key] = (arr, np.frombuffer(arr, dtype=np.dtype(ctype)))
+        return entry
+
+
+class MeterReader:
+    """Allocation-free readings from a TLPMX session.
+
+    Returns plain Python floats (or NumPy views for arrays) instead of
+    making the caller build c_double()/byref() for every call.
+    """
+    def __init__(self, tlPM, channel=TLPM_DEFAULT_CHANNEL):
+        self.tlPM = tlPM
+        self.pool = BufferPool()
+        self.channel = c_uint16(channel)
+        self._attr_set = c_int16(TLPM_ATTR_SET_VAL)
+        # bound methods and out-parameters resolved once
+        self._meas_power = tlPM.measPower
+        self._meas_energy = tlPM.measEnergy
+        self._meas_freq = tlPM.measFreq
+        self._power, self._power_ref = self.pool.scalar("power")
+        self._energy, self._energy_ref = self.pool.scalar("energy")
+        self._freq, self._freq_ref = self.pool.scalar("freq")
+
+    def power(self):
+        self._meas_power(self._power_ref, self.channel)
+        return self._power.value
+
+    def energy(self):
+        self._meas_energy(self._energy_ref, self.channel)
+        return self._energy.value
+
+    def frequency(self):
+        self._meas_freq(self._freq_ref, self.channel)
+        return self._freq.value
+
+    def power_into(self, out):
+        """Fill a preallocated float array with consecutive power readings."""
+        meas, ref, power, channel = self._meas_power, self._power_ref, self._power, self.channel
+        for i in range(len(out)):
+            meas(ref, channel)
+            out[i] = power.value
+        return out
+
+    def wavelength(self):
+        obj, ref = self.pool.scalar("wavelength")
+        self.tlPM.getWavelength(self._attr_set, ref, self.channel)
+        return obj.value
+
+    def power_range(self):
+        obj, ref = self.pool.scalar("power_range")
+        self.tlPM.getPowerRange(self._attr_set, ref, self.channel)
+        return obj.value
+
+    def resource_names(self):
+        """Resource names of all connected meters, using one pooled string buffer."""
+        count, count_ref = self.pool.scalar("rsrc_count", c_uint32)
+        self.tlPM.findRsrc(count_ref)
+        buf = self.pool.string(1024)
+        names = []
+        for i in range(count.value):
+            self.tlPM.getRsrcName(c_uint32(i), buf)
+            names.append(buf.value.decode("utf-8"))
+        return names
+
+    def sequence(self, count_factor=1):
+        """Fetch a configured measurement sequence as NumPy views (times_ms, values, values2).
+
+        Returns 100 * count_factor samples; the views share the pooled
+        arrays and are overwritten by the next call.
+        """
+        n = 100 * check_count_factor(count_factor)
+        ts, ts_view = self.pool.array("seq_times", n)
+        v1, v1_view = self.pool.array("seq_values", n)
+        v2, v2_view = self.pool.array("seq_values2", n)
+        forced, forced_ref = self.pool.scalar("seq_forced", c_int16)
+        self.tlPM.startMeasurementSequence(c_uint32(0), forced_ref)
+        self.tlPM.getMeasurementSequence(c_uint32(count_factor), ts, v1, v2)
+        return ts_view, v1_view, v2_view
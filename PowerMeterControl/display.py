@@ -0,0 +1,97 @@
+import numpy as np
+
+
+UNIT_SCALES = {
+    "W": 1.0,
+    "mW": 1E-3,
+    "uW": 1E-6,
+    "nW": 1E-9,
+}
+DBM_FLOOR_W = 1E-15  # anything at or below this is drawn as -120 dBm
+
+
+class SampleHistory:
+    """Fixed-capacity ring of (time, watts) samples backed by NumPy.
+
+    Every sample is written twice (at i and i + capacity) so the newest
+    `n` samples are always one contiguous slice; window() and the
+    times/watts properties return views, never copies.
+    """
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self._t = np.zeros(2 * capacity)
+        self._w = np.zeros(2 * capacity)
+        self._head = 0   # next write index in [0, capacity)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def append(self, t, watts):
+        i = self._head
+        self._t[i] = self._t[i + self.capacity] = t
+        self._w[i] = self._w[i + self.capacity] = watts
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def _slice(self):
+        end = self._head + self.capacity if self._count == self.capacity else self._head
+        return slice(end - self._count, end)
+
+    @property
+    def times(self):
+        return self._t[self._slice()]
+
+    @property
+    def watts(self):
+        return self._w[self._slice()]
+
+    def window(self, t_min):
+        """Views of the samples with time >= t_min."""
+        times, watts = self.times, self.watts
+        start = np.searchsorted(times, t_min)
+        return times[start:], watts[start:]
+
+
+class DisplayTransform:
+    """Converts raw watts into the unit shown on screen.
+
+    The meter always reports watts; linear units are a single scale and
+    dBm is a vectorized log, so switching units never touches the device
+    or the stored history.
+    """
+    def __init__(self, unit="uW"):
+        self.set_unit(unit)
+
+    def set_unit(self, unit):
+        if unit != "dBm" and unit not in UNIT_SCALES:
+            raise ValueError(f"Unknown power unit: {unit}")
+        self.unit = unit
+        self.is_log = unit == "dBm"
+        self.scale = 1.0 if self.is_log else UNIT_SCALES[unit]
+
+    def apply(self, watts, out=None):
+        """Vectorized watts -> display units; `out` may be a reusable array."""
+        watts = np.asarray(watts, dtype=float)
+        if self.is_log:
+            out = np.maximum(watts, DBM_FLOOR_W, out=out)
+            np.log10(out, out=out)
+            out *= 10.0
+            out += 30.0  # W -> mW
+            return out
+        return np.divide(watts, self.scale, out=out)
+
+    def to_display(self, watts):
+        if self.is_log:
+            return 10.0 * np.log10(max(watts, DBM_FLOOR_W)) + 30.0
+        return watts / self.scale
+
+    def to_watts(self, value):
+        if self.is_log:
+            return 10.0 ** ((value - 30.0) / 10.0)
+        return value * self.scale
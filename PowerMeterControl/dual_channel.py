@@ -0,0 +1,137 @@
+import time
+from collections import namedtuple
+from ctypes import c_double, c_float, c_int16, c_uint16, c_uint32, byref
+
+import numpy as np
+
+from PowerMeterControl.TLPMX import (
+    TLPM_MEAS_POWER, TLPM_SENSOR_CHANNEL1, TLPM_SENSOR_CHANNEL2
+)
+from PowerMeterControl.buffers import check_count_factor
+from PowerMeterControl.stats import RunningStats
+
+
+DualBlock = namedtuple("DualBlock", "times ch1 ch2 ratio diff")
+
+
+def ratio_and_diff(ch1, ch2, out_ratio=None, out_diff=None):
+    """Vectorized ch1/ch2 ratio and balanced-detection difference ch1 - ch2.
+
+    Pairs with ch2 == 0 get a NaN ratio instead of raising.
+    """
+    ch1 = np.asarray(ch1, dtype=float)
+    ch2 = np.asarray(ch2, dtype=float)
+    if out_ratio is None:
+        out_ratio = np.empty_like(ch1)
+    out_ratio.fill(np.nan)
+    np.divide(ch1, ch2, out=out_ratio, where=ch2 != 0)
+    diff = np.subtract(ch1, ch2, out=out_diff)
+    return out_ratio, diff
+
+
+class DualChannelStream:
+    """Paired two-channel acquisition for PM5020 / PM400 style meters.
+
+    Polled mode uses measDualChannelSimultaneous, so both channels come
+    from the same instrument cycle in one round trip (instead of two
+    measPower calls with skewed timestamps).  Sequence mode uses the
+    values/values2 buffers of getMeasurementSequence where the meter
+    supports array measurements.  Ratio and difference statistics are
+    accumulated online, one block at a time.
+    """
+    def __init__(self, tlPM, measurement=TLPM_MEAS_POWER, block_size=64):
+        self.tlPM = tlPM
+        self.measurement = c_uint16(measurement)
+        self.block_size = block_size
+        self._r1 = c_double()
+        self._r2 = c_double()
+        self._times = np.empty(block_size)
+        self._ch1 = np.empty(block_size)
+        self._ch2 = np.empty(block_size)
+        self._ratio = np.empty(block_size)
+        self._diff = np.empty(block_size)
+        self.ratio_stats = RunningStats()
+        self.diff_stats = RunningStats()
+        self.round_trips = 0
+        self._seq_interval_us = None
+        self._seq_len = 0  # size of the sequence buffers, allocated on first read
+
+    # ------POLLED ---------------------------------------------
+    def read_pair(self):
+        """One simultaneous reading: (t, ch1, ch2)."""
+        self.tlPM.measDualChannelSimultaneous(self.measurement, byref(self._r1), byref(self._r2))
+        self.round_trips += 1
+        return time.monotonic(), self._r1.value, self._r2.value
+
+    def read_block(self, n=None):
+        """Poll `n` pairs into the internal arrays and return a DualBlock of views.
+
+        The returned arrays are reused by the next call; copy them if
+        they need to outlive it.
+        """
+        n = self.block_size if n is None else min(n, self.block_size)
+        times, ch1, ch2 = self._times, self._ch1, self._ch2
+        for i in range(n):
+            times[i], ch1[i], ch2[i] = self.read_pair()
+        return self._finish_block(times[:n], ch1[:n], ch2[:n])
+
+    # ------SEQUENCE (values / values2) ---------------------------
+    def conf_sequence(self, interval_us):
+        """Configure an array measurement capturing both channels.
+
+        interval_us is the baseTime of confPowerMeasurementSequence: the
+        time between samples in µs on most models (see its notes for the
+        per-model meaning).
+        """
+        for channel in (TLPM_SENSOR_CHANNEL1, TLPM_SENSOR_CHANNEL2):
+            self.tlPM.confPowerMeasurementSequence(c_uint32(interval_us), c_uint16(channel))
+        self._seq_interval_us = interval_us
+
+    def read_sequence(self, count_factor=1):
+        """Run one measurement sequence and return both channels as a DualBlock.
+
+        Collects 100 * count_factor (1..100) samples per channel with two
+        round trips (start + fetch) regardless of the sample count.
+        """
+        if self._seq_interval_us is None:
+            raise RuntimeError("conf_sequence() must be called first")
+        n = 100 * check_count_factor(count_factor)
+        if self._seq_len != n:
+            self._seq_ts = (c_float * n)()
+            self._seq_v1 = (c_float * n)()
+            self._seq_v2 = (c_float * n)()
+            self._seq_len = n
+        forced = c_int16()
+        t0 = time.monotonic()
+        self.tlPM.startMeasurementSequence(c_uint32(0), byref(forced))
+        self.tlPM.getMeasurementSequence(c_uint32(count_factor), self._seq_ts, self._seq_v1, self._seq_v2)
+        self.round_trips += 2
+        # device time stamps are in ms relative to the sequence start
+        times = t0 + np.frombuffer(self._seq_ts, dtype=np.float32) * 1e-3
+        ch1 = np.frombuffer(self._seq_v1, dtype=np.float32).astype(float)
+        ch2 = np.frombuffer(self._seq_v2, dtype=np.float32).astype(float)
+        ratio, diff = ratio_and_diff(ch1, ch2)
+        return self._accumulate(DualBlock(times, ch1, ch2, ratio, diff))
+
+    # ------STREAMING ---------------------------------------------
+    def stream(self, n_blocks=None, sequence=False, count_factor=1):
+        """Yield DualBlocks until `n_blocks` have been produced (forever if None)."""
+        produced = 0
+        while n_blocks is None or produced < n_blocks:
+            yield self.read_sequence(count_factor) if sequence else self.read_block()
+            produced += 1
+
+    def reset_stats(self):
+        self.ratio_stats.reset()
+        self.diff_stats.reset()
+        self.round_trips = 0
+
+    def _finish_block(self, times, ch1, ch2):
+        n = len(times)
+        ratio, diff = ratio_and_diff(ch1, ch2, self._ratio[:n], self._diff[:n])
+        return self._accumulate(DualBlock(times, ch1, ch2, ratio, diff))
+
+    def _accumulate(self, block):
+        self.ratio_stats.update(block.ratio)
+        self.diff_stats.update(block.diff)
+        return block
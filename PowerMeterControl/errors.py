@@ -0,0 +1,136 @@
+"""Structured TLPMX errors and warnings.
+
+Every failing TLPMX call raises a subclass of TLPMXError chosen from the
+status code, so callers can retry on a timeout or skip an unsupported
+feature without parsing message text:
+
+    try:
+        tlPM.measPower(byref(p), 1)
+    except TLPMXTimeoutError:
+        ...                      # retry
+    except TLPMXNotSupportedError:
+        ...                      # skip
+
+Instrument warnings (overflow, underrun, NaN) do not raise; they are
+reported through the `warnings` module and can be escalated with
+warnings.simplefilter("error", TLPMXOverflowWarning).
+
+Message texts are looked up once per (dll, code) and kept in an LRU
+cache, so a burst of identical failures costs microseconds instead of a
+buffer allocation and a driver round trip each.
+"""
+import warnings
+from ctypes import c_char_p, c_int, create_string_buffer
+from functools import lru_cache
+
+from PowerMeterControl.visa_status import (
+    VI_ERROR_INV_OBJECT, VI_ERROR_RSRC_NFOUND, VI_ERROR_TMO, VI_ERROR_NSUP_ATTR,
+    VI_ERROR_NSUP_ATTR_STATE, VI_ERROR_IO, VI_ERROR_NSUP_OPER, VI_ERROR_CONN_LOST,
+    VI_ERROR_PARAMETER1, VI_ERROR_PARAMETER8, VI_INSTR_ERROR_FIRST, VI_INSTR_ERROR_LAST,
+    VI_INSTR_ERROR_NOT_SUPP_INTF, VI_INSTR_WARN_OVERFLOW, VI_INSTR_WARN_UNDERRUN, VI_INSTR_WARN_NAN
+)
+
+
+# ------EXCEPTIONS ---------------------------------------------
+class TLPMXError(NameError):
+    """A TLPMX call returned an error status.
+
+    Derives from NameError, which the driver used to raise, so existing
+    handlers keep working.  `code` is the signed status, `message` the
+    driver's description.
+    """
+    def __init__(self, code, message):
+        super().__init__(f"{message} (0x{code & 0xFFFFFFFF:08X})")
+        self.code = code
+        self.message = message
+
+
+class TLPMXTimeoutError(TLPMXError):
+    """The instrument did not answer in time; usually worth retrying."""
+
+
+class TLPMXConnectionError(TLPMXError):
+    """The session is gone (device unplugged, resource not found)."""
+
+
+class TLPMXNotSupportedError(TLPMXError):
+    """The meter or sensor does not support this function or attribute."""
+
+
+class TLPMXParameterError(TLPMXError, ValueError):
+    """A parameter was out of range."""
+
+
+class TLPMXInstrumentError(TLPMXError):
+    """Error reported by the instrument itself (device code + VI_INSTR_ERROR_OFFSET)."""
+
+
+class TLPMXWarning(UserWarning):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class TLPMXOverflowWarning(TLPMXWarning):
+    pass
+
+
+class TLPMXUnderrunWarning(TLPMXWarning):
+    pass
+
+
+class TLPMXNaNWarning(TLPMXWarning):
+    pass
+
+
+_ERRORS = {
+    VI_ERROR_TMO: TLPMXTimeoutError,
+    VI_ERROR_CONN_LOST: TLPMXConnectionError,
+    VI_ERROR_RSRC_NFOUND: TLPMXConnectionError,
+    VI_ERROR_INV_OBJECT: TLPMXConnectionError,
+    VI_ERROR_IO: TLPMXConnectionError,
+    VI_ERROR_NSUP_OPER: TLPMXNotSupportedError,
+    VI_ERROR_NSUP_ATTR: TLPMXNotSupportedError,
+    VI_ERROR_NSUP_ATTR_STATE: TLPMXNotSupportedError,
+    VI_INSTR_ERROR_NOT_SUPP_INTF: TLPMXNotSupportedError,
+}
+
+_WARNINGS = {
+    VI_INSTR_WARN_OVERFLOW: TLPMXOverflowWarning,
+    VI_INSTR_WARN_UNDERRUN: TLPMXUnderrunWarning,
+    VI_INSTR_WARN_NAN: TLPMXNaNWarning,
+}
+
+
+def error_class(code):
+    cls = _ERRORS.get(code)
+    if cls is not None:
+        return cls
+    if VI_ERROR_PARAMETER1 <= code <= VI_ERROR_PARAMETER8:
+        return TLPMXParameterError
+    if VI_INSTR_ERROR_FIRST <= code <= VI_INSTR_ERROR_LAST:
+        return TLPMXInstrumentError
+    return TLPMXError
+
+
+# ------STATUS CHECK ---------------------------------------------
+@lru_cache(maxsize=256)
+def error_message(dll, session, code):
+    """Driver description of `code` (cached per dll, session handle and code)."""
+    msg = create_string_buffer(1024)
+    dll.TLPMX_errorMessage(session, c_int(code), msg)
+    return c_char_p(msg.raw).value.decode("utf-8", "replace")
+
+
+def check_status(dll, session, status):
+    """Raise the matching TLPMXError for a negative status; warn for instrument warnings.
+
+    Other positive VISA completion codes are returned unchanged.  `session`
+    is the c_long session handle (its value is used as cache key).
+    """
+    if status < 0:
+        raise error_class(status)(status, error_message(dll, session.value, status))
+    cls = _WARNINGS.get(status)
+    if cls is not None:
+        warnings.warn(cls(status, error_message(dll, session.value, status)), stacklevel=4)
+    return status
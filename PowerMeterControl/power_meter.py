@@ -0,0 +1,196 @@
+import time
+from ctypes import (
+    CDLL, CFUNCTYPE, POINTER, c_bool, c_double, c_int, c_int16, c_long, c_uint16,
+    create_string_buffer
+)
+
+import numpy as np
+
+from PowerMeterControl.TLPMX import (
+    TLPMX, TLPM_DEFAULT_CHANNEL,
+    TLPM_AUTORANGE_POWER_OFF, TLPM_AUTORANGE_POWER_ON, TLPM_POWER_UNIT_WATT
+)
+from PowerMeterControl.buffers import BufferPool, MeterReader
+from PowerMeterControl.errors import check_status
+from PowerMeterControl.serializer import PRIORITY_MEASURE
+
+
+# signatures of the hot-path entry points, built once per process
+_PROTOTYPES = {
+    "TLPMX_measPower": CFUNCTYPE(c_int, c_long, POINTER(c_double), c_uint16),
+    "TLPMX_measEnergy": CFUNCTYPE(c_int, c_long, POINTER(c_double), c_uint16),
+    "TLPMX_measFreq": CFUNCTYPE(c_int, c_long, POINTER(c_double), c_uint16),
+}
+
+
+def _bind(dll, name):
+    """Typed function pointer for `name`, or the plain attribute for non-ctypes backends."""
+    proto = _PROTOTYPES.get(name)
+    if proto is not None and isinstance(dll, CDLL):
+        return proto((name, dll))
+    return getattr(dll, name)
+
+
+class PowerMeter:
+    """Pythonic facade over one TLPMX session.
+
+        with PowerMeter.first() as pm:
+            pm.wavelength = 1064
+            p = pm.power()
+            block = pm.read_many(1000)
+
+    Readings are plain floats / NumPy arrays.  The hot entry points are
+    called through cached, typed prototypes with pooled out-parameters,
+    which skips the per-call ctypes construction and wrapper overhead of
+    hand-written TLPMX code.
+    """
+    def __init__(self, resource=None, tlPM=None, channel=TLPM_DEFAULT_CHANNEL,
+                 id_query=True, reset=False):
+        self.tlPM = tlPM if tlPM is not None else TLPMX()
+        self.channel = channel
+        self._channel = c_uint16(channel)
+        self.pool = BufferPool()
+        self.reader = MeterReader(self.tlPM, channel)
+        self.resource = None
+        self._bind()
+        if resource is not None:
+            self.open(resource, id_query, reset)
+
+    @classmethod
+    def find(cls, tlPM=None):
+        """Resource names of all connected meters."""
+        tlPM = tlPM if tlPM is not None else TLPMX()
+        return MeterReader(tlPM).resource_names()
+
+    @classmethod
+    def first(cls, tlPM=None, **kwargs):
+        tlPM = tlPM if tlPM is not None else TLPMX()
+        names = cls.find(tlPM)
+        if not names:
+            raise RuntimeError("No power meter found")
+        return cls(names[0], tlPM=tlPM, **kwargs)
+
+    def _bind(self):
+        dll = self.tlPM.dll
+        self._meas_power = self._serialized(_bind(dll, "TLPMX_measPower"))
+        self._meas_energy = self._serialized(_bind(dll, "TLPMX_measEnergy"))
+        self._meas_freq = self._serialized(_bind(dll, "TLPMX_measFreq"))
+        self._power, self._power_ref = self.pool.scalar("power")
+        self._energy, self._energy_ref = self.pool.scalar("energy")
+        self._freq, self._freq_ref = self.pool.scalar("freq")
+
+    def _serialized(self, fn):
+        # a SerializedTLPMX shares its I/O thread with the direct DLL calls too
+        serializer = getattr(self.tlPM, "serializer", None)
+        if serializer is None:
+            return fn
+        call = serializer.call
+        return lambda *args: call(fn, *args, priority=PRIORITY_MEASURE)
+
+    def _check(self, status):
+        return check_status(self.tlPM.dll, self.tlPM.devSession, status)
+
+    # ------SESSION ---------------------------------------------
+    def open(self, resource, id_query=True, reset=False):
+        if isinstance(resource, str):
+            resource = resource.encode("utf-8")
+        buf = create_string_buffer(resource)
+        self.tlPM.open(buf, c_bool(id_query), c_bool(reset))
+        self.resource = resource.decode("utf-8")
+        # the meter always reports watts; unit conversion is done on our side
+        self.tlPM.setPowerUnit(c_int16(TLPM_POWER_UNIT_WATT), self._channel)
+
+    def close(self):
+        self.tlPM.close()
+        self.resource = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------READINGS ---------------------------------------------
+    def power(self):
+        """One power reading in W."""
+        self._check(self._meas_power(self.tlPM.devSession, self._power_ref, self._channel))
+        return self._power.value
+
+    def energy(self):
+        """One energy reading in J."""
+        self._check(self._meas_energy(self.tlPM.devSession, self._energy_ref, self._channel))
+        return self._energy.value
+
+    def frequency(self):
+        self._check(self._meas_freq(self.tlPM.devSession, self._freq_ref, self._channel))
+        return self._freq.value
+
+    def read_many(self, n, out=None):
+        """`n` consecutive power readings as a float64 array (filled in place if `out` is given)."""
+        if out is None:
+            out = np.empty(n)
+        meas, session, ref, power, channel = (
+            self._meas_power, self.tlPM.devSession, self._power_ref, self._power, self._channel
+        )
+        check = self._check
+        for i in range(n):
+            status = meas(session, ref, channel)
+            if status:
+                check(status)
+            out[i] = power.value
+        return out
+
+    def stream(self, block=None, interval=0.0, count=None):
+        """Yield readings until `count` are produced (forever if None).
+
+        With block=None each item is (t, watts); otherwise each item is a
+        (times, watts) pair of arrays of length `block`.  Times are
+        time.monotonic() seconds.
+        """
+        produced = 0
+        while count is None or produced < count:
+            if block is None:
+                yield time.monotonic(), self.power()
+                produced += 1
+            else:
+                n = block if count is None else min(block, count - produced)
+                t0 = time.monotonic()
+                values = self.read_many(n)
+                times = np.linspace(t0, time.monotonic(), n)
+                yield times, values
+                produced += n
+            if interval:
+                time.sleep(interval)
+
+    # ------SETTINGS ---------------------------------------------
+    @property
+    def wavelength(self):
+        """Correction wavelength in nm."""
+        return self.reader.wavelength()
+
+    @wavelength.setter
+    def wavelength(self, nm):
+        self.tlPM.setWavelength(c_double(nm), self._channel)
+
+    @property
+    def power_range(self):
+        """Current power range in W; assign None to enable auto-ranging."""
+        return self.reader.power_range()
+
+    @power_range.setter
+    def power_range(self, watts):
+        if watts is None:
+            self.auto_range = True
+        else:
+            self.tlPM.setPowerRange(c_double(watts), self._channel)
+
+    @property
+    def auto_range(self):
+        obj, ref = self.pool.scalar("autorange", c_int16)
+        self.tlPM.getPowerAutorange(ref, self._channel)
+        return bool(obj.value)
+
+    @auto_range.setter
+    def auto_range(self, on):
+        mode = TLPM_AUTORANGE_POWER_ON if on else TLPM_AUTORANGE_POWER_OFF
+        self.tlPM.setPowerAutoRange(c_int16(mode), self._channel)
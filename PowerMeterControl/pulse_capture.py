@@ -0,0 +1,177 @@
+import threading
+import time
+from ctypes import c_double, c_int16, c_uint16, byref
+
+import numpy as np
+
+from PowerMeterControl.TLPMX import TLPM_DEFAULT_CHANNEL
+from PowerMeterControl.stats import RunningStats
+
+
+PULSE_DTYPE = np.dtype([("t", "f8"), ("energy", "f8")])
+
+
+class PulseCapture:
+    """Per-pulse energy capture built on the meter's peak detector.
+
+    Each cycle arms the detector (startPeakDetector), waits until
+    isPeakDetectorRunning reports it has fired, then reads the pulse with
+    measEnergy.  Pulses are timestamped and kept in a compact structured
+    array.  The repetition rate reported by measFreq gives the number of
+    pulses that should have arrived, so capture_ratio() tells what fraction
+    we actually caught.  More pulses than expected means overcounting
+    (double triggers or a stale rep rate); the ratio is then capped at 1
+    and report() flags it.
+    """
+    def __init__(self, tlPM, channel=TLPM_DEFAULT_CHANNEL, threshold=None,
+                 capacity=4096, freq_every=50, poll_interval=0.0):
+        self.tlPM = tlPM
+        self.channel = c_uint16(channel)
+        self.threshold = threshold  # percent of the current range
+        self.freq_every = freq_every
+        self.poll_interval = poll_interval
+        self._records = np.zeros(capacity, dtype=PULSE_DTYPE)
+        self.count = 0
+        self.energy_stats = RunningStats()
+        self.p2p_stats = RunningStats()  # pulse-to-pulse energy change
+        self.expected = 0.0
+        self.rep_rate_device = None
+        self._t_freq = None
+        self._counted_from = 0  # pulses before the first measFreq are not in `expected`
+        self._running = c_int16()
+        self._energy = c_double()
+        self._freq = c_double()
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def configure(self):
+        if self.threshold is not None:
+            self.tlPM.setPeakThreshold(c_double(self.threshold), self.channel)
+
+    # ------CAPTURE ---------------------------------------------
+    def _update_expected(self, now):
+        self.tlPM.measFreq(byref(self._freq), self.channel)
+        if self._t_freq is None:
+            self._counted_from = self.count
+        elif self.rep_rate_device:
+            # integrate the pulses that should have arrived since the last check
+            self.expected += self.rep_rate_device * (now - self._t_freq)
+        self.rep_rate_device = self._freq.value
+        self._t_freq = now
+
+    def capture_one(self, timeout=1.0):
+        """Arm the peak detector and record the next pulse; False on timeout."""
+        self.tlPM.startPeakDetector(self.channel)
+        deadline = time.monotonic() + timeout
+        while True:
+            self.tlPM.isPeakDetectorRunning(byref(self._running), self.channel)
+            if not self._running.value:
+                break
+            if time.monotonic() > deadline:
+                return False
+            if self.poll_interval:
+                time.sleep(self.poll_interval)
+        self.tlPM.measEnergy(byref(self._energy), self.channel)
+        now = time.monotonic()
+        self._append(now, self._energy.value)
+        if self._t_freq is None or self.count % self.freq_every == 0:
+            self._update_expected(now)
+        return True
+
+    def _append(self, t, energy):
+        with self._lock:
+            if self.count == len(self._records):
+                self._records = np.resize(self._records, 2 * len(self._records))
+            if self.count:
+                self.p2p_stats.push(energy - self._records[self.count - 1]["energy"])
+            self._records[self.count] = (t, energy)
+            self.count += 1
+            self.energy_stats.push(energy)
+
+    def run(self, n_pulses=None, duration=None, timeout=1.0):
+        """Capture until n_pulses are recorded, duration elapses or stop() is called."""
+        self.configure()
+        t_end = None if duration is None else time.monotonic() + duration
+        start_count = self.count
+        while not self._stop.is_set():
+            if n_pulses is not None and self.count - start_count >= n_pulses:
+                break
+            if t_end is not None and time.monotonic() >= t_end:
+                break
+            self.capture_one(timeout)
+        if self._t_freq is not None and self.rep_rate_device:
+            self._update_expected(time.monotonic())
+
+    def start(self, **kwargs):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, kwargs=kwargs, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.energy_stats.reset()
+            self.p2p_stats.reset()
+            self.expected = 0.0
+            self.rep_rate_device = None
+            self._t_freq = None
+            self._counted_from = 0
+
+    # ------ANALYSIS ---------------------------------------------
+    @property
+    def records(self):
+        """View of the captured pulses (fields 't' and 'energy')."""
+        return self._records[:self.count]
+
+    def rep_rate(self):
+        """Repetition rate of the captured pulses in Hz."""
+        r = self.records
+        if len(r) < 2:
+            return 0.0
+        span = r["t"][-1] - r["t"][0]
+        return (len(r) - 1) / span if span > 0 else 0.0
+
+    def histogram(self, bins=50):
+        with self._lock:
+            energies = self.records["energy"].copy()
+        return np.histogram(energies, bins=bins)
+
+    def stability(self):
+        """(RMS energy stability, pulse-to-pulse stability), both relative to the mean."""
+        mean = self.energy_stats.mean
+        if not mean:
+            return 0.0, 0.0
+        return self.energy_stats.std / mean, self.p2p_stats.std / mean
+
+    def _counted_ratio(self):
+        """Captured / expected pulses since the first measFreq check, None before it."""
+        if self.expected <= 0:
+            return None
+        return (self.count - self._counted_from) / self.expected
+
+    def capture_ratio(self):
+        """Fraction of the expected pulses that were captured, in [0, 1]."""
+        ratio = self._counted_ratio()
+        return None if ratio is None else min(max(ratio, 0.0), 1.0)
+
+    def report(self):
+        rms, p2p = self.stability()
+        ratio = self._counted_ratio()
+        return {
+            "captured": self.count,
+            "expected": round(self.expected),
+            "capture_ratio": self.capture_ratio(),
+            "overcounted": ratio is not None and ratio > 1.0,
+            "rep_rate_captured": self.rep_rate(),
+            "rep_rate_device": self.rep_rate_device,
+            "energy_mean": self.energy_stats.mean,
+            "energy_rms": rms,
+            "pulse_to_pulse": p2p,
+        }
@@ -0,0 +1,215 @@
+import re
+from ctypes import c_char, c_uint32, byref, create_string_buffer, string_at
+
+import numpy as np
+
+
+# split on ';' outside of double-quoted strings
+_SPLIT = re.compile(r';(?=(?:[^"]*"[^"]*")*[^"]*$)')
+
+
+def to_bool(text):
+    return text.strip().upper() in ("1", "ON", "TRUE")
+
+
+def to_str(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return text[1:-1]
+    return text
+
+
+def join_queries(queries):
+    """Join SCPI queries into one program message.
+
+    Each query is rooted with ':' so the header path of the previous
+    query does not leak into the next one (common '*' commands are left
+    as they are).
+    """
+    return ";".join(_rooted(q) for q in queries)
+
+
+def _rooted(query):
+    query = query.strip()
+    return query if query.startswith(("*", ":")) else ":" + query
+
+
+def split_response(text):
+    return [part.strip() for part in _SPLIT.split(text.strip())]
+
+
+def transaction(tlPM, fn):
+    """Run fn(tlPM) as one unit: on the I/O thread of a SerializedTLPMX, directly otherwise."""
+    run = getattr(tlPM, "transaction", None)
+    return run(fn) if run is not None else fn(tlPM)
+
+
+class ScpiBatch:
+    """Pipelined raw SCPI queries over TLPMX.writeRaw / readRaw.
+
+    Queries are collected with add() and sent by run() as one ';'-joined
+    program message; the combined reply is read into a reusable buffer
+    with a single readRaw and parsed into typed values, so N status
+    queries cost one round trip instead of N.
+
+        batch = ScpiBatch(tlPM)
+        batch.add("SENS:CORR:WAV?")
+        batch.add("SENS:POW:RANG:AUTO?", to_bool)
+        wavelength, autorange = batch.run()
+    """
+    def __init__(self, tlPM, buffer_size=4096, max_queries=32, timeout_ms=None):
+        self.tlPM = tlPM
+        self.max_queries = max_queries
+        self._buffer = create_string_buffer(buffer_size)
+        self._count = c_uint32()
+        self.queries = []
+        self.parsers = []
+        self.round_trips = 0
+        if timeout_ms is not None:
+            self.set_timeout(timeout_ms)
+
+    def set_timeout(self, timeout_ms):
+        """Set the VISA timeout; returns the previous value in ms."""
+        old = c_uint32()
+        self.tlPM.getTimeoutValue(byref(old))
+        self.tlPM.setTimeoutValue(c_uint32(int(timeout_ms)))
+        return old.value
+
+    def add(self, query, parser=float):
+        """Queue a query; `parser` converts its reply field (float, int, to_bool, to_str, ...)."""
+        if not query.rstrip().endswith("?"):
+            raise ValueError(f"Not a query: {query!r}")
+        self.queries.append(query)
+        self.parsers.append(parser)
+        return len(self.queries) - 1
+
+    def clear(self):
+        self.queries.clear()
+        self.parsers.clear()
+
+    def write(self, *commands):
+        """Send setting commands (no reply) as one program message."""
+        self.tlPM.writeRaw(join_queries(commands).encode("ascii"))
+        self.round_trips += 1
+
+    def read_response(self):
+        """Read one complete reply into the reusable buffer, growing it if needed."""
+        return transaction(self.tlPM, self._read_response)
+
+    def _read_response(self, tlPM):
+        chunks = []
+        while True:
+            size = len(self._buffer)
+            tlPM.readRaw(self._buffer, c_uint32(size), byref(self._count))
+            n = self._count.value
+            chunks.append(string_at(self._buffer, n))  # only the n bytes read, not the pool
+            if n < size or chunks[-1].endswith(b"\n"):
+                break
+            # reply filled the whole buffer: keep reading and use a bigger one next time
+            self._buffer = create_string_buffer(2 * size)
+        return b"".join(chunks).decode("ascii", errors="replace")
+
+    def run(self):
+        """Send the queued queries and return their parsed replies, in order."""
+        return self._execute(self.queries, self.parsers)
+
+    def query(self, *queries, parser=float):
+        """One-shot batch of queries sharing a parser; the queue is left untouched."""
+        return self._execute(queries, [parser] * len(queries))
+
+    def _execute(self, queries, parsers):
+        results = []
+        for start in range(0, len(queries), self.max_queries):
+            chunk = queries[start:start + self.max_queries]
+            message = join_queries(chunk).encode("ascii")
+
+            def exchange(tlPM):
+                tlPM.writeRaw(message)
+                return self._read_response(tlPM)
+
+            # query and reply as one unit, so a shared session can't hand the reply to another caller
+            fields = split_response(transaction(self.tlPM, exchange))
+            self.round_trips += 1
+            if len(fields) != len(chunk):
+                raise ValueError(f"Expected {len(chunk)} replies, got {len(fields)}: {fields}")
+            results.extend(parse(field) for parse, field in zip(parsers[start:], fields))
+        return results
+
+
+class BinaryBlockReader:
+    """Reads IEEE 488.2 definite-length blocks (#<n><len><payload>) via readRaw.
+
+    The reply is read in large chunks straight into a pooled bytearray
+    that only grows, and the payload is returned as a memoryview (or a
+    NumPy array over it) without copying or string parsing.  The views
+    stay valid until the next read.
+    """
+    def __init__(self, tlPM, chunk_size=65536, initial_size=65536):
+        self.tlPM = tlPM
+        self.chunk_size = chunk_size
+        self._pool = bytearray(initial_size)
+        self._count = c_uint32()
+
+    def _ensure(self, size, keep=0):
+        if len(self._pool) < size:
+            pool = bytearray(max(size, 2 * len(self._pool)))
+            pool[:keep] = self._pool[:keep]
+            self._pool = pool
+
+    def _read_into(self, tlPM, offset, size):
+        """One readRaw of up to `size` bytes written directly at pool[offset]."""
+        self._ensure(offset + size, keep=offset)
+        target = (c_char * size).from_buffer(self._pool, offset)
+        tlPM.readRaw(target, c_uint32(size), byref(self._count))
+        return self._count.value
+
+    def read_block(self):
+        """Read one block and return its payload as a memoryview."""
+        return transaction(self.tlPM, self._read_block)
+
+    def _fill_to(self, tlPM, filled, size):
+        """Read until the pool holds `size` bytes; a 0-byte read (timeout) ends the reply."""
+        while filled < size:
+            n = self._read_into(tlPM, filled, self.chunk_size)
+            if n == 0:
+                raise ValueError(f"Block header truncated after {filled} bytes")
+            filled += n
+        return filled
+
+    def _read_block(self, tlPM):
+        filled = self._fill_to(tlPM, 0, 2)
+        start = self._pool.find(b"#", 0, filled)
+        if start < 0:
+            raise ValueError("Reply is not an IEEE 488.2 binary block")
+        filled = self._fill_to(tlPM, filled, start + 2)
+        ndigits = self._pool[start + 1] - ord("0")
+        if not 1 <= ndigits <= 9:
+            raise ValueError("Indefinite-length (#0) blocks are not supported")
+        header_end = start + 2 + ndigits
+        filled = self._fill_to(tlPM, filled, header_end)
+        length = int(self._pool[start + 2:header_end])
+        end = header_end + length
+        self._ensure(end + 1, keep=filled)
+        while filled < end:
+            # read the remainder (and the trailing terminator) in one go where possible
+            n = self._read_into(tlPM, filled, max(self.chunk_size, end + 1 - filled))
+            if n == 0:
+                raise ValueError(f"Block truncated: {filled - header_end} of {length} bytes")
+            filled += n
+        return memoryview(self._pool)[header_end:end]
+
+    @staticmethod
+    def _as_array(payload, dtype):
+        dtype = np.dtype(dtype)
+        return np.frombuffer(payload, dtype=dtype, count=len(payload) // dtype.itemsize)
+
+    def read_array(self, dtype="<f4"):
+        """Read one block and view its payload as a NumPy array (no copy)."""
+        return self._as_array(self.read_block(), dtype)
+
+    def query_array(self, command, dtype="<f4"):
+        """Send `command` with writeRaw and read the binary block reply as one transaction."""
+        def exchange(tlPM):
+            tlPM.writeRaw(command.encode("ascii"))
+            return self._read_block(tlPM)
+        return self._as_array(transaction(self.tlPM, exchange), dtype)
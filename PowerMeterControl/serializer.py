@@ -0,0 +1,155 @@
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from PowerMeterControl.stats import RunningStats
+
+
+PRIORITY_MEASURE = 0       # meas*, fetches: never wait behind housekeeping
+PRIORITY_CONTROL = 1       # set*, configuration changes
+PRIORITY_HOUSEKEEPING = 2  # get*, status and info queries
+PRIORITIES = (PRIORITY_MEASURE, PRIORITY_CONTROL, PRIORITY_HOUSEKEEPING)
+
+
+def default_priority(name):
+    """Priority of a TLPMX method by naming convention."""
+    if name.startswith(("meas", "getNextFastArray", "getMeasurementSequence",
+                        "getBurstArraySamples", "blockFetch")):
+        return PRIORITY_MEASURE
+    # writeRaw / readRaw share one priority so a reply is never read before its query
+    if name.startswith(("set", "conf", "start", "reset", "write", "readRaw")):
+        return PRIORITY_CONTROL
+    return PRIORITY_HOUSEKEEPING
+
+
+class CommandSerializer:
+    """Runs every call for one TLPMX session on a dedicated I/O thread.
+
+    Producers on any thread submit calls; they are executed one at a time
+    in priority order (FIFO within a priority), so VISA traffic from a GUI
+    and from worker threads can never interleave on the same session.
+    Queue wait times are recorded per priority in `wait_stats` (seconds).
+    """
+    def __init__(self, name="tlpmx-io"):
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._closed = False
+        self.stopped = Future()  # resolved by the I/O thread when it exits
+        self.wait_stats = {p: RunningStats() for p in PRIORITIES}
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            priority, _, enqueued, fn, args, kwargs, future = self._queue.get()
+            if fn is None:
+                break
+            # nothing raised here may end the loop: every later future would hang
+            try:
+                self.wait_stats[priority].push(time.perf_counter() - enqueued)
+                if not future.set_running_or_notify_cancel():
+                    continue
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                if not future.done():
+                    future.set_exception(e)
+        self.stopped.set_result(None)
+
+    def submit(self, fn, *args, priority=PRIORITY_CONTROL, **kwargs):
+        """Queue fn(*args, **kwargs); returns a concurrent.futures.Future."""
+        if self._closed:
+            raise RuntimeError("CommandSerializer is closed")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority!r}")
+        future = Future()
+        if threading.current_thread() is self._thread:
+            # re-entrant call from a queued function: run inline to avoid deadlock
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+        self._queue.put((priority, next(self._seq), time.perf_counter(), fn, args, kwargs, future))
+        return future
+
+    def call(self, fn, *args, priority=PRIORITY_CONTROL, timeout=None, **kwargs):
+        """Submit and wait for the result (exceptions are re-raised here)."""
+        return self.submit(fn, *args, priority=priority, **kwargs).result(timeout)
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    def metrics(self):
+        """Per-priority call count and mean/max queue wait in ms."""
+        return {
+            p: {"calls": s.count, "mean_wait_ms": s.mean * 1e3,
+                "max_wait_ms": (s.max if s.count else 0.0) * 1e3}
+            for p, s in self.wait_stats.items()
+        }
+
+    def close(self, timeout=2.0, wait=True):
+        """Stop the I/O thread after every queued call; wait=False returns at once (see `stopped`)."""
+        if self._closed:
+            return
+        self._closed = True
+        # sorts after every pending call of any priority
+        self._queue.put((PRIORITY_HOUSEKEEPING + 1, next(self._seq), 0.0, None, (), {}, None))
+        if wait:
+            self._thread.join(timeout)
+
+
+class SerializedTLPMX:
+    """Thread-safe proxy for a TLPMX shared by several threads.
+
+    Every method call is routed through one CommandSerializer; measurement
+    reads get priority over configuration, which gets priority over
+    housekeeping queries.  Attributes that are not methods (dll,
+    devSession) are passed through unchanged.
+
+        tlPM = SerializedTLPMX(TLPMX())
+        threading.Thread(target=lambda: tlPM.measPower(byref(p), 1)).start()
+        tlPM.setWavelength(c_double(1064), 1)   # safe from the GUI thread
+
+    Call sequences that must not be split, such as a writeRaw query and
+    the readRaw of its reply, go through transaction().
+    """
+    def __init__(self, tlPM, serializer=None):
+        self._tlPM = tlPM
+        self.serializer = serializer if serializer is not None else CommandSerializer()
+        self._wrappers = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._tlPM, name)
+        if not callable(attr):
+            return attr
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            priority = default_priority(name)
+            call = self.serializer.call
+            def wrapper(*args, **kwargs):
+                return call(attr, *args, priority=priority, **kwargs)
+            wrapper.__name__ = name
+            wrapper.__doc__ = attr.__doc__
+            self._wrappers[name] = wrapper
+        return wrapper
+
+    @property
+    def unwrapped(self):
+        return self._tlPM
+
+    def transaction(self, fn, priority=PRIORITY_CONTROL):
+        """Run fn(tlPM) on the I/O thread as one queued unit and return its result.
+
+        `tlPM` is the unwrapped session, so no other thread's calls can
+        run between the calls fn makes.
+        """
+        return self.serializer.call(fn, self._tlPM, priority=priority)
+
+    def metrics(self):
+        return self.serializer.metrics()
+
+    def close_serializer(self):
+        self.serializer.close()
@@ -0,0 +1,148 @@
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+
+HEADER_BYTES = 64  # int64 write sequence + int64 capacity, padded to a cache line
+
+
+class SharedRing:
+    """Single-writer ring of (time, watts) samples in shared memory.
+
+    The header holds `seq`, the total number of samples ever written;
+    sample k lives in row k % capacity.  The writer fills the row first
+    and bumps `seq` afterwards, so any number of reader processes can map
+    the same block and pick up new rows without pickling, sockets or
+    extra work on the writer side per subscriber.
+    """
+    _created = set()  # blocks created by this process
+
+    def __init__(self, shm, capacity, owner, readonly=False):
+        self.shm = shm
+        self.capacity = capacity
+        self.owner = owner
+        self._header = np.ndarray((2,), dtype=np.int64, buffer=shm.buf)
+        self._data = np.ndarray((capacity, 2), dtype=np.float64, buffer=shm.buf, offset=HEADER_BYTES)
+        if readonly:
+            self._header.flags.writeable = False
+            self._data.flags.writeable = False
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @classmethod
+    def create(cls, capacity=65536, name=None):
+        size = HEADER_BYTES + capacity * 2 * 8
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        ring = cls(shm, capacity, owner=True)
+        ring._header[0] = 0
+        ring._header[1] = capacity
+        cls._created.add(shm.name)
+        return ring
+
+    @classmethod
+    def attach(cls, name, readonly=False, untrack=True):
+        """Map an existing ring.
+
+        Only the creator may unlink the block, so by default the resource
+        tracker of this process is told to forget it.  Pass untrack=False
+        from multiprocessing children: they share the parent's tracker, and
+        unregistering there would drop the creator's own registration.
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        if untrack and shm.name not in cls._created:
+            try:
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        capacity = int(np.ndarray((2,), dtype=np.int64, buffer=shm.buf)[1])
+        return cls(shm, capacity, owner=False, readonly=readonly)
+
+    # ------WRITER ---------------------------------------------
+    def write(self, t, watts):
+        seq = int(self._header[0])
+        row = self._data[seq % self.capacity]
+        row[0] = t
+        row[1] = watts
+        self._header[0] = seq + 1
+
+    def write_many(self, times, watts):
+        n = len(times)
+        if n > self.capacity:
+            times, watts = times[-self.capacity:], watts[-self.capacity:]
+            self._header[0] += n - self.capacity
+            n = self.capacity
+        seq = int(self._header[0])
+        idx = (seq + np.arange(n)) % self.capacity
+        self._data[idx, 0] = times
+        self._data[idx, 1] = watts
+        self._header[0] = seq + n
+
+    # ------READERS ---------------------------------------------
+    @property
+    def seq(self):
+        return int(self._header[0])
+
+    def read_since(self, last_seq):
+        """Samples written after `last_seq` as an (n, 2) array copy.
+
+        Returns (samples, new_seq, lost) where `lost` counts samples that
+        were overwritten before this reader got to them.
+        """
+        seq = self.seq
+        last_seq = max(last_seq, 0)  # rows before seq 0 were never written, so none are lost
+        # the oldest row is the next one the writer overwrites
+        start = max(last_seq, seq - self.capacity + 1, 0)
+        lost = max(0, start - last_seq)
+        if seq == start:
+            return np.empty((0, 2)), seq, lost
+        idx = np.arange(start, seq) % self.capacity
+        samples = self._data[idx]
+        # rows the writer lapped while we were copying are not trustworthy
+        overrun = self.seq - self.capacity - start + 1
+        if overrun > 0:
+            samples = samples[overrun:]
+            lost += overrun
+        return samples, seq, lost
+
+    def views_since(self, last_seq):
+        """Zero-copy views of the samples written after `last_seq`.
+
+        Returns (segments, start, end): up to two (times, watts) view pairs
+        (two when the range wraps around the end of the ring) covering
+        sequence numbers [start, end).  Nothing is copied, so the caller
+        must check still_valid(start) after using them: a writer that
+        laps the reader overwrites rows in place.
+        """
+        end = self.seq
+        start = max(last_seq, end - self.capacity + 1, 0)
+        if end == start:
+            return [], start, end
+        i0, i1 = start % self.capacity, end % self.capacity
+        d = self._data
+        if i0 < i1 or i1 == 0:
+            stop = i1 or self.capacity
+            segments = [(d[i0:stop, 0], d[i0:stop, 1])]
+        else:
+            segments = [(d[i0:, 0], d[i0:, 1]), (d[:i1, 0], d[:i1, 1])]
+        return segments, start, end
+
+    def latest(self, n):
+        """Copy of the newest `n` samples as an (n, 2) array, oldest first.
+
+        Fewer rows come back while fewer than `n` samples have been written.
+        """
+        samples, _, _ = self.read_since(self.seq - n)
+        return samples
+
+    def still_valid(self, start):
+        """True while the row holding sequence number `start` has not been overwritten."""
+        return self.seq - self.capacity < start
+
+    def close(self):
+        del self._header, self._data
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            self._created.discard(self.shm.name)
@@ -0,0 +1,149 @@
+"""Move analysis off the acquisition process through a SharedRing.
+
+    ring = SharedRing.create()
+    publisher = RingPublisher(meter.power, ring).start()
+    proc, stop = start_analysis_process(ring.name, my_analysis)
+
+The acquisition thread only writes rows and bumps the sequence counter.
+Analysis processes map the same block read-only and get NumPy views of
+the new rows, so FFTs and fits run on other cores without pickling,
+copying or competing for the acquisition process's GIL.
+"""
+import multiprocessing
+import threading
+import time
+
+from PowerMeterControl.shm_ring import SharedRing
+
+
+class RingPublisher:
+    """Acquisition thread: calls `read()` (returning watts) and appends to the ring."""
+    def __init__(self, read, ring, interval=0.0):
+        self.read = read
+        self.ring = ring
+        self.interval = interval
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        read, write, clock = self.read, self.ring.write, time.monotonic
+        while not self._stop.is_set():
+            try:
+                write(clock(), read())
+            except Exception as e:
+                self.errors += 1
+                print(f"Acquisition failed: {e}")
+                self._stop.wait(0.5)
+            if self.interval:
+                self._stop.wait(self.interval)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+
+class RingConsumer:
+    """Read-only, zero-copy reader of a SharedRing owned by another process.
+
+    `last_seq` is this consumer's own sequence counter; lag() is how far
+    it trails the writer and `lost` how many samples were overwritten
+    before they could be consumed.
+    """
+    def __init__(self, name, from_start=False, untrack=True):
+        self.ring = SharedRing.attach(name, readonly=True, untrack=untrack)
+        self.last_seq = max(0, self.ring.seq - self.ring.capacity) if from_start else self.ring.seq
+        self.lost = 0
+
+    def lag(self):
+        return self.ring.seq - self.last_seq
+
+    def consume(self, fn):
+        """Call fn(times, watts) on views of every new segment; returns samples consumed.
+
+        If the writer lapped us while fn was running, the affected samples
+        are counted in `lost` (fn has already seen them, possibly torn).
+        """
+        segments, start, end = self.ring.views_since(self.last_seq)
+        self.lost += start - self.last_seq
+        for times, watts in segments:
+            fn(times, watts)
+        if not self.ring.still_valid(start):
+            self.lost += min(end - start, self.ring.seq - self.ring.capacity - start + 1)
+        self.last_seq = end
+        return end - start
+
+    def latest(self, n):
+        """Copy of the newest `n` samples, for window-based analysis (FFT, fits).
+
+        Shorter than `n` until the writer has published `n` samples.
+        """
+        return self.ring.latest(n)
+
+    def close(self):
+        self.ring.close()
+
+
+def _analysis_main(ring_name, target, interval, stop, args):
+    consumer = RingConsumer(ring_name, untrack=False)
+    try:
+        while not stop.is_set():
+            target(consumer, *args)
+            stop.wait(interval)
+    finally:
+        consumer.close()
+
+
+def start_analysis_process(ring_name, target, interval=0.05, args=()):
+    """Run target(consumer, *args) every `interval` s in a separate process.
+
+    `target` must be a module-level function (it is pickled once at
+    start-up, the samples never are).  Returns (process, stop_event);
+    set the event and join the process to finish.
+    """
+    stop = multiprocessing.Event()
+    proc = multiprocessing.Process(
+        target=_analysis_main, args=(ring_name, target, interval, stop, args), daemon=True
+    )
+    proc.start()
+    return proc, stop
+
+
+def _print_spectrum_peak(consumer, n=4096):
+    import numpy as np
+    samples = consumer.latest(n)
+    consumer.last_seq = consumer.ring.seq
+    if len(samples) < n:
+        return  # not a full window yet
+    t, w = samples[:, 0], samples[:, 1]
+    if t[-1] <= t[0]:
+        return
+    rate = (len(t) - 1) / (t[-1] - t[0])
+    spec = np.abs(np.fft.rfft(w - w.mean()))
+    freqs = np.fft.rfftfreq(len(w), 1.0 / rate)
+    print(f"{rate:8.0f} S/s  mean {w.mean():.4e} W  strongest {freqs[spec.argmax()]:.2f} Hz")
+
+
+if __name__ == "__main__":
+    from PowerMeterControl.power_meter import PowerMeter
+    from PowerMeterControl.simulated import SimulatedTLPMX, SIM_RESOURCE
+
+    meter = PowerMeter(SIM_RESOURCE, tlPM=SimulatedTLPMX())
+    ring = SharedRing.create()
+    publisher = RingPublisher(meter.power, ring).start()
+    proc, stop = start_analysis_process(ring.name, _print_spectrum_peak, interval=0.5)
+    try:
+        time.sleep(3)
+    finally:
+        stop.set()
+        proc.join()
+        publisher.stop()
+        ring.close()
@@ -0,0 +1,179 @@
+import math
+import random
+import time
+from ctypes import c_long, memmove
+
+from PowerMeterControl.TLPMX import TLPMX, TLPM_POWER_UNIT_DBM
+from PowerMeterControl.errors import VI_ERROR_CONN_LOST
+
+
+SIM_RESOURCE = b"USB0::0x1313::0x80BB::SIM0001::INSTR"
+
+
+def _out(param, value):
+    """Write `value` into a byref()/ctypes out-parameter."""
+    getattr(param, "_obj", param).value = value
+
+
+class SimulatedDll:
+    """Stand-in for the TLPMX DLL so the driver runs without hardware.
+
+    Implements the TLPMX_* entry points used by this package with a
+    noisy, slowly drifting signal; every other entry point succeeds and
+    does nothing.  Call unplug() / plug() to emulate a lost device.
+    """
+    def __init__(self, power=10e-6, noise=0.01, wavelength=532.0, seed=None):
+        self.power = power
+        self.noise = noise
+        self.wavelength = wavelength
+        self.unit = 0
+        self.timeout = 2000
+        self.connected = True
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._t0 = time.monotonic()
+        self._reply = b""
+        self._peak_until = 0.0
+
+    def unplug(self):
+        self.connected = False
+
+    def plug(self):
+        self.connected = True
+
+    def __getattr__(self, name):
+        if not name.startswith("TLPMX_"):
+            raise AttributeError(name)
+        def noop(*args):
+            return self._call()
+        return noop
+
+    def _signal(self, scale=1.0):
+        t = time.monotonic() - self._t0
+        drift = 1.0 + 0.02 * math.sin(2 * math.pi * t / 30.0)
+        return scale * self.power * drift * (1.0 + self.noise * self._rng.gauss(0.0, 1.0))
+
+    def _call(self):
+        self.calls += 1
+        return 0 if self.connected else VI_ERROR_CONN_LOST
+
+    # ------SESSION ---------------------------------------------
+    def TLPMX_init(self, resourceName, IDQuery, resetDevice, session):
+        _out(session, 1)
+        return self._call()
+
+    def TLPMX_close(self, session):
+        return 0
+
+    def TLPMX_findRsrc(self, session, count):
+        _out(count, 1 if self.connected else 0)
+        return 0
+
+    def TLPMX_getRsrcName(self, session, index, name):
+        memmove(name, SIM_RESOURCE + b"\0", len(SIM_RESOURCE) + 1)
+        return 0
+
+    def TLPMX_errorMessage(self, session, code, msg):
+        text = b"Simulated error %d\0" % getattr(code, "value", code)
+        memmove(msg, text, len(text))
+        return 0
+
+    # ------MEASUREMENT ---------------------------------------------
+    def TLPMX_measPower(self, session, power, channel):
+        p = self._signal()
+        _out(power, 10 * math.log10(p / 1e-3) if self.unit == TLPM_POWER_UNIT_DBM else p)
+        return self._call()
+
+    def TLPMX_measEnergy(self, session, energy, channel):
+        _out(energy, self._signal(1e2))
+        return self._call()
+
+    def TLPMX_measFreq(self, session, frequency, channel):
+        _out(frequency, 1000.0)
+        return self._call()
+
+    def TLPMX_measDualChannelSimultaneous(self, session, measurement, r1, r2):
+        _out(r1, self._signal())
+        _out(r2, self._signal(0.5))
+        return self._call()
+
+    def TLPMX_meas4QPositions(self, session, x, y, channel):
+        _out(x, self._rng.gauss(0.0, 1.0))
+        _out(y, self._rng.gauss(0.0, 1.0))
+        return self._call()
+
+    def TLPMX_meas4QVoltages(self, session, v1, v2, v3, v4, channel):
+        for v in (v1, v2, v3, v4):
+            _out(v, 0.25 + 0.01 * self._rng.gauss(0.0, 1.0))
+        return self._call()
+
+    def TLPMX_startPeakDetector(self, session, channel):
+        self._peak_until = time.monotonic() + 1e-3
+        return self._call()
+
+    def TLPMX_isPeakDetectorRunning(self, session, running, channel):
+        _out(running, time.monotonic() < self._peak_until)
+        return self._call()
+
+    def TLPMX_getNextFastArrayMeasurement(self, session, count, timestamps, values, channel):
+        n = min(200, len(values))
+        for i in range(n):
+            timestamps[i] = i * 10
+            values[i] = self._signal()
+        _out(count, n)
+        return self._call()
+
+    # ------SETTINGS ---------------------------------------------
+    def TLPMX_setWavelength(self, session, wavelength, channel):
+        self.wavelength = getattr(wavelength, "value", wavelength)
+        return self._call()
+
+    def TLPMX_getWavelength(self, session, attribute, wavelength, channel):
+        _out(wavelength, self.wavelength)
+        return self._call()
+
+    def TLPMX_setPowerUnit(self, session, unit, channel):
+        self.unit = getattr(unit, "value", unit)
+        return self._call()
+
+    def TLPMX_getPowerUnit(self, session, unit, channel):
+        _out(unit, self.unit)
+        return self._call()
+
+    def TLPMX_getPowerRange(self, session, attribute, value, channel):
+        _out(value, 10 ** math.ceil(math.log10(self.power)))
+        return self._call()
+
+    def TLPMX_setTimeoutValue(self, session, value):
+        self.timeout = getattr(value, "value", value)
+        return self._call()
+
+    def TLPMX_getTimeoutValue(self, session, value):
+        _out(value, self.timeout)
+        return self._call()
+
+    # ------RAW SCPI ---------------------------------------------
+    def TLPMX_writeRaw(self, session, command):
+        command = getattr(command, "value", command)
+        replies = []
+        for query in command.decode("ascii").split(";"):
+            if query.endswith("?"):
+                replies.append(b'"SIM"' if query.startswith("*IDN") else b"%.6E" % self._signal())
+        self._reply = b";".join(replies) + b"\n" if replies else b""
+        return self._call()
+
+    def TLPMX_readRaw(self, session, buffer, size, count):
+        n = min(getattr(size, "value", size), len(self._reply))
+        memmove(buffer, self._reply, n)
+        self._reply = self._reply[n:]
+        _out(count, n)
+        return self._call()
+
+
+class SimulatedTLPMX(TLPMX):
+    """TLPMX driven by SimulatedDll instead of the Thorlabs DLL."""
+    def __init__(self, resourceName=None, IDQuery=False, resetDevice=False, **sim_kwargs):
+        self.dll = SimulatedDll(**sim_kwargs)
+        self.devSession = c_long(0)
+        if resourceName is not None:
+            self.open(resourceName, IDQuery, resetDevice)
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+
+
+class RunningStats:
+    """Count/mean/variance accumulated block by block.
+
+    Each block is reduced with NumPy and merged with the running totals
+    (Chan et al. parallel update), so the history never has to be kept.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, value):
+        if not math.isfinite(value):
+            return  # skipped like in update(), so one NaN can't poison the totals
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        n = values.size
+        if n == 0:
+            return
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    def reset(self):
+        self.__init__()
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def __repr__(self):
+        return f"RunningStats(count={self.count}, mean={self.mean:.6g}, std={self.std:.6g})"
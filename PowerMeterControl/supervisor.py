@@ -0,0 +1,132 @@
+"""Reconnect-and-resume for TLPMX sessions that drop off USB/TCP.
+
+    sup = SessionSupervisor(tlPM, resource)
+    sup.apply("setWavelength", c_double(1064), TLPM_DEFAULT_CHANNEL)  # sent and remembered
+    ...
+    power = sup.read(reader.power)   # None while the session is being recovered
+
+read() never blocks on a dead session: after `max_failures` consecutive
+errors (or one connection error) the session is closed and reopened from
+the cached resource name on an exponential backoff schedule, the settings
+profile is replayed, and readings resume.  Each outage is recorded in
+`gaps` as (lost, restored) times and reported through the callbacks, so a
+data stream can mark it (e.g. with a NaN sample).  Failed reads are
+counted in `read_errors` (per error code in `error_counts`) and the first
+occurrence of each code is printed.
+"""
+import time
+from ctypes import c_bool, create_string_buffer
+
+from PowerMeterControl.errors import TLPMXConnectionError
+
+
+class SessionSupervisor:
+    def __init__(self, tlPM, resource, max_failures=3, backoff_initial=0.5, backoff_max=30.0,
+                 on_lost=None, on_restored=None, clock=time.monotonic):
+        if isinstance(resource, str):
+            resource = resource.encode("utf-8")
+        self.tlPM = tlPM
+        self.resource = resource
+        self.max_failures = max_failures
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.on_lost = on_lost
+        self.on_restored = on_restored
+        self.clock = clock
+        self.profile = {}  # setter name -> args, replayed in insertion order after a reconnect
+        self.failures = 0       # consecutive failed reads
+        self.read_errors = 0    # all failed reads
+        self.error_counts = {}  # error code (or exception type) -> count
+        self.last_error = None
+        self.reconnects = 0
+        self.gaps = []
+        self.lost_at = None
+        self._backoff = backoff_initial
+        self._next_attempt = 0.0
+
+    @property
+    def connected(self):
+        return self.lost_at is None
+
+    # ------SETTINGS PROFILE ---------------------------------------------
+    def remember(self, setter, *args):
+        """Cache a setting to restore after reconnecting (latest call per setter wins)."""
+        self.profile.pop(setter, None)
+        self.profile[setter] = args
+
+    def apply(self, setter, *args):
+        """Send a setting now (if connected) and remember it."""
+        self.remember(setter, *args)
+        if self.connected:
+            return getattr(self.tlPM, setter)(*args)
+
+    def _restore(self):
+        for setter, args in self.profile.items():
+            getattr(self.tlPM, setter)(*args)
+
+    # ------READING ---------------------------------------------
+    def read(self, fn, *args):
+        """fn(*args), or None while the session is down or the call failed."""
+        if self.lost_at is not None and not self._try_reconnect():
+            return None
+        try:
+            value = fn(*args)
+        except TLPMXConnectionError as e:
+            self._count_error(e)
+            self._lost(e)
+            return None
+        except Exception as e:
+            self._count_error(e)
+            self.failures += 1
+            if self.failures >= self.max_failures:
+                self._lost(e)
+            return None
+        self.failures = 0
+        return value
+
+    def _count_error(self, error):
+        key = getattr(error, "code", type(error).__name__)
+        self.read_errors += 1
+        self.last_error = error
+        n = self.error_counts.get(key, 0)
+        self.error_counts[key] = n + 1
+        if not n:
+            print(f"Read failed ({error}); further errors of this kind are only counted")
+
+    def _lost(self, error):
+        self.lost_at = self.clock()
+        self._backoff = self.backoff_initial
+        self._next_attempt = self.lost_at + self._backoff
+        print(f"Session lost ({error}); reconnecting to {self.resource.decode('utf-8')}")
+        try:
+            self.tlPM.close()
+        except Exception:
+            pass
+        if self.on_lost:
+            self.on_lost(self.lost_at)
+
+    def _try_reconnect(self):
+        now = self.clock()
+        if now < self._next_attempt:
+            return False
+        try:
+            self.tlPM.open(create_string_buffer(self.resource), c_bool(True), c_bool(False))
+            self._restore()
+        except Exception as e:
+            try:
+                self.tlPM.close()
+            except Exception:
+                pass
+            self._backoff = min(self._backoff * 2, self.backoff_max)
+            self._next_attempt = now + self._backoff
+            print(f"Reconnect failed ({e}); next attempt in {self._backoff:.1f} s")
+            return False
+        gap = (self.lost_at, self.clock())
+        self.gaps.append(gap)
+        self.lost_at = None
+        self.failures = 0
+        self.reconnects += 1
+        print(f"Session restored after {gap[1] - gap[0]:.1f} s")
+        if self.on_restored:
+            self.on_restored(*gap)
+        return True
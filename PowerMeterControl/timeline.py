@@ -0,0 +1,246 @@
+"""Chunked on-disk timeline shared by the power and stage recorders.
+
+    rec = TimelineRecorder("run-001")
+    power = rec.channel("power", ("watts",))
+    Sampler(lambda: (meter.power(),), power, interval=0.01).start()
+    ...
+    rec.close()
+
+    tl = Timeline("run-001")
+    p = tl.read("power", t0, t1)                     # structured array: t, watts
+    x = tl.interp("stage_27007518", "position", p["t"])
+
+All channels are stamped with the same clock (time.monotonic), so
+streams recorded by different threads can be correlated afterwards.
+Each channel collects rows in a preallocated chunk; full chunks are
+written as .npy files by a background thread and listed, with their
+time span, in index.json, so reading a time range only loads the
+chunks that overlap it.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+
+CLOCK = time.monotonic
+INDEX_FILE = "index.json"
+
+
+class Channel:
+    """One named stream of rows (t, *columns) in a TimelineRecorder."""
+    def __init__(self, recorder, name, columns, chunk_rows):
+        self.recorder = recorder
+        self.name = name
+        self.columns = tuple(columns)
+        self.dtype = np.dtype([("t", "f8")] + [(c, "f8") for c in self.columns])
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self._chunk = np.empty(chunk_rows, dtype=self.dtype)
+        self._fill = 0
+        self._lock = threading.Lock()
+
+    def append(self, t, *values):
+        with self._lock:
+            row = self._chunk[self._fill]
+            row[0] = t
+            for i, v in enumerate(values, start=1):
+                row[i] = v
+            self._fill += 1
+            self.rows += 1
+            if self._fill == self.chunk_rows:
+                self._rotate()
+
+    def extend(self, times, values):
+        """Append a block: times (n,) and values (n, len(columns))."""
+        values = np.asarray(values, dtype=np.float64).reshape(len(times), -1)
+        start = 0
+        with self._lock:
+            while start < len(times):
+                n = min(len(times) - start, self.chunk_rows - self._fill)
+                dst = self._chunk[self._fill:self._fill + n]
+                dst["t"] = times[start:start + n]
+                for i, c in enumerate(self.columns):
+                    dst[c] = values[start:start + n, i]
+                self._fill += n
+                self.rows += n
+                start += n
+                if self._fill == self.chunk_rows:
+                    self._rotate()
+
+    def _rotate(self):
+        self.recorder._submit(self.name, self._chunk[:self._fill])
+        self._chunk = np.empty(self.chunk_rows, dtype=self.dtype)
+        self._fill = 0
+
+    def flush(self):
+        with self._lock:
+            if self._fill:
+                self.recorder._submit(self.name, self._chunk[:self._fill].copy())
+                self._fill = 0
+
+
+class TimelineRecorder:
+    def __init__(self, directory, chunk_rows=16384):
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        os.makedirs(directory, exist_ok=True)
+        self.channels = {}
+        self._index = {
+            "clock": "time.monotonic",
+            # wall-clock time of monotonic zero, to convert stamps to dates
+            "wall_offset": time.time() - CLOCK(),
+            "channels": {},
+        }
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="timeline-writer", daemon=True)
+        self._writer.start()
+
+    def channel(self, name, columns):
+        ch = self.channels.get(name)
+        if ch is None:
+            ch = self.channels[name] = Channel(self, name, columns, self.chunk_rows)
+            os.makedirs(os.path.join(self.directory, name), exist_ok=True)
+            self._queue.put((name, None))  # registers the channel in the index
+        elif ch.columns != tuple(columns):
+            raise ValueError(f"Channel {name} already has columns {ch.columns}")
+        return ch
+
+    def _submit(self, name, rows):
+        self._queue.put((name, rows))
+
+    def _write_loop(self):
+        while True:
+            name, rows = self._queue.get()
+            if name is None:
+                break
+            entry = self._index["channels"].setdefault(
+                name, {"columns": list(self.channels[name].columns), "chunks": []}
+            )
+            if rows is not None and len(rows):
+                fname = f"chunk_{len(entry['chunks']):06d}.npy"
+                try:
+                    np.save(os.path.join(self.directory, name, fname), rows)
+                    entry["chunks"].append({
+                        "file": fname, "rows": len(rows),
+                        "t_first": float(rows["t"][0]), "t_last": float(rows["t"][-1]),
+                    })
+                except Exception as e:
+                    print(f"Error writing {name} chunk: {e}")
+            self._write_index()
+
+    def _write_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp, path)
+
+    def close(self):
+        for ch in self.channels.values():
+            ch.flush()
+        self._queue.put((None, None))
+        self._writer.join()
+
+
+class Sampler:
+    """Thread calling `read()` every `interval` s and appending its tuple to a channel."""
+    def __init__(self, read, channel, interval=0.02):
+        self.read = read
+        self.channel = channel
+        self.interval = interval
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        append, read, next_t = self.channel.append, self.read, CLOCK()
+        while not self._stop.is_set():
+            try:
+                append(CLOCK(), *read())
+            except Exception as e:
+                self.errors += 1
+                print(f"Sampling {self.channel.name} failed: {e}")
+            # fixed-rate schedule, no drift from the time spent reading
+            next_t += self.interval
+            self._stop.wait(max(0.0, next_t - CLOCK()))
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+
+class Timeline:
+    """Read side of a recorded directory."""
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            self.index = json.load(f)
+
+    @property
+    def channels(self):
+        return list(self.index["channels"])
+
+    def read(self, name, t0=None, t1=None, pad=False):
+        """Rows of `name` with t0 <= t <= t1, loading only overlapping chunks.
+
+        With pad=True the last row at or before t0 and the first row at or
+        after t1 are included too, even when they sit in a neighbouring
+        chunk, so the result brackets the whole range for interpolation.
+        """
+        chunks = self.index["channels"][name]["chunks"]
+        if pad:
+            # rows are time-ordered, so chunks are too
+            i0 = 0 if t0 is None else max(0, bisect_right([c["t_first"] for c in chunks], t0) - 1)
+            i1 = len(chunks) if t1 is None else bisect_left([c["t_last"] for c in chunks], t1) + 1
+            selected = chunks[i0:i1]
+        else:
+            selected = [c for c in chunks
+                        if not ((t0 is not None and c["t_last"] < t0) or
+                                (t1 is not None and c["t_first"] > t1))]
+        parts = [np.load(os.path.join(self.directory, name, c["file"])) for c in selected]
+        if not parts:
+            columns = self.index["channels"][name]["columns"]
+            return np.empty(0, dtype=[("t", "f8")] + [(c, "f8") for c in columns])
+        rows = np.concatenate(parts)
+        if pad:
+            t = rows["t"]
+            lo = 0 if t0 is None else max(0, np.searchsorted(t, t0, side="right") - 1)
+            hi = len(rows) if t1 is None else np.searchsorted(t, t1, side="left") + 1
+            return rows[lo:hi]
+        mask = np.ones(len(rows), dtype=bool)
+        if t0 is not None:
+            mask &= rows["t"] >= t0
+        if t1 is not None:
+            mask &= rows["t"] <= t1
+        return rows[mask]
+
+    def interp(self, name, column, times):
+        """`column` of channel `name` linearly interpolated at `times` (NaN outside its span)."""
+        times = np.asarray(times)
+        if not len(times):
+            return np.empty(0)
+        rows = self.read(name, times.min(), times.max(), pad=True)
+        if not len(rows):
+            return np.full(len(times), np.nan)
+        return np.interp(times, rows["t"], rows[column], left=np.nan, right=np.nan)
+
+    def wall_time(self, t):
+        return t + self.index["wall_offset"]
+
+
+def record_power(recorder, read_power, interval=0.01, name="power"):
+    """Start sampling a power meter (e.g. PowerMeter.power) into `recorder`."""
+    return Sampler(lambda: (read_power(),), recorder.channel(name, ("watts",)), interval).start()
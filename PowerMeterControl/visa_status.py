@@ -0,0 +1,26 @@
+"""VISA / TLPMX status codes (ViStatus, signed 32 bit), shared by TLPMX.py and errors.py."""
+
+_VI_ERROR = (-2147483647-1)
+
+VI_ERROR_INV_OBJECT = _VI_ERROR + 0x3FFF000E
+VI_ERROR_RSRC_NFOUND = _VI_ERROR + 0x3FFF0011
+VI_ERROR_TMO = _VI_ERROR + 0x3FFF0015
+VI_ERROR_NSUP_ATTR = _VI_ERROR + 0x3FFF001D
+VI_ERROR_NSUP_ATTR_STATE = _VI_ERROR + 0x3FFF001E
+VI_ERROR_IO = _VI_ERROR + 0x3FFF003E
+VI_ERROR_NSUP_OPER = _VI_ERROR + 0x3FFF0067
+VI_ERROR_CONN_LOST = _VI_ERROR + 0x3FFF00A6
+VI_ERROR_PARAMETER1 = _VI_ERROR + 0x3FFC0001
+VI_ERROR_PARAMETER8 = _VI_ERROR + 0x3FFC0008
+
+VI_INSTR_WARNING_OFFSET = (0x3FFC0900 )
+VI_INSTR_ERROR_OFFSET = (_VI_ERROR + 0x3FFC0900 )
+VI_INSTR_ERROR_NOT_SUPP_INTF = (VI_INSTR_ERROR_OFFSET + 0x01 )
+VI_INSTR_WARN_OVERFLOW = (VI_INSTR_WARNING_OFFSET + 0x01 )
+VI_INSTR_WARN_UNDERRUN = (VI_INSTR_WARNING_OFFSET + 0x02 )
+VI_INSTR_WARN_NAN = (VI_INSTR_WARNING_OFFSET + 0x03 )
+
+# instrument errors are reported as VI_INSTR_ERROR_OFFSET + device error code
+VI_INSTR_ERROR_SPAN = 0x400
+VI_INSTR_ERROR_FIRST = VI_INSTR_ERROR_OFFSET
+VI_INSTR_ERROR_LAST = VI_INSTR_ERROR_OFFSET + VI_INSTR_ERROR_SPAN - 1
@@ -0,0 +1,225 @@
+"""Headless runner for the power meter and the KDC101 stage.
+
+    python -m ThorlabControlKit list
+    python -m ThorlabControlKit stream --count 100 --interval 0.1
+    python -m ThorlabControlKit record run-001 --duration 600
+    python -m ThorlabControlKit move 12.5
+    python -m ThorlabControlKit scan 1 2 3 4 --measure
+
+Settings come from a JSON config file (--config), overridden by command
+line options:
+
+    {"power_meter": {"resource": null, "wavelength": 1064, "simulate": false},
+     "stage": {"serial": "27007518", "steps_per_rev": 34555, "gbox_ratio": 1.0,
+               "pitch": 1.0, "pos_min": 0, "pos_max": 25,
+               "keep_out": [[12.0, 12.6]]}}
+
+Nothing here imports tkinter or matplotlib, and the instrument modules
+are only imported by the commands that use them.
+"""
+import argparse
+import json
+import sys
+import time
+
+
+DEFAULTS = {
+    "power_meter": {"resource": None, "wavelength": None, "simulate": False},
+    "stage": {"serial": "27007518", "steps_per_rev": 34555, "gbox_ratio": 1.0, "pitch": 1.0,
+              "pos_min": 0, "pos_max": 25, "keep_out": []},
+}
+
+
+def load_config(path):
+    config = {k: dict(v) for k, v in DEFAULTS.items()}
+    if path:
+        with open(path) as f:
+            for section, values in json.load(f).items():
+                config.setdefault(section, {}).update(values)
+    return config
+
+
+# ------INSTRUMENTS ---------------------------------------------
+def open_meter(cfg):
+    from PowerMeterControl.power_meter import PowerMeter
+    if cfg.get("simulate"):
+        from PowerMeterControl.simulated import SimulatedTLPMX, SIM_RESOURCE
+        meter = PowerMeter(SIM_RESOURCE, tlPM=SimulatedTLPMX())
+    elif cfg.get("resource"):
+        meter = PowerMeter(cfg["resource"])
+    else:
+        meter = PowerMeter.first()
+    if cfg.get("wavelength"):
+        meter.wavelength = cfg["wavelength"]
+    return meter
+
+
+def open_stage(cfg):
+    from MotionControl.stage_controller import StageController
+    stage = StageController(cfg["serial"], cfg["steps_per_rev"], cfg["gbox_ratio"], cfg["pitch"],
+                            cfg["pos_min"], cfg["pos_max"])
+    for i, (lo, hi) in enumerate(cfg.get("keep_out", [])):
+        stage.limits.add_zone(lo, hi, name=f"keep_out{i}")
+    stage.connect()
+    return stage
+
+
+# ------COMMANDS ---------------------------------------------
+def cmd_list(args, config):
+    from PowerMeterControl.power_meter import PowerMeter
+    try:
+        for name in PowerMeter.find():
+            print(f"power meter  {name}")
+    except OSError as e:
+        print(f"power meter  unavailable ({e})")
+    try:
+        from MotionControl.stage_controller import StageController
+        for serial in StageController.find():
+            print(f"KDC101       {serial}")
+    except OSError as e:
+        print(f"KDC101       unavailable ({e})")
+
+
+def cmd_stream(args, config):
+    meter = open_meter(config["power_meter"])
+    out = sys.stdout
+    out.write("t,watts\n")
+    try:
+        for t, watts in meter.stream(interval=args.interval, count=args.count):
+            out.write(f"{t:.6f},{watts:.6e}\n")
+            out.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        meter.close()
+
+
+def cmd_record(args, config):
+    from PowerMeterControl.timeline import TimelineRecorder, record_power
+    recorder = TimelineRecorder(args.directory)
+    samplers, devices = [], []
+    try:
+        if not args.no_power:
+            meter = open_meter(config["power_meter"])
+            devices.append(meter)
+            samplers.append(record_power(recorder, meter.power, args.power_interval))
+        if args.stage:
+            from MotionControl.position_recorder import PositionRecorder
+            stage = open_stage(config["stage"])
+            devices.append(stage)
+            samplers.append(PositionRecorder(stage.lib, stage.serial, stage.units,
+                                             recorder, args.stage_rate).start())
+        print(f"Recording to {args.directory} (Ctrl+C to stop)")
+        end = time.monotonic() + args.duration if args.duration else None
+        while end is None or time.monotonic() < end:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for s in samplers:
+            s.stop()
+        recorder.close()
+        for d in devices:
+            d.close()
+        for name, ch in recorder.channels.items():
+            print(f"{name}: {ch.rows} rows")
+
+
+def cmd_move(args, config):
+    stage = open_stage(config["stage"])
+    try:
+        if args.home:
+            stage.home()
+        if args.position is not None and args.relative:
+            stage.move_by(args.position)
+        elif args.position is not None:
+            stage.move_to(args.position)
+        print(f"{stage.position():.4f}")
+    finally:
+        stage.close()
+
+
+def cmd_scan(args, config):
+    points = list(args.points)
+    if args.file:
+        with open(args.file) as f:
+            points += [float(line.split(",")[0]) for line in f if line.strip()]
+    if not points:
+        raise SystemExit("No scan points given")
+    meter = open_meter(config["power_meter"]) if args.measure else None
+    stage = open_stage(config["stage"])
+
+    def on_point(i, point):
+        pos = float(point[0])
+        if meter is None:
+            print(f"{i},{pos:.4f}")
+        else:
+            print(f"{i},{pos:.4f},{meter.read_many(args.samples).mean():.6e}")
+        sys.stdout.flush()
+
+    try:
+        print("index,position" + (",watts" if meter else ""))
+        t0 = time.monotonic()
+        plan = stage.scan(points, on_point=on_point)
+        print(f"# predicted {plan.duration:.1f} s, took {time.monotonic() - t0:.1f} s",
+              file=sys.stderr)
+    finally:
+        stage.close()
+        if meter is not None:
+            meter.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ThorlabControlKit",
+                                     description="Headless power meter / KDC101 control.")
+    parser.add_argument("--config", help="JSON config file")
+    parser.add_argument("--simulate", action="store_true", help="use the simulated power meter")
+    parser.add_argument("--resource", help="power meter VISA resource name")
+    parser.add_argument("--wavelength", type=float, help="power meter wavelength in nm")
+    parser.add_argument("--serial", help="KDC101 serial number")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="list connected instruments")
+
+    p = sub.add_parser("stream", help="print power readings as CSV")
+    p.add_argument("--count", type=int, default=None)
+    p.add_argument("--interval", type=float, default=0.1)
+
+    p = sub.add_parser("record", help="record power (and stage) into a timeline directory")
+    p.add_argument("directory")
+    p.add_argument("--duration", type=float, default=None, help="seconds (default: until Ctrl+C)")
+    p.add_argument("--power-interval", type=float, default=0.01)
+    p.add_argument("--stage", action="store_true", help="also record the stage position")
+    p.add_argument("--stage-rate", type=float, default=50.0)
+    p.add_argument("--no-power", action="store_true")
+
+    p = sub.add_parser("move", help="move the stage and print its final position")
+    p.add_argument("position", type=float, nargs="?")
+    p.add_argument("--relative", action="store_true")
+    p.add_argument("--home", action="store_true", help="home before moving")
+
+    p = sub.add_parser("scan", help="visit positions, optionally measuring power at each")
+    p.add_argument("points", type=float, nargs="*")
+    p.add_argument("--file", help="file with one position per line")
+    p.add_argument("--measure", action="store_true")
+    p.add_argument("--samples", type=int, default=10, help="power readings averaged per point")
+
+    args = parser.parse_args(argv)
+    config = load_config(args.config)
+    pm = config["power_meter"]
+    if args.simulate:
+        pm["simulate"] = True
+    if args.resource:
+        pm["resource"] = args.resource
+    if args.wavelength:
+        pm["wavelength"] = args.wavelength
+    if args.serial:
+        config["stage"]["serial"] = args.serial
+
+    commands = {"list": cmd_list, "stream": cmd_stream, "record": cmd_record,
+                "move": cmd_move, "scan": cmd_scan}
+    commands[args.command](args, config)
+
+
+if __name__ == "__main__":
+    main()
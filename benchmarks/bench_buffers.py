@@ -0,0 +1,73 @@
+"""Per-sample allocations: hand-built ctypes out-parameters vs MeterReader.
+
+Runs against the simulated backend so it works without hardware:
+
+    python -m benchmarks.bench_buffers
+
+The "backend" row is what the simulated DLL allocates by itself; the
+other rows should be read relative to it.
+"""
+import time
+import tracemalloc
+from ctypes import c_double, byref
+
+from PowerMeterControl.TLPMX import TLPM_DEFAULT_CHANNEL
+from PowerMeterControl.buffers import MeterReader
+from PowerMeterControl.simulated import SimulatedTLPMX
+
+
+N = 20000
+
+
+def raw_sample(tlPM):
+    power = c_double()
+    tlPM.measPower(byref(power), TLPM_DEFAULT_CHANNEL)
+    return power.value
+
+
+def pooled_sample(reader):
+    return reader.power()
+
+
+def backend_floor(reader):
+    # the simulated DLL call alone, to separate its own allocations from ours
+    reader.tlPM.dll.TLPMX_measPower(reader.tlPM.devSession, reader._power_ref, reader.channel)
+
+
+def bytes_per_sample(fn, arg, n=2000):
+    """Mean peak bytes allocated while taking one sample."""
+    tracemalloc.start()
+    total = 0
+    for _ in range(n):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(arg)
+        total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return total / n
+
+
+def time_per_sample(fn, arg, n=N):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn(arg)
+    return (time.perf_counter() - t0) / n
+
+
+def main():
+    tlPM = SimulatedTLPMX(seed=0)
+    reader = MeterReader(tlPM)
+    cases = (
+        ("backend", backend_floor, reader),
+        ("raw ctypes", raw_sample, tlPM),
+        ("MeterReader", pooled_sample, reader),
+    )
+    for name, fn, arg in cases:
+        fn(arg)  # warm up caches
+        b = bytes_per_sample(fn, arg)
+        t = time_per_sample(fn, arg)
+        print(f"{name:12s} {b:8.1f} B/sample allocated  {t * 1e6:7.2f} us/sample")
+
+
+if __name__ == "__main__":
+    main()
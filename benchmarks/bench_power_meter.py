@@ -0,0 +1,61 @@
+"""PowerMeter facade vs hand-written TLPMX calls.
+
+    python -m benchmarks.bench_power_meter
+
+Uses the simulated backend, so it measures the Python-side overhead of
+each calling style (the simulated DLL is the same for all of them).
+On a real meter the typed prototypes are used as well.
+"""
+import time
+from ctypes import c_double, byref
+
+import numpy as np
+
+from PowerMeterControl.TLPMX import TLPM_DEFAULT_CHANNEL
+from PowerMeterControl.power_meter import PowerMeter
+from PowerMeterControl.simulated import SimulatedTLPMX, SIM_RESOURCE
+
+
+N = 50000
+
+
+def raw_loop(tlPM, n):
+    out = []
+    for _ in range(n):
+        power = c_double()
+        tlPM.measPower(byref(power), TLPM_DEFAULT_CHANNEL)
+        out.append(power.value)
+    return out
+
+
+def facade_loop(pm, n):
+    power = pm.power
+    return [power() for _ in range(n)]
+
+
+def facade_block(pm, n):
+    return pm.read_many(n)
+
+
+def bench(fn, arg, n=N, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg, n)
+        best = min(best, time.perf_counter() - t0)
+    return best / n
+
+
+def main():
+    tlPM = SimulatedTLPMX(seed=0)
+    pm = PowerMeter(SIM_RESOURCE, tlPM=tlPM)
+    base = bench(raw_loop, tlPM)
+    print(f"{'raw TLPMX':22s} {base * 1e6:6.2f} us/sample")
+    for name, fn in (("PowerMeter.power()", facade_loop), ("PowerMeter.read_many()", facade_block)):
+        t = bench(fn, pm)
+        print(f"{name:22s} {t * 1e6:6.2f} us/sample  ({base / t:0.2f}x)")
+    assert isinstance(pm.read_many(10), np.ndarray)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Predicted vs simulated scan time, and the effect of point ordering.
+
+    python -m benchmarks.bench_trajectory
+
+The simulated stage integrates a rate-limited velocity command in small
+time steps (accelerate, cruise, brake when the stopping distance is
+reached) independently of the closed-form profile used by the planner,
+and adds the same settle/overhead per point.
+"""
+import time
+
+import numpy as np
+
+from MotionControl.trajectory import TrajectoryPlanner, execute
+
+
+DT = 1e-3
+
+
+def simulate_move(distance, v_max, a_max, dt=DT):
+    """Time for one axis to travel `distance` from rest to rest, by time stepping."""
+    remaining = abs(distance)
+    if remaining == 0:
+        return 0.0
+    v = t = 0.0
+    while remaining > 1e-9:
+        if v * v / (2 * a_max) >= remaining:
+            # braking: stop exactly on target
+            dt_stop = min(dt, v / a_max)
+            step = min(remaining, v * dt_stop - 0.5 * a_max * dt_stop * dt_stop)
+            v = max(v - a_max * dt_stop, 0.0)
+            if v == 0.0 or step <= 0:
+                step = remaining
+            t += dt_stop
+        else:
+            v_next = min(v + a_max * dt, v_max)
+            step = min(remaining, 0.5 * (v + v_next) * dt)
+            v = v_next
+            t += dt
+        remaining -= step
+    return t
+
+
+class SimulatedStage:
+    """Stage model driven through execute()'s callbacks; all axes move together."""
+    def __init__(self, start, settle, overhead):
+        self.pos = [float(x) for x in start]
+        self.vel = [0.0] * len(self.pos)
+        self.acc = [1.0] * len(self.pos)
+        self.moves = {}
+        self.settle = settle
+        self.overhead = overhead
+        self.t = 0.0
+
+    def set_velocity(self, axis, v, a):
+        self.vel[axis] = v
+        self.acc[axis] = a
+
+    def move_to(self, axis, p):
+        self.moves[axis] = simulate_move(p - self.pos[axis], self.vel[axis], self.acc[axis])
+        self.pos[axis] = p
+
+    def wait(self, axis):
+        if axis == len(self.pos) - 1:
+            self.t += max(self.moves.values(), default=0.0) + self.settle + self.overhead
+            self.moves.clear()
+
+
+def run(name, planner, points, start, reorder=True):
+    t0 = time.perf_counter()
+    plan = planner.plan(points, start=start, reorder=reorder)
+    plan_ms = (time.perf_counter() - t0) * 1e3
+    stage = SimulatedStage(plan.start, planner.settle, planner.overhead)
+    execute(plan, stage.move_to, stage.wait, stage.set_velocity)
+    err = (plan.duration - stage.t) / stage.t * 100
+    print(f"{name:26s} travel {plan.travel:8.2f}  predicted {plan.duration:8.2f} s  "
+          f"simulated {stage.t:8.2f} s  ({err:+5.2f} %)  plan {plan_ms:6.1f} ms")
+    return plan
+
+
+def main():
+    rng = np.random.default_rng(1)
+    line = TrajectoryPlanner(0, 25)
+    pts = rng.uniform(0, 25, 100)
+    run("1-axis, input order", line, pts, [12.0], reorder=False)
+    run("1-axis, sweep", line, pts, [12.0])
+
+    xy = TrajectoryPlanner([0, 0], [25, 25])
+    gx, gy = np.meshgrid(np.linspace(2, 22, 15), np.linspace(2, 12, 8))
+    grid = np.c_[gx.ravel(), gy.ravel()][rng.permutation(120)]
+    run("grid, input order", xy, grid, [0, 0], reorder=False)
+    run("grid, serpentine", xy, grid, [0, 0])
+
+    sparse = rng.uniform(0, 25, (150, 2))
+    run("sparse, input order", xy, sparse, [0, 0], reorder=False)
+    run("sparse, NN + 2-opt", xy, sparse, [0, 0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from ctypes import byref, c_double
+
+import numpy as np
+import pytest
+
+from PowerMeterControl.async_tlpmx import AsyncTLPMX
+from PowerMeterControl.simulated import SIM_RESOURCE, SimulatedTLPMX
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def test_typed_and_passthrough_coroutines():
+    async def main():
+        async with AsyncTLPMX(SimulatedTLPMX(power=1e-3, noise=0.0)) as pm:
+            await pm.open(SIM_RESOURCE)
+            await pm.set_wavelength(1064)
+            assert await pm.wavelength() == pytest.approx(1064)
+            assert await pm.power() == pytest.approx(1e-3, rel=0.05)
+            # any other TLPMX method is a coroutine taking ctypes arguments
+            value = c_double()
+            await pm.measPower(byref(value), pm.channel)
+            assert value.value == pytest.approx(1e-3, rel=0.05)
+            assert pm.measPower is pm.measPower  # wrappers are cached
+            with pytest.raises(AttributeError):
+                pm._private
+    run(main())
+
+
+def test_stream_scalars_and_blocks():
+    async def main():
+        async with AsyncTLPMX(SimulatedTLPMX()) as pm:
+            await pm.open(SIM_RESOURCE)
+            items = [item async for item in pm.stream(count=5)]
+            assert len(items) == 5
+            times = [t for t, _ in items]
+            assert times == sorted(times) and all(w > 0 for _, w in items)
+            blocks = [b async for b in pm.stream(block=4, count=10)]
+            assert [len(w) for _, w in blocks] == [4, 4, 2]
+            assert all(np.all(np.diff(t) >= 0) for t, _ in blocks)
+    run(main())
+
+
+def test_aclose_resolves_after_calls_in_flight():
+    release = threading.Event()
+
+    class SlowTLPMX(SimulatedTLPMX):
+        def getWavelength(self, *args):
+            release.wait(5)
+            return super().getWavelength(*args)
+
+    async def main():
+        pm = AsyncTLPMX(SlowTLPMX())
+        await pm.open(SIM_RESOURCE)
+        pending = [asyncio.ensure_future(pm.wavelength()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        closing = asyncio.ensure_future(pm.aclose())
+        await asyncio.sleep(0.01)
+        assert not closing.done()  # the loop is not blocked while the calls finish
+        release.set()
+        await closing
+        assert all(p.done() for p in pending)
+        assert [p.result() for p in pending] == [pytest.approx(532.0)] * 3
+        assert not pm.serializer._thread.is_alive()
+    run(main())
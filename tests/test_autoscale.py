@@ -0,0 +1,53 @@
+import numpy as np
+
+from PowerMeterControl.autoscale import AutoScaler, SlidingMinMax
+
+
+def test_sliding_min_max_matches_brute_force():
+    rng = np.random.default_rng(0)
+    window = 2.5
+    tracker = SlidingMinMax(window)
+    times = np.cumsum(rng.uniform(0.01, 0.3, 500))
+    values = rng.normal(size=500)
+    for i, (t, v) in enumerate(zip(times, values)):
+        tracker.push(t, v)
+        inside = values[:i + 1][times[:i + 1] >= t - window]
+        assert tracker.min == inside.min()
+        assert tracker.max == inside.max()
+
+
+def test_sliding_min_max_expire_and_clear():
+    tracker = SlidingMinMax(10.0)
+    assert not tracker and tracker.min is None and tracker.max is None
+    for t, v in [(0, 5.0), (1, 1.0), (2, 3.0)]:
+        tracker.push(t, v)
+    tracker.expire(1.5)
+    assert (tracker.min, tracker.max) == (3.0, 3.0)
+    tracker.clear()
+    assert not tracker
+
+
+def test_autoscaler_pads_and_floors_at_zero():
+    scaler = AutoScaler(10.0, margin=1.0)
+    scaler.push(0, 1.0)
+    scaler.push(1, 3.0)
+    assert scaler.update() == (0.0, 5.0)  # 1 - 2 is clamped to the floor
+
+
+def test_autoscaler_hysteresis_keeps_limits_for_small_changes():
+    scaler = AutoScaler(100.0, margin=1.0, hysteresis=0.5)
+    scaler.push(0, 10.0)
+    scaler.push(1, 12.0)
+    assert scaler.update() == (8.0, 14.0)
+    scaler.push(2, 11.0)
+    assert scaler.update() is None          # still inside, span unchanged
+    scaler.push(3, 20.0)
+    assert scaler.update() == (0.0, 30.0)   # escaped the limits
+    assert scaler.update(force=True) == (0.0, 30.0)
+
+
+def test_autoscaler_flat_signal_keeps_a_band():
+    scaler = AutoScaler(10.0)
+    scaler.push(0, 2.0)
+    lo, hi = scaler.update()
+    assert lo < 2.0 < hi
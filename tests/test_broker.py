@@ -0,0 +1,78 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from PowerMeterControl.broker import BrokerClient, MeterBroker
+from PowerMeterControl.power_meter import PowerMeter
+from PowerMeterControl.simulated import SIM_RESOURCE, SimulatedTLPMX
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(not hasattr(__import__("socket"), "AF_UNIX"),
+                                reason="needs Unix sockets")
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def broker_process(tmp_path):
+    address = str(tmp_path / "broker.sock")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "PowerMeterControl.broker", "--simulate", "1",
+         "--address", address, "--capacity", "1024", "--interval", "0.001"],
+        cwd=REPO, stdout=subprocess.DEVNULL
+    )
+    try:
+        wait_for(lambda: os.path.exists(address) or proc.poll() is not None)
+        assert proc.poll() is None, "broker exited"
+        yield address
+    finally:
+        proc.send_signal(signal.SIGINT)
+        proc.wait(timeout=10)
+
+
+def test_subscribe_read_and_stats(broker_process):
+    with BrokerClient(broker_process) as client:
+        (info,) = client.meters()
+        assert info["resource"] == SIM_RESOURCE.decode()
+        assert client.set("wavelength", 633.0) == pytest.approx(633.0)
+        assert client.get("wavelength") == pytest.approx(633.0)
+
+        sub = client.subscribe()
+        try:
+            wait_for(lambda: sub.ring.seq - sub.last_seq >= 10)
+            samples = sub.poll()
+            assert len(samples) >= 10
+            assert (samples[1:, 0] >= samples[:-1, 0]).all()
+            assert (samples[:, 1] > 0).all()
+            assert len(sub.poll()) < len(samples)
+        finally:
+            sub.close()
+
+        stats = client.request("stats")
+        assert stats["feed"]["seq"] > 0
+        assert sum(p["calls"] for p in stats["io"].values()) > 0
+        with pytest.raises(RuntimeError, match="Unknown setting"):
+            client.get("serial")
+
+
+def test_stats_without_serialized_session(tmp_path):
+    meter = PowerMeter(SIM_RESOURCE, tlPM=SimulatedTLPMX())
+    broker = MeterBroker([meter], address=str(tmp_path / "plain.sock"), capacity=64)
+    try:
+        stats = broker.handle({"cmd": "stats"})
+        assert stats["io"] is None and stats["feed"]["index"] == 0
+    finally:
+        for feed in broker.feeds:
+            feed.ring.close()
+        meter.close()
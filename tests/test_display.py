@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from PowerMeterControl.autoscale import AutoScaler
+from PowerMeterControl.display import DBM_FLOOR_W, DisplayTransform, SampleHistory
+
+
+def test_dbm_floor_and_round_trip():
+    d = DisplayTransform("dBm")
+    assert d.to_display(1e-3) == pytest.approx(0.0)
+    assert d.to_display(0.0) == pytest.approx(-120.0)
+    assert d.to_display(-1e-6) == d.to_display(DBM_FLOOR_W)
+    assert d.to_watts(d.to_display(2.5e-6)) == pytest.approx(2.5e-6)
+
+
+def test_apply_matches_to_display_and_reuses_out():
+    watts = np.array([0.0, 1e-9, 1e-6, 1e-3])
+    for unit in ("W", "mW", "uW", "nW", "dBm"):
+        d = DisplayTransform(unit)
+        out = np.empty(len(watts))
+        result = d.apply(watts, out=out)
+        assert result is out
+        np.testing.assert_allclose(result, [d.to_display(w) for w in watts])
+
+
+def test_unknown_unit_raises():
+    with pytest.raises(ValueError):
+        DisplayTransform("furlong")
+
+
+def test_sample_history_wraps_and_windows_are_views():
+    h = SampleHistory(capacity=4)
+    for i in range(6):
+        h.append(float(i), i * 1e-6)
+    np.testing.assert_array_equal(h.times, [2, 3, 4, 5])
+    times, watts = h.window(3.5)
+    np.testing.assert_array_equal(times, [4, 5])
+    assert np.shares_memory(times, h._t)
+
+
+def test_autoscaler_in_dbm_is_not_pinned_to_the_floor():
+    d = DisplayTransform("dBm")
+    scaler = AutoScaler(10.0, transform=d.to_display, floor=None)
+    for t, w in enumerate([1e-6, 2e-6, 0.5e-6]):
+        scaler.push(t, w)
+    lo, hi = scaler.update()
+    assert lo > -60.0  # padded around -33..-27 dBm, not -120
+    assert hi > d.to_display(2e-6)
@@ -0,0 +1,88 @@
+import warnings
+from ctypes import byref, c_double, c_long
+
+import pytest
+
+from PowerMeterControl import errors
+from PowerMeterControl.errors import (
+    TLPMXConnectionError, TLPMXError, TLPMXInstrumentError, TLPMXNotSupportedError,
+    TLPMXOverflowWarning, TLPMXParameterError, TLPMXTimeoutError, TLPMXUnderrunWarning,
+    check_status, error_class
+)
+from PowerMeterControl.simulated import SimulatedDll, SimulatedTLPMX
+from PowerMeterControl.visa_status import (
+    VI_ERROR_CONN_LOST, VI_ERROR_NSUP_OPER, VI_ERROR_PARAMETER1, VI_ERROR_PARAMETER8,
+    VI_ERROR_TMO, VI_INSTR_ERROR_FIRST, VI_INSTR_ERROR_LAST, VI_INSTR_ERROR_NOT_SUPP_INTF,
+    VI_INSTR_WARN_OVERFLOW, VI_INSTR_WARN_UNDERRUN
+)
+
+
+@pytest.mark.parametrize("code, cls", [
+    (VI_ERROR_TMO, TLPMXTimeoutError),
+    (VI_ERROR_CONN_LOST, TLPMXConnectionError),
+    (VI_ERROR_NSUP_OPER, TLPMXNotSupportedError),
+    (VI_INSTR_ERROR_NOT_SUPP_INTF, TLPMXNotSupportedError),
+    (VI_ERROR_PARAMETER1, TLPMXParameterError),
+    (VI_ERROR_PARAMETER8, TLPMXParameterError),
+    (VI_INSTR_ERROR_FIRST + 0x42, TLPMXInstrumentError),
+    (VI_INSTR_ERROR_LAST, TLPMXInstrumentError),
+    (VI_INSTR_ERROR_LAST + 1, TLPMXError),
+    (-1, TLPMXError),
+])
+def test_status_maps_to_subclass(code, cls):
+    assert error_class(code) is cls
+
+
+def test_codes_are_signed_32_bit():
+    assert VI_ERROR_TMO == -1073807339  # 0xBFFF0015
+    assert VI_INSTR_WARN_OVERFLOW == 0x3FFC0901
+
+
+def test_check_status_raises_with_driver_message():
+    dll = SimulatedDll()
+    with pytest.raises(TLPMXTimeoutError) as info:
+        check_status(dll, c_long(1), VI_ERROR_TMO)
+    assert info.value.code == VI_ERROR_TMO
+    assert "Simulated error" in info.value.message
+    assert "0xBFFF0015" in str(info.value)
+    assert isinstance(info.value, NameError)  # what the driver used to raise
+
+
+def test_parameter_errors_are_value_errors():
+    with pytest.raises(ValueError):
+        check_status(SimulatedDll(), c_long(1), VI_ERROR_PARAMETER1)
+
+
+def test_messages_are_cached():
+    dll = SimulatedDll()
+    errors.error_message.cache_clear()
+    for _ in range(3):
+        with pytest.raises(TLPMXTimeoutError):
+            check_status(dll, c_long(1), VI_ERROR_TMO)
+    assert errors.error_message.cache_info().hits == 2
+
+
+@pytest.mark.parametrize("code, cls", [(VI_INSTR_WARN_OVERFLOW, TLPMXOverflowWarning),
+                                       (VI_INSTR_WARN_UNDERRUN, TLPMXUnderrunWarning)])
+def test_warning_codes_warn_instead_of_raising(code, cls):
+    with pytest.warns(cls) as record:
+        assert check_status(SimulatedDll(), c_long(1), code) == code
+    assert record[0].message.code == code
+
+
+def test_other_completion_codes_pass_silently():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert check_status(SimulatedDll(), c_long(1), 0x3FFF0006) == 0x3FFF0006
+
+
+def test_driver_calls_go_through_check_status():
+    tlPM = SimulatedTLPMX()
+    power = c_double()
+    tlPM.dll.unplug()
+    with pytest.raises(TLPMXConnectionError):
+        tlPM.measPower(byref(power), 1)
+    tlPM.dll.plug()
+    tlPM.dll.TLPMX_measPower = lambda session, power, channel: VI_INSTR_WARN_OVERFLOW
+    with pytest.warns(TLPMXOverflowWarning):
+        tlPM.measPower(byref(power), 1)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from MotionControl.backlash import BacklashCompensator
+from MotionControl.limits import KeepOutError, LimitEngine, SoftLimitError
+
+
+@pytest.fixture
+def limits():
+    limits = LimitEngine(0, 25)
+    limits.add_zone(12.0, 12.6, name="clamp")
+    return limits
+
+
+def test_soft_limits(limits):
+    with pytest.raises(SoftLimitError) as info:
+        limits.validate([1.0, 26.0])
+    assert info.value.index == 1
+    limits.check(25.0)
+
+
+def test_point_in_zone(limits):
+    with pytest.raises(KeepOutError) as info:
+        limits.check(12.3)
+    assert info.value.zone == "clamp"
+    assert list(limits.allowed([11.9, 12.0, 12.3, 12.7])) == [True, False, False, True]
+
+
+def test_overlapping_zones_are_merged(limits):
+    limits.add_zone(12.5, 13.0, name="mount")
+    limits.add_zone(20.0, 21.0)
+    starts, ends, names = limits._axis_index[0]
+    assert list(starts) == [12.0, 20.0] and list(ends) == [13.0, 21.0]
+    assert names[0] == "clamp+mount"
+    assert not limits.allowed([12.8])[0]
+
+
+def test_move_across_zone_is_rejected(limits):
+    limits.validate([11.0, 14.0])   # points alone are fine
+    with pytest.raises(KeepOutError) as info:
+        limits.validate_path([11.0, 14.0], 10.0)
+    assert info.value.index == 1
+    assert limits.path_allowed([14.0], 13.0)
+    assert not limits.path_allowed([11.0], 13.0)
+
+
+def test_box_zone_segment_test():
+    xy = LimitEngine([0, 0], [25, 25])
+    xy.add_zone([10, 4], [14, 9], name="objective")
+    xy.validate_path([[20, 2], [20, 20]], [[0, 2]])   # goes around the box
+    with pytest.raises(KeepOutError) as info:
+        xy.validate_path([[20, 2], [0, 12]], [[0, 2]])  # diagonal cuts through it
+    assert info.value.index == 1 and info.value.zone == "objective"
+    assert list(xy.allowed(np.array([[12, 5], [12, 10]]))) == [False, True]
+
+
+def test_compensator_skips_vetoed_pre_position(limits):
+    approach = BacklashCompensator(0.5, +1, 0, 25, check=limits.path_allowed)
+    # 12.62 approached from above: the pre-position 12.12 lies in the zone
+    assert approach.path(13.0, 12.62) == [12.62]
+    # 10.5 is clear, but backing off to it from 13 crosses the zone
+    assert approach.path(13.0, 11.0) == [11.0]
+    assert approach.path(10.0, 9.0) == [8.5, 9.0]
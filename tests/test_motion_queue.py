@@ -0,0 +1,106 @@
+from ctypes import c_char_p
+
+import pytest
+
+from MotionControl.backlash import BacklashCompensator
+from MotionControl.motion_queue import MotionQueue
+
+
+class FakeAxis:
+    """Stage whose move finishes when the test says so."""
+    def __init__(self):
+        self.sent = []
+        self.moving = False
+        self.now = 0.0
+
+    def move_to(self, axis, position):
+        self.sent.append(position)
+        self.moving = True
+
+    def is_moving(self, axis):
+        return self.moving
+
+
+def make_queue(stage, **kwargs):
+    return MotionQueue(stage.move_to, stage.is_moving, clock=lambda: stage.now, **kwargs)
+
+
+def test_burst_of_jogs_is_coalesced():
+    stage = FakeAxis()
+    queue = make_queue(stage, retarget_interval=None)
+    queue.move_relative("x", 0.1, origin=10.0)
+    for _ in range(9):
+        queue.move_relative("x", 0.1)
+    queue.poll()
+    assert stage.sent == [pytest.approx(10.1)]
+    stage.moving = False
+    queue.poll()
+    assert stage.sent[-1] == pytest.approx(11.0)
+    assert queue.stats() == {"submitted": 10, "issued": 2, "coalesced": 8}
+    stage.moving = False
+    queue.poll()
+    assert not queue.busy("x")
+
+
+def test_running_move_is_retargeted_at_most_every_interval():
+    stage = FakeAxis()
+    queue = make_queue(stage, retarget_interval=0.25)
+    queue.move_absolute("x", 1.0)
+    queue.move_absolute("x", 2.0)
+    stage.now = 0.1
+    queue.poll()
+    assert stage.sent == [1.0]
+    stage.now = 0.3
+    queue.poll()
+    assert stage.sent == [1.0, 2.0]
+
+
+def test_relative_move_needs_an_origin():
+    queue = make_queue(FakeAxis())
+    with pytest.raises(ValueError):
+        queue.move_relative("x", 1.0)
+
+
+def test_status_lag_keeps_a_fresh_move_in_flight():
+    stage = FakeAxis()
+    queue = make_queue(stage, status_lag=0.2)
+    stage.move_to = lambda axis, position: stage.sent.append(position)  # status never shows motion
+    queue.move_absolute("x", 1.0)
+    queue.move_absolute("x", 2.0)
+    queue.poll()
+    assert stage.sent == [1.0] and queue.busy("x")
+    stage.now = 0.3
+    queue.poll()
+    assert stage.sent == [1.0, 2.0]
+
+
+def test_unhashable_ctypes_axis_is_passed_back():
+    seen = []
+    queue = MotionQueue(lambda axis, p: seen.append(axis), lambda axis: False)
+    serial = c_char_p(b"27007518")
+    queue.move_absolute(serial, 1.0)
+    queue.move_absolute(c_char_p(b"27007518"), 2.0)
+    assert seen[0] is serial
+    assert queue.target(serial) == 2.0
+
+
+def test_backlash_second_leg_is_sent_from_poll():
+    stage = FakeAxis()
+    queue = make_queue(stage, approach=BacklashCompensator(overshoot=0.5, direction=+1))
+    queue.move_absolute("x", 5.0)   # unknown start: always approach through the pre-position
+    assert stage.sent == [4.5]
+    assert queue.target("x") == 5.0
+    stage.moving = False
+    queue.poll()
+    assert stage.sent == [4.5, 5.0]
+    stage.moving = False
+    queue.poll()
+    queue.move_absolute("x", 6.0)   # already arriving in +direction: one leg
+    assert stage.sent[-1] == 6.0
+    stage.moving = False
+    queue.poll()
+    queue.move_absolute("x", 3.0)   # from above: back off to 2.5 first
+    assert stage.sent[-1] == 2.5
+    stage.moving = False
+    queue.poll()
+    assert stage.sent[-2:] == [2.5, 3.0]
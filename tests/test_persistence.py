@@ -0,0 +1,61 @@
+import json
+import os
+
+import pytest
+
+from MotionControl.persistence import PositionStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "positions.json")
+
+
+def test_updates_are_debounced_into_one_atomic_write(path):
+    store = PositionStore(path, delay=0.05, max_delay=1.0)
+    for i in range(20):
+        store.update("27007518", current_pos=i, slots=[i, 0, 0, 0])
+    store.close()
+    assert store.writes == 1
+    with open(path) as f:
+        data = json.load(f)
+    assert data["stages"]["27007518"] == {"current_pos": 19.0, "sets": {"default": [19.0, 0.0, 0.0, 0.0]}}
+    # only the final file is left behind, no temporary files
+    assert os.listdir(os.path.dirname(path)) == ["positions.json"]
+
+
+def test_legacy_file_is_adopted_by_the_first_stage(path):
+    with open(path, "w") as f:
+        json.dump({"current_pos": 3.5, "slots": [1.0, 2.0]}, f)
+    store = PositionStore(path)
+    try:
+        assert store.load("27007518", num_slots=4) == (3.5, [1.0, 2.0, 0.0, 0.0])
+        assert store.load("27000001", num_slots=2, default_current=7.0) == (7.0, [0.0, 0.0])
+        assert store.stages() == ["27007518", "27000001"]
+    finally:
+        store.close()
+
+
+def test_reload_round_trip_with_named_sets(path):
+    store = PositionStore(path)
+    store.update("A", current_pos=1.0, slots=[1, 2, 3], set_name="sample1")
+    store.flush()
+    store.close()
+    store = PositionStore(path)
+    try:
+        assert store.set_names("A") == ["sample1"]
+        assert store.load("A", num_slots=2, set_name="sample1") == (1.0, [1.0, 2.0])
+        store.delete_set("A", "sample1")
+        assert store.set_names("A") == []
+    finally:
+        store.close()
+
+
+def test_corrupt_file_starts_empty(path):
+    with open(path, "w") as f:
+        f.write("{not json")
+    store = PositionStore(path)
+    try:
+        assert store.load("A", num_slots=1) == (10.0, [0.0])
+    finally:
+        store.close()
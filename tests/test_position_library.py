@@ -0,0 +1,69 @@
+import pytest
+
+from MotionControl.position_library import PositionLibrary
+
+STAGE = "27007518"
+
+
+@pytest.fixture
+def lib(tmp_path):
+    with PositionLibrary(str(tmp_path / "positions.sqlite")) as lib:
+        yield lib
+
+
+def test_add_overwrites_in_place(lib):
+    pid = lib.add(STAGE, "focus", 12.31, tags=("align", "daily"), note="first")
+    assert lib.add(STAGE, "focus", 12.40, note="refocused") == pid
+    assert lib.get(STAGE, "focus") == 12.40
+    assert lib.count() == 1
+    assert lib.tags_of(pid) == ["align", "daily"]  # no tags given: kept
+    lib.add(STAGE, "focus", 12.41, tags=("coarse",))
+    assert lib.tags_of(pid) == ["coarse"]         # tags given: replaced
+    assert lib.find(STAGE)[0].note == ""
+
+
+def test_entries_are_unique_per_sample(lib):
+    lib.add(STAGE, "focus", 1.0, sample="wafer-1")
+    lib.add(STAGE, "focus", 2.0, sample="wafer-2")
+    lib.add_many(STAGE, [("focus", 3.0), ("edge", 4.0)], sample="wafer-2")
+    assert lib.get(STAGE, "focus", sample="wafer-1") == 1.0
+    assert lib.get(STAGE, "focus", sample="wafer-2") == 3.0
+    assert lib.get(STAGE, "focus") is None
+    assert lib.samples(STAGE) == ["wafer-1", "wafer-2"]
+    assert lib.remove(STAGE, "edge", sample="wafer-2")
+    assert not lib.remove(STAGE, "edge", sample="wafer-2")
+
+
+def test_tag_filter_and_removal_cascade(lib):
+    a = lib.add(STAGE, "a", 1.0, tags=("align",))
+    b = lib.add(STAGE, "b", 2.0)
+    lib.tag(b, "align", "scan")
+    assert [p.name for p in lib.find(STAGE, tag="align")] == ["a", "b"]
+    lib.untag(a, "align")
+    assert [p.name for p in lib.find(STAGE, tag="align")] == ["b"]
+    lib.remove(STAGE, "b")
+    assert lib.db.execute("SELECT COUNT(*) FROM tags").fetchone()[0] == 0
+
+
+def test_find_pages_by_name_and_prefix(lib):
+    lib.add_many(STAGE, [(f"p{i:03d}", i * 0.1) for i in range(250)])
+    lib.add(STAGE, "q000", 0.0)
+    lib.add("27000001", "p000", 0.0)
+    pages = [lib.find(STAGE, prefix="p", limit=100, offset=o) for o in (0, 100, 200)]
+    assert [len(p) for p in pages] == [100, 100, 50]
+    names = [p.name for page in pages for p in page]
+    assert names == sorted(names) and len(set(names)) == 250
+    assert [p.name for p in lib.find(STAGE, prefix="p24")] == [f"p24{i}" for i in range(10)]
+
+
+def test_within_and_nearest(lib):
+    lib.add_many(STAGE, [("a", 1.0), ("b", 2.0), ("c", 3.5), ("d", 7.0)])
+    lib.add("27000001", "x", 2.1)
+    assert [p.name for p in lib.within(STAGE, 1.5, 4.0)] == ["b", "c"]
+    assert [p.name for p in lib.within(STAGE, 0.0, 10.0, limit=2)] == ["a", "b"]
+    # one seek above and one below the query; closest first across both
+    assert [p.name for p in lib.nearest(STAGE, 3.0, k=2)] == ["c", "b"]
+    assert [p.name for p in lib.nearest(STAGE, 2.0)] == ["b"]       # exact hit
+    assert [p.name for p in lib.nearest(STAGE, 100.0, k=2)] == ["d", "c"]  # only below
+    assert [p.name for p in lib.nearest(STAGE, -5.0, k=2)] == ["a", "b"]   # only above
+    assert lib.nearest(STAGE, 2.0, sample="other") == []
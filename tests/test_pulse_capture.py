@@ -0,0 +1,79 @@
+import types
+
+import pytest
+
+from PowerMeterControl import pulse_capture
+from PowerMeterControl.pulse_capture import PulseCapture
+
+
+class FakePeakMeter:
+    """Fires one pulse every `period` s; measFreq reports `device_rate`."""
+    def __init__(self, clock, period=1e-3, device_rate=1000.0):
+        self.clock = clock
+        self.period = period
+        self.device_rate = device_rate
+        self.energies = iter(1e-3 * (1 + 0.01 * (i % 3)) for i in range(10 ** 6))
+
+    def startPeakDetector(self, channel):
+        self.clock.now += self.period
+
+    def isPeakDetectorRunning(self, running, channel):
+        running._obj.value = 0
+
+    def measEnergy(self, energy, channel):
+        energy._obj.value = next(self.energies)
+
+    def measFreq(self, frequency, channel):
+        frequency._obj.value = self.device_rate
+
+    def setPeakThreshold(self, threshold, channel):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=0.0, sleep=lambda s: None)
+    clock.monotonic = lambda: clock.now
+    monkeypatch.setattr(pulse_capture, "time", clock)
+    return clock
+
+
+def test_all_pulses_captured(clock):
+    cap = PulseCapture(FakePeakMeter(clock), freq_every=10)
+    cap.run(n_pulses=101)
+    assert cap.count == 101
+    assert cap.capture_ratio() == pytest.approx(1.0)
+    assert cap.rep_rate() == pytest.approx(1000.0)
+    report = cap.report()
+    assert not report["overcounted"] and report["expected"] == 100
+
+
+def test_missed_pulses_lower_the_ratio(clock):
+    cap = PulseCapture(FakePeakMeter(clock, device_rate=2000.0), freq_every=10)
+    cap.run(n_pulses=101)
+    assert cap.capture_ratio() == pytest.approx(0.5)
+
+
+def test_overcounting_is_clamped_and_flagged(clock):
+    cap = PulseCapture(FakePeakMeter(clock, device_rate=500.0), freq_every=10)
+    cap.run(n_pulses=101)
+    assert cap.capture_ratio() == 1.0
+    assert cap.report()["overcounted"]
+
+
+def test_reset_forgets_the_previous_rep_rate(clock):
+    cap = PulseCapture(FakePeakMeter(clock), freq_every=10)
+    cap.run(n_pulses=21)
+    cap.reset()
+    assert cap.rep_rate_device is None and cap.capture_ratio() is None
+    assert cap.count == 0 and cap.energy_stats.count == 0
+    assert cap.report()["rep_rate_device"] is None
+
+
+def test_stability_from_energy_stats(clock):
+    cap = PulseCapture(FakePeakMeter(clock))
+    cap.run(n_pulses=30)
+    rms, p2p = cap.stability()
+    assert 0 < rms < 0.01 and p2p > rms
+    counts, _ = cap.histogram(bins=3)
+    assert counts.sum() == 30
@@ -0,0 +1,118 @@
+import ctypes
+import threading
+
+import numpy as np
+import pytest
+
+from PowerMeterControl.scpi import BinaryBlockReader, ScpiBatch, join_queries, split_response, to_bool, to_str
+from PowerMeterControl.serializer import SerializedTLPMX
+
+
+class FakeRaw:
+    """writeRaw / readRaw over canned replies, `max_read` bytes per readRaw."""
+    def __init__(self, replies, max_read=1 << 20):
+        self.replies = list(replies)
+        self.pending = b""
+        self.written = []
+        self.max_read = max_read
+
+    def writeRaw(self, message):
+        self.written.append(message)
+        self.pending += self.replies.pop(0)
+
+    def readRaw(self, buffer, size, count):
+        n = min(size.value, len(self.pending), self.max_read)
+        ctypes.memmove(buffer, self.pending[:n], n)
+        self.pending = self.pending[n:]
+        count._obj.value = n
+
+
+def test_join_and_split():
+    assert join_queries(["SENS:CORR:WAV?", "*IDN?", ":POW?"]) == ":SENS:CORR:WAV?;*IDN?;:POW?"
+    assert split_response('1.5;"a;b";ON\n') == ["1.5", '"a;b"', "ON"]
+    assert to_bool(" ON") and not to_bool("0")
+    assert to_str('"PM100D"') == "PM100D"
+
+
+def test_batch_parses_in_order_in_one_round_trip():
+    tl = FakeRaw([b'1064;1;"S120C"\n'])
+    batch = ScpiBatch(tl)
+    batch.add("SENS:CORR:WAV?")
+    batch.add("SENS:POW:RANG:AUTO?", to_bool)
+    batch.add("SYST:SENS:IDN?", to_str)
+    assert batch.run() == [1064.0, True, "S120C"]
+    assert tl.written == [b":SENS:CORR:WAV?;:SENS:POW:RANG:AUTO?;:SYST:SENS:IDN?"]
+    assert batch.round_trips == 1
+
+
+def test_batch_splits_large_batches_and_grows_its_buffer():
+    tl = FakeRaw([b"1;2\n", b"3\n"])
+    batch = ScpiBatch(tl, max_queries=2)
+    assert batch.query("A?", "B?", "C?", parser=int) == [1, 2, 3]
+    long_reply = (";".join(["1.0"] * 40) + "\n").encode()
+    tl = FakeRaw([long_reply])
+    batch = ScpiBatch(tl, buffer_size=16, max_queries=40)
+    assert batch.query(*["X?"] * 40) == [1.0] * 40
+
+
+def test_batch_reply_count_mismatch_raises():
+    batch = ScpiBatch(FakeRaw([b"1;2\n"]))
+    with pytest.raises(ValueError):
+        batch.query("A?")
+    with pytest.raises(ValueError):
+        batch.add("CONF:POW")
+
+
+def _block(payload):
+    length = str(len(payload)).encode()
+    return b"#" + str(len(length)).encode() + length + payload + b"\n"
+
+
+def test_binary_block_in_small_chunks():
+    data = np.arange(1000, dtype="<f4")
+    tl = FakeRaw([_block(data.tobytes())], max_read=7)
+    reader = BinaryBlockReader(tl, chunk_size=64, initial_size=16)
+    np.testing.assert_array_equal(reader.query_array("FETC:ARR?"), data)
+    assert tl.written == [b"FETC:ARR?"]
+
+
+def test_binary_block_errors():
+    with pytest.raises(ValueError, match="not an IEEE"):
+        BinaryBlockReader(FakeRaw([b"1.0,2.0\n"])).query_array("X?")
+    with pytest.raises(ValueError, match="Indefinite"):
+        BinaryBlockReader(FakeRaw([b"#0abc\n"])).query_array("X?")
+    with pytest.raises(ValueError, match="truncated"):
+        BinaryBlockReader(FakeRaw([b"#18abc"])).query_array("X?")
+
+
+@pytest.mark.parametrize("reply", [b"", b"#", b"#4", b"#410"])
+def test_truncated_block_header_raises_instead_of_spinning(reply):
+    with pytest.raises(ValueError, match="truncated"):
+        BinaryBlockReader(FakeRaw([reply]), chunk_size=4).query_array("X?")
+
+
+def test_queries_from_two_threads_keep_their_replies():
+    class Echo(FakeRaw):
+        def writeRaw(self, message):
+            self.written.append(message)
+            self.pending += message.lstrip(b":").rstrip(b"?") + b"\n"
+
+    tl = SerializedTLPMX(Echo([]))
+    errors = []
+
+    def worker(value):
+        batch = ScpiBatch(tl)
+        for _ in range(200):
+            try:
+                if batch.query(f"{value}?", parser=int) != [value]:
+                    errors.append(value)
+            except ValueError as e:  # another caller's reply, or none at all
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(v,)) for v in (1, 2, 3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    tl.close_serializer()
+    assert not errors
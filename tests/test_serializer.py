@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from PowerMeterControl.serializer import (PRIORITY_CONTROL, PRIORITY_HOUSEKEEPING,
+                                          PRIORITY_MEASURE, CommandSerializer)
+
+
+@pytest.fixture
+def serializer():
+    serializer = CommandSerializer()
+    yield serializer
+    serializer.close()
+
+
+def block(serializer):
+    """Occupy the I/O thread until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+    def hold():
+        started.set()
+        release.wait(5)
+    serializer.submit(hold)
+    started.wait(5)
+    return release
+
+
+def test_priority_order_and_fifo_within_a_priority(serializer):
+    release = block(serializer)
+    order = []
+    futures = [serializer.submit(order.append, name, priority=p) for name, p in [
+        ("status", PRIORITY_HOUSEKEEPING), ("set1", PRIORITY_CONTROL),
+        ("meas", PRIORITY_MEASURE), ("set2", PRIORITY_CONTROL)]]
+    release.set()
+    for f in futures:
+        f.result(5)
+    assert order == ["meas", "set1", "set2", "status"]
+    assert serializer.metrics()[PRIORITY_HOUSEKEEPING]["calls"] == 1
+
+
+def test_exception_reaches_the_caller_and_thread_survives(serializer):
+    def fail():
+        raise OSError("bus error")
+    with pytest.raises(OSError, match="bus error"):
+        serializer.call(fail, timeout=5)
+    assert serializer.call(lambda: 42, timeout=5) == 42
+
+
+def test_unknown_priority_is_rejected(serializer):
+    with pytest.raises(ValueError):
+        serializer.submit(lambda: None, priority=7)
+    assert serializer.call(lambda: "alive", timeout=5) == "alive"
+
+
+def test_close_without_waiting_runs_queued_work(serializer):
+    release = block(serializer)
+    futures = [serializer.submit(lambda i=i: i * i) for i in range(5)]
+    serializer.close(wait=False)
+    assert not serializer.stopped.done()
+    with pytest.raises(RuntimeError):
+        serializer.submit(lambda: None)
+    release.set()
+    assert [f.result(5) for f in futures] == [0, 1, 4, 9, 16]
+    serializer.stopped.result(5)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from PowerMeterControl.shm_ring import SharedRing
+
+
+@pytest.fixture
+def ring():
+    ring = SharedRing.create(capacity=8)
+    yield ring
+    ring.close()
+
+
+def test_read_since_returns_only_new_rows(ring):
+    for i in range(5):
+        ring.write(float(i), i * 10.0)
+    samples, seq, lost = ring.read_since(0)
+    assert (seq, lost) == (5, 0)
+    np.testing.assert_array_equal(samples[:, 0], np.arange(5))
+    samples, seq, lost = ring.read_since(seq)
+    assert len(samples) == 0 and seq == 5 and lost == 0
+
+
+def test_lapped_reader_counts_lost_rows(ring):
+    ring.write_many(np.arange(5.0), np.zeros(5))
+    ring.write_many(np.arange(5.0, 25.0), np.zeros(20))
+    samples, seq, lost = ring.read_since(5)
+    assert seq == 25
+    # the oldest row is the writer's next slot, so a lapped reader keeps capacity - 1 rows
+    assert len(samples) == 7 and lost == 13
+    assert len(samples) + lost == seq - 5
+    np.testing.assert_array_equal(samples[:, 0], np.arange(18.0, 25.0))
+
+
+def test_write_many_larger_than_capacity_keeps_newest(ring):
+    ring.write_many(np.arange(20.0), np.arange(20.0))
+    assert ring.seq == 20
+    np.testing.assert_array_equal(ring.latest(3)[:, 0], [17.0, 18.0, 19.0])
+
+
+def test_views_since_wraps_and_still_valid(ring):
+    ring.write_many(np.arange(6.0), np.zeros(6))
+    _, _, _ = ring.read_since(0)
+    ring.write_many(np.arange(6.0, 10.0), np.zeros(4))
+    segments, start, end = ring.views_since(6)
+    assert (start, end) == (6, 10)
+    assert len(segments) == 2  # rows 6, 7 then 0, 1
+    np.testing.assert_array_equal(np.concatenate([t for t, _ in segments]), np.arange(6.0, 10.0))
+    assert ring.still_valid(start)
+    ring.write_many(np.arange(10.0, 16.0), np.zeros(6))
+    assert not ring.still_valid(start)
+
+
+def test_attach_sees_the_writer(ring):
+    reader = SharedRing.attach(ring.name, readonly=True)
+    try:
+        ring.write(1.0, 2.0)
+        samples, seq, _ = reader.read_since(0)
+        assert seq == 1 and samples.tolist() == [[1.0, 2.0]]
+    finally:
+        reader.close()
+
+
+def test_latest_before_the_ring_has_filled():
+    ring = SharedRing.create(capacity=16)
+    try:
+        for i in range(3):
+            ring.write(float(i + 1), 10.0 + i)
+        assert ring.latest(5).tolist() == [[1.0, 10.0], [2.0, 11.0], [3.0, 12.0]]
+        samples, seq, lost = ring.read_since(-2)
+        assert (len(samples), seq, lost) == (3, 3, 0)
+        segments, start, end = ring.views_since(-2)
+        assert (start, end) == (0, 3)
+    finally:
+        ring.close()
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from PowerMeterControl.shm_ring import SharedRing
+from PowerMeterControl.shm_transport import RingConsumer, _print_spectrum_peak
+
+
+@pytest.fixture
+def ring():
+    ring = SharedRing.create(capacity=64)
+    yield ring
+    ring.close()
+
+
+def publish(ring, n, t0=100.0, rate=1000.0):
+    t = t0 + np.arange(n) / rate
+    ring.write_many(t, 1e-3 + 1e-4 * np.sin(2 * np.pi * 50.0 * t))
+
+
+def test_consumer_started_before_a_full_window(ring, capsys):
+    consumer = RingConsumer(ring.name)
+    try:
+        publish(ring, 3)
+        window = consumer.latest(16)
+        assert len(window) == 3
+        assert (window[:, 0] >= 100.0).all()  # no zero-filled rows from unwritten slots
+        _print_spectrum_peak(consumer, n=16)
+        assert capsys.readouterr().out == ""
+
+        publish(ring, 29, t0=100.003)
+        _print_spectrum_peak(consumer, n=32)
+        assert "1000 S/s" in capsys.readouterr().out
+    finally:
+        consumer.close()
+
+
+def test_consume_sees_every_new_sample_once(ring):
+    consumer = RingConsumer(ring.name)
+    try:
+        seen = []
+        publish(ring, 10)
+        assert consumer.consume(lambda t, w: seen.extend(t)) == 10
+        assert consumer.consume(lambda t, w: seen.extend(t)) == 0
+        assert len(seen) == 10 and consumer.lag() == 0 and consumer.lost == 0
+    finally:
+        consumer.close()
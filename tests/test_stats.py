@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from PowerMeterControl.dual_channel import DualChannelStream, ratio_and_diff
+from PowerMeterControl.simulated import SimulatedTLPMX
+from PowerMeterControl.stats import RunningStats
+
+
+def test_block_merge_matches_numpy():
+    rng = np.random.default_rng(1)
+    data = rng.normal(5.0, 2.0, 1000)
+    stats = RunningStats()
+    for block in np.array_split(data, 7):
+        stats.update(block)
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(data.mean())
+    assert stats.std == pytest.approx(data.std(ddof=1))
+    assert (stats.min, stats.max) == (data.min(), data.max())
+
+
+def test_push_and_update_agree_and_skip_non_finite():
+    a, b = RunningStats(), RunningStats()
+    values = [1.0, 2.0, 4.0, 8.0]
+    for v in values[:2] + [np.nan, -np.inf] + values[2:]:
+        a.push(v)
+    b.update(values[:2])
+    b.update([np.nan, np.inf])
+    b.update(values[2:])
+    assert b.count == a.count
+    assert b.mean == pytest.approx(a.mean)
+    assert b.variance == pytest.approx(a.variance)
+    assert (a.count, a.min, a.max) == (4, 1.0, 8.0)
+
+
+def test_ratio_and_diff_zero_denominator_is_nan():
+    ratio, diff = ratio_and_diff([2.0, 1.0], [1.0, 0.0])
+    assert ratio[0] == 2.0 and np.isnan(ratio[1])
+    np.testing.assert_array_equal(diff, [1.0, 1.0])
+
+
+def test_read_sequence_checks_count_factor():
+    stream = DualChannelStream(SimulatedTLPMX())
+    with pytest.raises(RuntimeError):
+        stream.read_sequence(1)
+    stream.conf_sequence(interval_us=100)
+    for bad in (0, 101):
+        with pytest.raises(ValueError):
+            stream.read_sequence(bad)
+    assert len(stream.read_sequence(2).ch1) == 200
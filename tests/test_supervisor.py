@@ -0,0 +1,95 @@
+from ctypes import byref, c_double
+
+import pytest
+
+from PowerMeterControl.simulated import SIM_RESOURCE, SimulatedTLPMX
+from PowerMeterControl.supervisor import SessionSupervisor
+from PowerMeterControl.visa_status import VI_ERROR_CONN_LOST
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def setup():
+    tlPM = SimulatedTLPMX(SIM_RESOURCE, power=1e-3, noise=0.0)
+    clock = Clock()
+    events = []
+    sup = SessionSupervisor(tlPM, SIM_RESOURCE, max_failures=3, backoff_initial=0.5,
+                            backoff_max=2.0, clock=clock,
+                            on_lost=lambda t: events.append(("lost", t)),
+                            on_restored=lambda t0, t1: events.append(("restored", t0, t1)))
+    return tlPM, sup, clock, events
+
+
+def power(tlPM):
+    value = c_double()
+    tlPM.measPower(byref(value), 1)
+    return value.value
+
+
+def test_reads_pass_through(setup):
+    tlPM, sup, _, _ = setup
+    assert sup.read(power, tlPM) == pytest.approx(1e-3, rel=0.05)
+    assert sup.connected and sup.read_errors == 0
+
+
+def test_max_failures_before_giving_up_the_session(setup):
+    tlPM, sup, _, events = setup
+    def flaky():
+        raise OSError("glitch")
+    assert sup.read(flaky) is None
+    assert sup.read(flaky) is None
+    assert sup.connected
+    assert sup.read(power, tlPM) is not None  # a good read resets the count
+    for _ in range(3):
+        sup.read(flaky)
+    assert not sup.connected and events == [("lost", 100.0)]
+    assert sup.error_counts == {"OSError": 5} and sup.read_errors == 5
+
+
+def test_connection_error_backoff_and_gap(setup, capsys):
+    tlPM, sup, clock, events = setup
+    tlPM.dll.unplug()
+    assert sup.read(power, tlPM) is None
+    assert not sup.connected  # one connection error is enough
+    assert sup.error_counts == {VI_ERROR_CONN_LOST: 1}
+
+    # reconnect attempts at 100.5, then 1 s and 2 s (capped) later
+    attempts = []
+    for t in [100.2, 100.5, 101.0, 101.5, 103.4, 103.5, 105.0, 105.5]:
+        clock.now = t
+        calls = tlPM.dll.calls
+        assert sup.read(power, tlPM) is None
+        if tlPM.dll.calls != calls:
+            attempts.append(t)
+    assert attempts == [100.5, 101.5, 103.5, 105.5]
+
+    tlPM.dll.plug()
+    clock.now = 107.5
+    assert sup.read(power, tlPM) == pytest.approx(1e-3, rel=0.05)
+    assert sup.gaps == [(100.0, 107.5)] and sup.reconnects == 1
+    assert events == [("lost", 100.0), ("restored", 100.0, 107.5)]
+    out = capsys.readouterr().out
+    assert out.count("Read failed") == 1  # first error per code only
+
+
+def test_settings_profile_is_replayed(setup):
+    tlPM, sup, clock, _ = setup
+    sup.apply("setWavelength", c_double(1064.0), 1)
+    sup.apply("setWavelength", c_double(1550.0), 1)  # latest call wins
+    assert tlPM.dll.wavelength == 1550.0
+    tlPM.dll.unplug()
+    sup.read(power, tlPM)
+    sup.apply("setAvgTime", c_double(0.1), 1)  # remembered while down, not sent
+    tlPM.dll.wavelength = 532.0  # the meter comes back with its defaults
+    tlPM.dll.plug()
+    clock.now += 1.0
+    assert sup.read(power, tlPM) is not None
+    assert tlPM.dll.wavelength == 1550.0
+    assert list(sup.profile) == ["setWavelength", "setAvgTime"]
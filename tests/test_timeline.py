@@ -0,0 +1,80 @@
+import json
+import os
+import time
+from ctypes import c_char_p
+
+import numpy as np
+import pytest
+
+from MotionControl.position_recorder import COLUMNS, PositionRecorder, STATUS_HOMED
+from MotionControl.units import UnitConverter
+from PowerMeterControl.timeline import INDEX_FILE, Timeline, TimelineRecorder
+
+
+def record(directory, n=25, chunk_rows=10):
+    rec = TimelineRecorder(str(directory), chunk_rows=chunk_rows)
+    ch = rec.channel("power", ("watts",))
+    t = np.arange(n, dtype=np.float64)
+    ch.extend(t[:7], 2 * t[:7])
+    for x in t[7:]:
+        ch.append(x, 2 * x)
+    rec.close()
+    return t
+
+
+def test_chunked_round_trip(tmp_path):
+    t = record(tmp_path)
+    files = sorted(os.listdir(tmp_path / "power"))
+    assert files == ["chunk_000000.npy", "chunk_000001.npy", "chunk_000002.npy"]
+    rows = Timeline(str(tmp_path)).read("power")
+    np.testing.assert_array_equal(rows["t"], t)
+    np.testing.assert_array_equal(rows["watts"], 2 * t)
+
+
+def test_index_reload_reads_only_overlapping_chunks(tmp_path):
+    record(tmp_path)
+    with open(tmp_path / INDEX_FILE) as f:
+        index = json.load(f)
+    chunks = index["channels"]["power"]["chunks"]
+    assert [(c["rows"], c["t_first"], c["t_last"]) for c in chunks] == \
+        [(10, 0.0, 9.0), (10, 10.0, 19.0), (5, 20.0, 24.0)]
+    os.remove(tmp_path / "power" / "chunk_000000.npy")  # must not be needed
+    tl = Timeline(str(tmp_path))
+    assert tl.channels == ["power"]
+    assert tl.read("power", 12.0, 14.0)["t"].tolist() == [12.0, 13.0, 14.0]
+    assert tl.read("power", 10.5, 20.5, pad=True)["t"].tolist() == list(np.arange(10.0, 22.0))
+
+
+def test_interp_across_chunk_boundaries(tmp_path):
+    record(tmp_path)
+    tl = Timeline(str(tmp_path))
+    # every query lies between stored samples that sit in the neighbouring chunks
+    times = np.array([9.5, 9.75, 19.25])
+    np.testing.assert_allclose(tl.interp("power", "watts", times), 2 * times)
+    assert tl.interp("power", "watts", [9.5])[0] == pytest.approx(19.0)
+    assert np.isnan(tl.interp("power", "watts", [-1.0, 30.0])).all()
+
+
+class FakeKinesis:
+    def CC_RequestPosition(self, serial):
+        return 0
+
+    def CC_GetPosition(self, serial):
+        return 2 * 34555
+
+    def CC_GetStatusBits(self, serial):
+        return STATUS_HOMED
+
+
+def test_position_recorder_writes_stage_channel(tmp_path):
+    rec = TimelineRecorder(str(tmp_path))
+    sampler = PositionRecorder(FakeKinesis(), c_char_p(b"27007518"), UnitConverter(34555),
+                               rec, rate=200.0).start()
+    time.sleep(0.05)
+    sampler.stop()
+    rec.close()
+    rows = Timeline(str(tmp_path)).read("stage_27007518")
+    assert rows.dtype.names == ("t",) + COLUMNS
+    assert len(rows) >= 2 and sampler.errors == 0
+    assert (rows["position"] == 2.0).all() and (rows["homed"] == 1).all()
+    assert (rows["moving"] == 0).all()
@@ -0,0 +1,71 @@
+from ctypes import c_double
+
+import numpy as np
+import pytest
+
+from MotionControl.units import UnitConverter
+
+
+class FakeKinesis:
+    """CC_* unit conversion of a stage with `scale` counts per mm."""
+    def __init__(self, scale):
+        self.scale = scale
+
+    def CC_GetDeviceUnitFromRealValue(self, serial, real, device, unit_type):
+        device._obj.value = int(round(real.value * self.scale))
+        return 0
+
+    def CC_GetRealValueFromDeviceUnit(self, serial, device, real, unit_type):
+        real._obj.value = device.value / self.scale
+        return 0
+
+
+def test_scalar_round_trip():
+    units = UnitConverter(34555, 1.0, 1.0)
+    assert units.to_device(12.5) == 431938
+    assert isinstance(units.to_device(1), int)
+    assert units.to_real(34555) == pytest.approx(1.0)
+
+
+def test_array_conversion_matches_scalar():
+    units = UnitConverter(512, 67.49, 1.0)
+    positions = np.linspace(0.0, 25.0, 101)
+    counts = units.to_device(positions)
+    assert counts.dtype == np.int64
+    assert list(counts) == [units.to_device(float(x)) for x in positions]
+    assert np.allclose(units.to_real(counts), positions, atol=1 / units.scale)
+
+
+def test_accepts_ctypes_motor_parameters():
+    assert UnitConverter(c_double(34555), c_double(2.0), c_double(0.5)).scale == 34555 * 4
+
+
+def test_verify_keeps_matching_factor():
+    units = UnitConverter(34555)
+    assert units.verify(FakeKinesis(34555), b"27007518") == 0
+    assert units.scale == 34555
+
+
+def test_verify_adopts_dll_factor():
+    units = UnitConverter(34555)
+    worst = units.verify(FakeKinesis(34304), b"27007518")
+    assert worst > 1
+    assert units.scale == pytest.approx(34304)
+    assert units.to_device(25.0) == 34304 * 25
+
+
+class UnconfiguredKinesis(FakeKinesis):
+    """A cube without motor parameters converts everything to 0."""
+    def __init__(self):
+        super().__init__(0)
+
+    def CC_GetRealValueFromDeviceUnit(self, serial, device, real, unit_type):
+        real._obj.value = 0.0
+        return 0
+
+
+def test_verify_rejects_unconfigured_device():
+    units = UnitConverter(34555)
+    with pytest.raises(ValueError, match="motor parameters"):
+        units.verify(UnconfiguredKinesis(), b"27007518")
+    assert units.scale == 34555